@@ -0,0 +1,139 @@
+"""Library listing: the three-scan flow (All count, Favorites count, group list) vs one scan_library() snapshot"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_library_scan.py                  # synthetic library of 5000 folders
+    python3 benchmarks/bench_library_scan.py --count 20000
+    python3 benchmarks/bench_library_scan.py --dir ~/.steam/steam/steamapps/workshop/content/431960
+
+Filesystem calls are counted by wrapping os.stat / os.lstat / os.listdir / os.scandir (path.exists and path.isdir go
+through os.stat), each of them is one syscall for the stat family and an open + getdents + close for the listings.
+
+The old flow used to decode every preview to count it, here it only checks that a preview exists so the comparison
+is about directory walking alone (decode cost is the subject of bench_preview_decode.py). Each flow runs --repeat
+times and the best wall time is kept; the OS dentry cache is warm for both."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from common.constants import PREVIEW_FILENAMES  # noqa: E402
+from services.library_scanner import scan_library  # noqa: E402
+from services.wallpaper_service import WallpaperFinder, WallpaperLoader  # noqa: E402
+
+
+class ExistenceLoader(WallpaperLoader):
+    """WallpaperLoader whose load_preview() only checks the preview exists, no Tk and no decoding needed"""
+
+    def load_preview(self, wallpaper_folder):
+        return self.find_preview(wallpaper_folder)
+
+
+def make_synthetic_library(root, count):
+    """Workshop-like folders: mostly preview.jpg, some .png / .gif, a few without preview and some stray files"""
+    for i in range(count):
+        folder = os.path.join(root, str(1000000 + i))
+        os.makedirs(folder)
+        if i % 25 != 0:
+            preview = PREVIEW_FILENAMES[0 if i % 10 < 7 else (1 if i % 10 < 9 else 2)]
+            open(os.path.join(folder, preview), "wb").close()
+        open(os.path.join(folder, "project.json"), "w").close()
+    for i in range(count // 100):
+        open(os.path.join(root, f"stray_{i}.txt"), "w").close()
+
+
+class CallCounter:
+    """Counts the filesystem calls made through the os module while active"""
+
+    NAMES = ("stat", "lstat", "listdir", "scandir")
+
+    def __init__(self):
+        self.calls = Counter()
+        self._originals = {}
+
+    def __enter__(self):
+        # Modules doing "from os import listdir" hold their own reference, patch those too
+        modules = [os] + [
+            module for module in list(sys.modules.values()) if module and module.__name__.startswith("services.")
+        ]
+        for name in self.NAMES:
+            original = getattr(os, name)
+
+            def wrapper(*args, _name=name, _original=original, **kwargs):
+                self.calls[_name] += 1
+                return _original(*args, **kwargs)
+
+            for module in modules:
+                if getattr(module, name, None) is original:
+                    self._originals[(module, name)] = original
+                    setattr(module, name, wrapper)
+        return self
+
+    def __exit__(self, *exc):
+        for (module, name), original in self._originals.items():
+            setattr(module, name, original)
+        self._originals.clear()
+
+
+def three_scan_flow(root_dir, favorites, loader):
+    """Groups view (All + Favorites counts) and then opening 'All', as GalleryManager did without a snapshot"""
+    WallpaperFinder.count_all(root_dir, loader)
+    WallpaperFinder.count_favorites(root_dir, favorites, loader)
+    return WallpaperFinder.get_wallpapers_list(root_dir, loader, "__ALL__", favorites, {})
+
+
+def single_scan_flow(root_dir, favorites, loader):
+    """Same answers, served by one LibraryScan"""
+    scan = scan_library(root_dir)
+    WallpaperFinder.count_all(root_dir, loader, scan=scan)
+    WallpaperFinder.count_favorites(root_dir, favorites, loader, scan=scan)
+    return WallpaperFinder.get_wallpapers_list(root_dir, loader, "__ALL__", favorites, {}, scan=scan)
+
+
+def measure(flow, root_dir, favorites, repeat):
+    loader = ExistenceLoader()
+    with CallCounter() as counter:
+        result = flow(root_dir, favorites, loader)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        flow(root_dir, favorites, loader)
+        best = min(best, time.perf_counter() - started)
+    return result, counter.calls, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", help="Wallpaper directory to scan (default: synthetic library)")
+    parser.add_argument("--count", type=int, default=5000, help="Folders in the synthetic library")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per flow, the best one is kept")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root_dir = args.dir
+        if not root_dir:
+            root_dir = os.path.join(tmp, "library")
+            os.makedirs(root_dir)
+            make_synthetic_library(root_dir, args.count)
+        favorites = sorted(os.listdir(root_dir))[::7]
+
+        old_list, old_calls, old_time = measure(three_scan_flow, root_dir, favorites, args.repeat)
+        new_list, new_calls, new_time = measure(single_scan_flow, root_dir, favorites, args.repeat)
+        if sorted(old_list) != list(new_list):
+            print("[WARNING] The two flows disagree on the wallpaper list")
+
+        print(f"{len(new_list)} wallpapers with a preview in {root_dir}")
+        print(f"{'flow':<14}" + "".join(f"{name:>10}" for name in CallCounter.NAMES) + f"{'total':>10}{'ms':>10}")
+        for label, calls, elapsed in (("three scans", old_calls, old_time), ("single scan", new_calls, new_time)):
+            print(f"{label:<14}" + "".join(f"{calls[name]:>10}" for name in CallCounter.NAMES)
+                  + f"{sum(calls.values()):>10}{elapsed * 1000:>10.1f}")
+        print(f"speedup: {old_time / new_time:.2f}x, "
+              f"{sum(old_calls.values()) / max(1, sum(new_calls.values())):.2f}x fewer filesystem calls")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Backend log loading: readlines() of the whole file vs tail_lines() reading backwards from the end"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_log_tail.py             # 50 MB synthetic logs.txt
+    python3 benchmarks/bench_log_tail.py --mb 200
+
+The GUI shows the last BACKEND_LOG_TAIL_LINES lines of logs.txt at startup. Before rotation existed the file grew
+without bound and the whole of it was read to keep its tail, this times both ways on a file of the given size."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from common.constants import BACKEND_LOG_TAIL_LINES  # noqa: E402
+from common.log_files import tail_lines  # noqa: E402
+
+
+def make_log(log_path, size_mb):
+    line = "[2026-01-01 12:00:00] [INFO] Applying wallpaper: /home/user/steam/workshop/content/431960/{}\n"
+    with open(log_path, "w") as f:
+        i = 0
+        while f.tell() < size_mb * 1024 * 1024:
+            f.write(line.format(i))
+            i += 1
+
+
+def read_all(log_path):
+    with open(log_path, "r") as f:
+        return f.readlines()[-BACKEND_LOG_TAIL_LINES:]
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=50, help="Size of the synthetic log")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "logs.txt")
+        make_log(log_path, args.mb)
+        full, expected = timed(read_all, log_path)
+        tail, lines = timed(tail_lines, log_path, BACKEND_LOG_TAIL_LINES)
+        if lines != [line.rstrip("\n") for line in expected]:
+            print("tail_lines() and readlines() disagree")
+            return 1
+
+        print(f"{args.mb} MB log, last {BACKEND_LOG_TAIL_LINES} lines")
+        print(f"{'method':<12}{'ms':>10}{'speedup':>10}")
+        for name, elapsed in (("readlines", full), ("tail_lines", tail)):
+            print(f"{name:<12}{elapsed * 1000:>10.1f}{full / elapsed:>9.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Thumbnail prefetch hit rate while scrolling a virtualized gallery"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_prefetch.py                      # 600 synthetic 1920x1080 previews
+    python3 benchmarks/bench_prefetch.py --count 2000 --speeds 2 4 8
+
+A cold library (no disk cache) is scrolled at a steady speed, in screens per second, first without and then with the
+ThumbnailPrefetcher. The hit rate is the share of tiles that scrolled in with their preview already decoded.
+
+No Tk window is created: the Tk main loop is replaced by a small after() scheduler running in real time, the canvas
+by a fake that only knows its scroll position, and PhotoImages by a stand-in with the same width()/height()."""
+
+import argparse
+import heapq
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from PIL import Image  # noqa: E402
+from common.constants import THUMB_CELL_SIZE  # noqa: E402
+from services.wallpaper_service import WallpaperLoader, PreviewDecodePipeline  # noqa: E402
+from services.ui_dispatcher import UiDispatcher  # noqa: E402
+from gui.gallery_view.virtual_gallery import VirtualGallery  # noqa: E402
+from gui.gallery_view.prefetcher import ThumbnailPrefetcher  # noqa: E402
+
+VIEW_HEIGHT = 720
+COLUMNS = 6
+
+
+class SimRoot:
+    """after() scheduler standing in for the Tk main loop"""
+
+    def __init__(self):
+        self._timers = []
+        self._counter = 0
+        self._cancelled = set()
+
+    def after(self, ms, callback, *args):
+        self._counter += 1
+        heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, self._counter, callback, args))
+        return self._counter
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def run_until(self, deadline):
+        while True:
+            now = time.perf_counter()
+            if self._timers and self._timers[0][0] <= now:
+                _, timer_id, callback, args = heapq.heappop(self._timers)
+                if timer_id not in self._cancelled:
+                    callback(*args)
+            elif now >= deadline:
+                return
+            else:
+                time.sleep(min(0.001, deadline - now))
+
+
+class FakePhoto:
+    def __init__(self, img):
+        self._size = img.size
+
+    def width(self):
+        return self._size[0]
+
+    def height(self):
+        return self._size[1]
+
+
+class HeadlessLoader(WallpaperLoader):
+    def store_preview(self, wallpaper_folder, img):
+        tk_img = FakePhoto(img)
+        self.preview_cache.put(wallpaper_folder, tk_img)
+        return tk_img
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.top = 0
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def winfo_height(self):
+        return VIEW_HEIGHT
+
+
+class FakeGalleryCanvas:
+    def __init__(self):
+        self.canvas = FakeCanvas()
+        self.view_listeners = []
+
+    def set_virtual_size(self, size):
+        self.height = size[1]
+
+    def scroll_to(self, top):
+        self.canvas.top = max(0, min(top, self.height - VIEW_HEIGHT))
+        for listener in self.view_listeners:
+            listener()
+
+
+class CountingGallery(VirtualGallery):
+    """Tiles are plain objects, nothing is drawn"""
+
+    def _create_tile(self):
+        return type("Tile", (), {"wallpaper_id": None})()
+
+    def _place_tile(self, tile, x, y):
+        pass
+
+    def _hide_tile(self, tile):
+        pass
+
+    def _bind_tile(self, tile, wallpaper_id):
+        tile.wallpaper_id = wallpaper_id
+
+    def _refresh_tile(self, tile):
+        pass
+
+    def _set_tile_image(self, tile, img):
+        pass
+
+
+def make_library(root, count):
+    for i in range(count):
+        folder = os.path.join(root, str(100000 + i))
+        os.makedirs(folder, exist_ok=True)
+        Image.effect_noise((1920, 1080), 64).convert("RGB").save(os.path.join(folder, "preview.jpg"), quality=90)
+    return root
+
+
+def scroll_session(root_dir, speed, prefetch, args):
+    """Scroll the whole library once at speed screens/s, returns (hits, misses)"""
+    sim = SimRoot()
+    loader = HeadlessLoader()
+    dispatcher = UiDispatcher(sim)
+    dispatcher.start()
+    pipeline = PreviewDecodePipeline(loader, dispatcher, args.workers)
+    gallery_canvas = FakeGalleryCanvas()
+    gallery = CountingGallery(gallery_canvas, None, None, None)
+    items = sorted(os.listdir(root_dir))
+
+    def request_image(index, wallpaper_id):
+        return pipeline.request(os.path.join(root_dir, wallpaper_id),
+                                lambda img: gallery.set_image(index, wallpaper_id, img))
+
+    # The hit/miss accounting lives in the prefetcher, with prefetch=False it only counts (nothing in flight)
+    prefetcher = ThumbnailPrefetcher(pipeline, gallery, lambda wallpaper_id: os.path.join(root_dir, wallpaper_id),
+                                     args.screens, args.in_flight if prefetch else 1)
+    if not prefetch:
+        prefetcher._plan = lambda visible, view_height: None
+
+    # Same wiring as GalleryManager: tiles released before their preview arrived cancel their decode
+    gallery.show(items, COLUMNS, request_image=request_image, cancel_request=pipeline.cancel_request)
+    sim.run_until(time.perf_counter() + 0.5) # first screen decoded, like a user looking at it before scrolling
+
+    step_s = 0.016 # one wheel/scrollbar event per frame
+    px_per_step = speed * VIEW_HEIGHT * step_s
+    top = 0.0
+    while top < gallery_canvas.height - VIEW_HEIGHT:
+        top += px_per_step
+        gallery_canvas.scroll_to(top)
+        sim.run_until(time.perf_counter() + step_s)
+    pipeline.shutdown()
+    dispatcher.stop()
+    return prefetcher.hits, prefetcher.misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=600, help="Synthetic wallpapers")
+    parser.add_argument("--speeds", type=float, nargs="+", default=[0.5, 1, 2], help="Scroll speeds, screens per second")
+    parser.add_argument("--workers", type=int, default=0, help="Decode threads, 0 for the pipeline default")
+    parser.add_argument("--screens", type=int, default=2, help="Screens prefetched ahead at low speed")
+    parser.add_argument("--in-flight", type=int, default=4, help="Prefetches queued at once")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"generating {args.count} previews...")
+        root_dir = make_library(tmp, args.count)
+        rows = (args.count + COLUMNS - 1) // COLUMNS
+        print(f"{rows} rows of {COLUMNS}, {VIEW_HEIGHT // THUMB_CELL_SIZE[1]} rows per screen")
+        print(f"{'screens/s':>10}{'hit rate off':>15}{'hit rate on':>14}")
+        for speed in args.speeds:
+            rates = []
+            for prefetch in (False, True):
+                hits, misses = scroll_session(root_dir, speed, prefetch, args)
+                rates.append(hits / max(1, hits + misses))
+            print(f"{speed:>10g}{rates[0]:>15.0%}{rates[1]:>14.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Preview decode throughput: serial vs thread pool vs process pool (shared memory hand-off)"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_preview_decode.py                      # synthetic 1920x1080 previews
+    python3 benchmarks/bench_preview_decode.py --dir ~/.steam/steam/steamapps/workshop/content/431960 --limit 500
+
+The disk cache is NOT used so every mode pays the full cold-cache decode. No Tk window is created, the main process
+side of the process mode wraps the shared buffer with Image.frombuffer(), which is what PhotoImage gets fed in the GUI."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from PIL import Image  # noqa: E402
+from services.wallpaper_service import WallpaperLoader, decode_preview_to_shared_memory  # noqa: E402
+
+
+def make_synthetic_library(root, count, size=(1920, 1080)):
+    """Create count wallpaper folders with a noisy JPEG preview each (noise so the encoder can't cheat)"""
+    for i in range(count):
+        folder = os.path.join(root, str(100000 + i))
+        os.makedirs(folder, exist_ok=True)
+        Image.effect_noise(size, 64).convert("RGB").save(os.path.join(folder, "preview.jpg"), quality=90)
+    return root
+
+
+def list_folders(root, limit):
+    folders = [os.path.join(root, name) for name in sorted(os.listdir(root))]
+    folders = [f for f in folders if os.path.isdir(f)]
+    return folders[:limit] if limit else folders
+
+
+def run_serial(folders):
+    loader = WallpaperLoader()
+    for folder in folders:
+        img = loader.decode_preview(folder)
+        if img is not None:
+            img.convert("RGB").tobytes()
+
+
+def run_threads(folders, workers):
+    loader = WallpaperLoader()
+
+    def work(folder):
+        img = loader.decode_preview(folder)
+        if img is not None:
+            img.convert("RGB").tobytes()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(work, folders))
+
+
+def run_processes(folders, workers):
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        # Warm up the workers so interpreter start-up isn't billed to the decode
+        list(pool.map(abs, range(workers)))
+        started = time.perf_counter()
+        for result in pool.map(decode_preview_to_shared_memory, folders, chunksize=4):
+            if not result:
+                continue
+            shm = shared_memory.SharedMemory(name=result[0])
+            img = Image.frombuffer("RGB", result[1], shm.buf, "raw", "RGB", 0, 1)
+            del img
+            shm.close()
+            shm.unlink()
+        return time.perf_counter() - started
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", help="Existing wallpaper directory (default: synthetic library)")
+    parser.add_argument("--count", type=int, default=200, help="Synthetic previews to generate")
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N folders of --dir")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.dir or make_synthetic_library(tmp, args.count)
+        folders = list_folders(os.path.expanduser(root), args.limit)
+        if not folders:
+            print("No wallpaper folders found")
+            return 1
+
+        print(f"{len(folders)} previews, {args.workers} workers, {os.cpu_count()} cores")
+        serial = timed(run_serial, folders)
+        threads = timed(run_threads, folders, args.workers)
+        processes = run_processes(folders, args.workers)
+
+        print(f"{'mode':<10}{'seconds':>10}{'items/s':>12}{'speedup':>10}")
+        for name, elapsed in (("serial", serial), ("thread", threads), ("process", processes)):
+            print(f"{name:<10}{elapsed:>10.3f}{len(folders) / elapsed:>12.1f}{serial / elapsed:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Per-format preview decode: naive Image.open() + thumbnail() vs the format-aware path of services/preview_decoders"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_preview_formats.py                         # synthetic JPEG / PNG / GIF previews
+    python3 benchmarks/bench_preview_formats.py --files a.jpg b.gif ... # your own previews
+
+The synthetic files try to look like Workshop previews: a 1920x1080 JPEG, a 2560x1440 PNG and a 60 frame animated
+GIF of a few MB. Each file is decoded --repeat times with both paths and the best run is kept."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from PIL import Image, ImageDraw  # noqa: E402
+from common.constants import THUMB_SIZE  # noqa: E402
+from services.preview_decoders import open_preview  # noqa: E402
+
+
+def make_synthetic_files(root):
+    """Create one representative preview per format"""
+    jpeg_path = os.path.join(root, "preview.jpg")
+    Image.effect_noise((1920, 1080), 64).convert("RGB").save(jpeg_path, quality=90)
+
+    # Gradient + noise: compresses like a real render, not like a flat color
+    png_path = os.path.join(root, "preview.png")
+    gradient = Image.linear_gradient("L").resize((2560, 1440))
+    noise = Image.effect_noise((2560, 1440), 32)
+    Image.merge("RGB", (gradient, noise, Image.blend(gradient, noise, 0.5))).save(png_path)
+
+    gif_path = os.path.join(root, "preview.gif")
+    frames = []
+    for i in range(60):
+        frame = Image.effect_noise((640, 360), 48 + i).convert("RGB")
+        ImageDraw.Draw(frame).ellipse((i * 8, 100, i * 8 + 120, 220), fill=(255, 64, 64))
+        frames.append(frame.convert("P", palette=Image.ADAPTIVE))
+    frames[0].save(gif_path, save_all=True, append_images=frames[1:], duration=40, loop=0)
+
+    return [jpeg_path, png_path, gif_path]
+
+
+def naive_thumbnail(preview_path):
+    img = Image.open(preview_path)
+    img.thumbnail(THUMB_SIZE)
+    return img
+
+
+def best_of(fn, preview_path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(preview_path).convert("RGB").tobytes()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", nargs="+", help="Preview files to decode (default: synthetic previews)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per file, the best one is kept")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.files or make_synthetic_files(tmp)
+
+        print(f"{'file':<24}{'format':>8}{'size':>12}{'MB':>7}{'naive ms':>11}{'fast ms':>10}{'speedup':>10}")
+        for preview_path in files:
+            with Image.open(preview_path) as img:
+                fmt, size = img.format, f"{img.width}x{img.height}"
+            megabytes = os.path.getsize(preview_path) / (1024 * 1024)
+            naive = best_of(naive_thumbnail, preview_path, args.repeat)
+            fast = best_of(lambda p: open_preview(p, THUMB_SIZE), preview_path, args.repeat)
+            print(f"{os.path.basename(preview_path):<24}{fmt:>8}{size:>12}{megabytes:>7.1f}"
+                  f"{naive * 1000:>11.2f}{fast * 1000:>10.2f}{naive / fast:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Search-as-you-type latency of services.search_index.SearchIndex"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_search_index.py                 # 10000 synthetic wallpapers
+    python3 benchmarks/bench_search_index.py --count 50000
+
+Synthetic wallpapers get a numeric Workshop id, a 4 word title and 3 tags. Every query is typed one character at a
+time, like in the search bar, with a cold prefix cache for each query; the worst keystroke is what the user feels."""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from services.search_index import SearchIndex  # noqa: E402
+
+TAGS = ("Anime", "Nature", "Landscape", "Sci-Fi", "Game", "Abstract", "Cyberpunk", "Relaxing", "Music", "Pixel art")
+QUERIES = ("anime", "nature sunset", "2894", "cyberpunk city", "pixel a", "zzz")
+
+
+def make_entries(count, seed=1):
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(3000)]
+    vocabulary += ["sunset", "city", "ocean", "forest", "space", "girl", "rain"]
+    return [
+        (str(2894000000 + i), " ".join(rng.choices(vocabulary, k=4)).title(), rng.sample(TAGS, 3))
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000, help="Indexed wallpapers")
+    args = parser.parse_args()
+
+    entries = make_entries(args.count)
+    started = time.perf_counter()
+    index = SearchIndex(entries)
+    print(f"index of {len(index)} wallpapers built in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    print(f"{'query':<18}{'results':>9}{'worst keystroke ms':>20}{'total ms':>10}")
+    for query in QUERIES:
+        index.build(entries) # cold prefix cache
+        worst = total = 0.0
+        results = None
+        for length in range(1, len(query) + 1):
+            started = time.perf_counter()
+            results = index.search(query[:length])
+            elapsed = time.perf_counter() - started
+            worst = max(worst, elapsed)
+            total += elapsed
+        print(f"{query!r:<18}{len(results or ()):>9}{worst * 1000:>20.2f}{total * 1000:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
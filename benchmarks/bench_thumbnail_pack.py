@@ -0,0 +1,95 @@
+"""Warm start: per-file thumbnail disk cache vs memory-mapped thumbnail pack"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_thumbnail_pack.py                 # 2000 synthetic wallpapers
+    python3 benchmarks/bench_thumbnail_pack.py --count 10000
+
+Both caches are filled first, then every thumbnail of the library is loaded the way the GUI does on a warm start:
+ThumbnailDiskCache.get() (stat + open + PNG decode per wallpaper) against ThumbnailPack.get() (a slice of the map).
+No Tk window is created, tobytes() stands in for the copy PhotoImage makes of the pixels, both sides pay for it."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from PIL import Image  # noqa: E402
+from common.constants import THUMB_SIZE  # noqa: E402
+from services.thumbnail_cache import ThumbnailDiskCache  # noqa: E402
+from services.thumbnail_pack import ThumbnailPack  # noqa: E402
+from services.wallpaper_service import iter_preview_files  # noqa: E402
+
+
+def make_library(root, count, disk_cache):
+    """Wallpaper folders with a tiny preview each, their thumbnails go straight to the disk cache"""
+    entries = {}
+    for i in range(count):
+        folder = os.path.join(root, "library", str(100000 + i))
+        os.makedirs(folder)
+        Image.new("RGB", (16, 9), (i % 256, 0, 0)).save(os.path.join(folder, "preview.jpg"))
+        preview_path, preview_stat = next(iter_preview_files(folder))
+        thumb = Image.effect_noise((THUMB_SIZE[0], THUMB_SIZE[0] * 9 // 16), 64).convert("RGB")
+        disk_cache.put(folder, preview_path, preview_stat, thumb)
+        entries[folder] = ThumbnailDiskCache.make_key(preview_path, preview_stat)
+    disk_cache.flush()
+    return entries
+
+
+def load_from_disk_cache(disk_cache, folders):
+    for folder in folders:
+        for preview_path, preview_stat in iter_preview_files(folder):
+            img = disk_cache.get(folder, preview_path, preview_stat)
+            if img is not None:
+                img.tobytes()
+                break
+
+
+def load_from_pack(pack, folders):
+    for folder in folders:
+        img = pack.get(folder)
+        if img is not None:
+            img.tobytes()
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000, help="Synthetic wallpapers")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"caching {args.count} thumbnails...")
+        disk_cache = ThumbnailDiskCache(cache_dir=os.path.join(tmp, "thumbnails"), max_bytes=1 << 40)
+        entries = make_library(tmp, args.count, disk_cache)
+        pack_path = os.path.join(tmp, "thumbnails.pack")
+        pack = ThumbnailPack(pack_path)
+        build = timed(pack.sync, entries, disk_cache)
+        pack.shutdown()
+        folders = sorted(entries)
+
+        # A fresh process on a warm start: both caches are opened again, the page cache is warm for both
+        disk_cache = ThumbnailDiskCache(cache_dir=os.path.join(tmp, "thumbnails"), max_bytes=1 << 40)
+        opened = time.perf_counter()
+        pack = ThumbnailPack(pack_path)
+        opened = time.perf_counter() - opened
+        per_file = timed(load_from_disk_cache, disk_cache, folders)
+        packed = timed(load_from_pack, pack, folders)
+        pack.shutdown()
+
+        print(f"pack: {os.path.getsize(pack_path) / 1024 / 1024:.1f} MB, built in {build:.2f}s, opened in "
+              f"{opened * 1000:.1f} ms")
+        print(f"{'source':<12}{'seconds':>10}{'items/s':>12}{'speedup':>10}")
+        for name, elapsed in (("disk cache", per_file), ("pack", packed)):
+            print(f"{name:<12}{elapsed:>10.3f}{len(folders) / elapsed:>12.0f}{per_file / elapsed:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
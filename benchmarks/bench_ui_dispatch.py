@@ -0,0 +1,103 @@
+"""Queue latency of the UI dispatcher while worker threads post to it"""
+"""Usage (from the repo root):
+    python3 benchmarks/bench_ui_dispatch.py                       # 4 workers, 0 / 5 / 12 ms of main-thread work per frame
+    python3 benchmarks/bench_ui_dispatch.py --workers 8 --rate 200
+
+Worker threads post callbacks at a steady rate (per worker, per second) through UiDispatcher.call_soon() while the
+main thread runs 60 frames per second, each one busy for the given time (layout, drawing...). The latency is the time
+between the post and the callback running on the main thread, as reported by UiDispatcher.latency_stats().
+
+No Tk window is created: the Tk main loop is replaced by a small after() scheduler running in real time."""
+
+import argparse
+import heapq
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source"))
+
+from services.ui_dispatcher import UiDispatcher  # noqa: E402
+
+FRAME_MS = 16
+
+
+class SimRoot:
+    """after() scheduler standing in for the Tk main loop"""
+
+    def __init__(self):
+        self._timers = []
+        self._counter = 0
+        self._cancelled = set()
+
+    def after(self, ms, callback, *args):
+        self._counter += 1
+        heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, self._counter, callback, args))
+        return self._counter
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def run_until(self, deadline):
+        while True:
+            now = time.perf_counter()
+            if self._timers and self._timers[0][0] <= now:
+                _, timer_id, callback, args = heapq.heappop(self._timers)
+                if timer_id not in self._cancelled:
+                    callback(*args)
+            elif now >= deadline:
+                return
+            else:
+                time.sleep(min(0.001, deadline - now))
+
+
+def busy_frame(root, work_ms):
+    """One frame of main-thread work, then the next one"""
+    end = time.perf_counter() + work_ms / 1000
+    while time.perf_counter() < end:
+        pass
+    root.after(FRAME_MS, busy_frame, root, work_ms)
+
+
+def worker(dispatcher, rate, stop):
+    interval = 1 / rate
+    while not stop.is_set():
+        dispatcher.call_soon(lambda: None)
+        time.sleep(interval)
+
+
+def run(args, work_ms):
+    root = SimRoot()
+    dispatcher = UiDispatcher(root)
+    dispatcher.start()
+    root.after(FRAME_MS, busy_frame, root, work_ms)
+    stop = threading.Event()
+    threads = [threading.Thread(target=worker, args=(dispatcher, args.rate, stop), daemon=True)
+               for _ in range(args.workers)]
+    for thread in threads:
+        thread.start()
+    root.run_until(time.perf_counter() + args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    dispatcher.stop()
+    return dispatcher.latency_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4, help="Posting threads")
+    parser.add_argument("--rate", type=float, default=50, help="Posts per second per worker")
+    parser.add_argument("--work-ms", type=float, nargs="+", default=[0, 5, 12], help="Main-thread work per frame")
+    parser.add_argument("--seconds", type=float, default=3, help="Duration of each run")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.rate:g} posts/s, {1000 // FRAME_MS} frames/s")
+    for work_ms in args.work_ms:
+        print(f"{work_ms:>5g} ms/frame: {run(args, work_ms)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
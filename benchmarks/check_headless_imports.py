@@ -0,0 +1,89 @@
+"""Import-time regression check for the login-time startup path"""
+"""Usage (from the repo root):
+    python3 benchmarks/check_headless_imports.py
+
+core/startup_manager.py runs at every login through systemd, it only loads the config and builds the engine arguments.
+This imports it the same way (plus startup_manager.import_core()) under python -X importtime in a fresh interpreter,
+prints the total import time and exits with 1 if tkinter or PIL got imported, along with the chain of imports that
+pulled them in."""
+
+import argparse
+import os
+import subprocess
+import sys
+
+CORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source", "core")
+FORBIDDEN = ("tkinter", "_tkinter", "PIL")
+
+STARTUP_IMPORTS = (
+    "import sys; sys.path.insert(0, {core_dir!r}); "
+    "import startup_manager; startup_manager.import_core()"
+)
+
+
+def parse_importtime(stderr):
+    """[(depth, module, cumulative_us)] in the order python -X importtime prints them (children first)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        self_us, cumulative_us, name = rest.split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, name.strip(), int(cumulative_us)))
+    return entries
+
+
+def import_chain(entries, position):
+    """Modules that (transitively) imported entries[position], outermost first"""
+    chain = [entries[position][1]]
+    depth = entries[position][0]
+    for entry_depth, name, _ in entries[position + 1:]:
+        if entry_depth < depth:
+            chain.append(name)
+            depth = entry_depth
+    return list(reversed(chain))
+
+
+def is_forbidden(module):
+    return any(module == name or module.startswith(name + ".") for name in FORBIDDEN)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to check")
+    args = parser.parse_args()
+
+    result = subprocess.run(
+        [args.python, "-X", "importtime", "-c", STARTUP_IMPORTS.format(core_dir=os.path.abspath(CORE_DIR))],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        print("startup imports failed")
+        return 1
+
+    entries = parse_importtime(result.stderr)
+    total_ms = sum(cumulative for depth, _, cumulative in entries if depth == 0) / 1000
+    print(f"{len(entries)} modules imported, {total_ms:.1f} ms")
+
+    leaks = [position for position, (_, name, _) in enumerate(entries) if is_forbidden(name)]
+    # One chain per top-level forbidden package is enough to find the culprit
+    reported = set()
+    for position in leaks:
+        chain = import_chain(entries, position)
+        culprit = next(name for name in chain if is_forbidden(name))
+        if culprit.split(".")[0] in reported:
+            continue
+        reported.add(culprit.split(".")[0])
+        print(f"LEAK {culprit}: " + " -> ".join(chain[:chain.index(culprit) + 1]))
+
+    if leaks:
+        print("tkinter/PIL must not be imported by the headless startup path")
+        return 1
+    print("ok, no tkinter or PIL")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,21 @@ def get_config_path():
     return path.join(xdg_config, 'linux-wallpaper-engine', 'config.json')
 
 
+def get_cache_path():
+    """Get cache directory path following XDG Base Directory spec"""
+    xdg_cache = getenv('XDG_CACHE_HOME', path.expanduser('~/.cache'))
+    return path.join(xdg_cache, 'linux-wallpaper-engine')
+
+
+def get_data_path():
+    """Get data directory path following XDG Base Directory spec (same directory as the bash scripts' DATA_DIR)"""
+    xdg_data = getenv('XDG_DATA_HOME', path.expanduser('~/.local/share'))
+    return path.join(xdg_data, 'linux-wallpaper-engine-features')
+
+
 CONFIG_PATH = get_config_path()
+CACHE_PATH = get_cache_path()
+DATA_PATH = get_data_path()
 STANDARD_COLS = 6 # not to be used in the code, this is just a fallback.
 
 RESOLUTIONS = [
@@ -56,12 +70,41 @@ UI_COLORS = {
 }
 
 THUMB_SIZE = (120, 100)
+THUMB_CELL_SIZE = (THUMB_SIZE[0] + 20, THUMB_SIZE[1] + 40) # grid cell of a wallpaper tile: border + padding + caption
 THUMB_DESIRED_COLUMNS = 8
 THUMB_MIN_WIDTH = 80
 THUMB_ASPECT_RATIO = 1.12
 
+# widgets: one widget tree per wallpaper, virtual: pooled tiles for visible rows, canvas: visible rows drawn as canvas items
+# Only virtual and canvas keep memory within PREVIEW_MEMORY_CACHE_MB, every widget tile holds its own preview
+GALLERY_MODES = ("widgets", "virtual", "canvas")
+
+PREVIEW_FILENAMES = ("preview.jpg", "preview.png", "preview.gif") # lookup order matters, first match wins
+PROJECT_FILENAME = "project.json" # Wallpaper Engine metadata: title, type, tags, content rating, main file...
+THUMBNAIL_CACHE_DIR = path.join(CACHE_PATH, 'thumbnails')
+THUMBNAIL_CACHE_MAX_MB = 256
+THUMBNAIL_PACK_PATH = path.join(CACHE_PATH, 'thumbnails.pack') # raw thumbnails of the library in one mmap-able file, see services/thumbnail_pack
+CATALOG_PATH = path.join(CACHE_PATH, 'catalog.sqlite3')
+PHASH_CACHE_PATH = path.join(CACHE_PATH, 'phash.json') # perceptual hashes of the previews, see services/duplicate_finder
+DISK_USAGE_CACHE_PATH = path.join(CACHE_PATH, 'disk_usage.json') # folder sizes, see services/disk_usage
+PREVIEW_MEMORY_CACHE_MB = 64 # in-memory PhotoImages, a 120px preview is ~30KB in Tk (virtual/canvas gallery modes)
+HOVER_PREVIEW_SIZE = (400, 400) # bounding box of the larger preview shown while hovering a tile
+HOVER_FRAME_CACHE_MB = 32 # decoded frames of the hovered preview, longer animations are streamed instead
+
 MAIN_SCRIPT_NAME = "main.sh"
 
+BACKEND_LOG_PATH = path.join(DATA_PATH, 'logs.txt') # appended to by main.sh, EngineLogger and the startup service
+BACKEND_LOG_MAX_MB = 5 # rotated past this, keep LOG_MAX_BYTES in core/bash_utils.sh in sync
+BACKEND_LOG_GENERATIONS = 3 # logs.txt.1.gz (newest) .. logs.txt.3.gz, keep LOG_GENERATIONS in sync too
+BACKEND_LOG_TAIL_LINES = 200 # shown in the log area at startup, a typical run logs 100-300 lines
+LOG_AREA_MAX_LINES = 2000 # lines kept in the GUI log area, the oldest are trimmed
+LOG_AREA_FLUSH_MS = 16 # buffered log lines are inserted at most once per frame
+LOG_AREA_STATS_INTERVAL_S = 30 # cache and dispatch stats are logged at most this often, and only when they changed
+DISPATCH_IDLE_MS = 50 # UI dispatch pump interval while no worker posts anything, see services/ui_dispatcher
+DISPATCH_BUSY_MS = 10 # while workers keep posting
+DISPATCH_LINGER_MS = 500 # stays at DISPATCH_BUSY_MS this long after the last callback
+DISPATCH_BUDGET_MS = 8 # a drain leaves the rest for the next one past this, keeps a frame responsive
+
 DEFAULT_WALLPAPER_PATH_SUGGESTION = "~/.steam/steam/steamapps/workshop/content/431960"
 # For Flatpak reimplementation (NOT SUGGESTED), you must make sure to handle edge cases (steam as .flatpak, .snap, native...)
 # A helper script would be needed. Refer to the documentation on commits 60-83.
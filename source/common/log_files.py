@@ -0,0 +1,91 @@
+"""Backend log file helpers"""
+"""logs.txt is appended to by three writers: the bash scripts (echo >>), EngineLogger (logging.FileHandler) and the
+startup service. All of them open it in append mode, so rotation copies the file into a gzip generation and truncates
+it in place (like logrotate's copytruncate): nobody has to reopen anything, their next write lands at the new end.
+Lines appended between the copy and the truncation are lost, a few lines at most once every BACKEND_LOG_MAX_MB.
+
+A rotation holds an flock on logs.txt.lock, bash_utils.sh's rotate_log() takes the same lock, so two rotations never
+overlap. Only the standard library is used here, the login-time startup service imports this module."""
+
+import fcntl
+import gzip
+import os
+import shutil
+
+from common.constants import BACKEND_LOG_PATH, BACKEND_LOG_MAX_MB, BACKEND_LOG_GENERATIONS, BACKEND_LOG_TAIL_LINES
+
+
+def rotate_log(log_path=BACKEND_LOG_PATH, max_bytes=BACKEND_LOG_MAX_MB * 1024 * 1024,
+               generations=BACKEND_LOG_GENERATIONS):
+    """
+    Rotate a log file once it is over max_bytes: log.1.gz is the newest generation, log.<generations>.gz the oldest
+
+    Args:
+        log_path: Log file
+        max_bytes: Size cap of the live file
+        generations: Compressed generations kept, 0 just truncates
+
+    Returns:
+        bool: True if the file was rotated
+    """
+    try:
+        if os.stat(log_path).st_size <= max_bytes:
+            return False
+    except OSError:
+        return False
+
+    try:
+        with open(log_path + ".lock", "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False # someone else is rotating it right now
+
+            # Checked again under the lock, the other rotation may have just finished
+            if os.stat(log_path).st_size <= max_bytes:
+                return False
+
+            for generation in range(generations - 1, 0, -1):
+                older = f"{log_path}.{generation}.gz"
+                if os.path.exists(older):
+                    os.replace(older, f"{log_path}.{generation + 1}.gz")
+            if generations > 0:
+                tmp_path = f"{log_path}.1.gz.tmp"
+                with open(log_path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, f"{log_path}.1.gz")
+            os.truncate(log_path, 0)
+            return True
+    except OSError as e:
+        print(f"[WARNING] Could not rotate {log_path}: {e}")
+        return False
+
+
+def tail_lines(log_path=BACKEND_LOG_PATH, count=BACKEND_LOG_TAIL_LINES, block_size=64 * 1024):
+    """
+    Last lines of a text file, read backwards from the end in blocks: the cost depends on count, not on the file size
+
+    Args:
+        log_path: File to read
+        count: Lines wanted
+        block_size: Bytes read per seek
+
+    Returns:
+        list: Up to count lines without their line endings, oldest first
+    """
+    if count <= 0:
+        return []
+    with open(log_path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        # count + 1 newlines: the first line in data is then known to be complete
+        while position > 0 and data.count(b"\n") <= count:
+            read = min(block_size, position)
+            position -= read
+            f.seek(position)
+            data = f.read(read) + data
+
+    lines = data.splitlines()
+    if position > 0:
+        lines = lines[1:] # cut in the middle of a line
+    return [line.decode("utf-8", errors="replace") for line in lines[-count:]]
@@ -12,6 +12,8 @@ set -euo pipefail
 export DATA_DIR="${XDG_DATA_HOME:-$HOME/.local/share}/linux-wallpaper-engine-features"
 export CONFIG_DIR="${XDG_CONFIG_HOME:-$HOME/.config}/linux-wallpaper-engine-features"
 export LOG_FILE="${LOG_FILE:-$DATA_DIR/logs.txt}"
+export LOG_MAX_BYTES="${LOG_MAX_BYTES:-5242880}"  # Same cap as BACKEND_LOG_MAX_MB in common/constants.py
+export LOG_GENERATIONS="${LOG_GENERATIONS:-3}"    # gzip generations kept, logs.txt.1.gz is the newest
 
 # Ensure directories exist
 mkdir -p "$DATA_DIR" "$CONFIG_DIR"
@@ -381,6 +383,36 @@ json_escape() {
     printf '%s' "$str"
 }
 
+# Rotate the log once it is over LOG_MAX_BYTES: copy into logs.txt.1.gz and truncate in place, every writer appends
+# so nobody has to reopen it. Same lock file as common/log_files.py, a rotation in progress elsewhere is left alone
+rotate_log() {
+    local size
+    size=$(stat -c%s "$LOG_FILE" 2>/dev/null || echo 0)
+    if [[ $size -le $LOG_MAX_BYTES ]]; then
+        return 0
+    fi
+
+    (
+        flock -n 9 || exit 0
+        size=$(stat -c%s "$LOG_FILE" 2>/dev/null || echo 0)
+        if [[ $size -le $LOG_MAX_BYTES ]]; then
+            exit 0
+        fi
+
+        local generation
+        for ((generation = LOG_GENERATIONS - 1; generation > 0; generation--)); do
+            if [[ -f "$LOG_FILE.$generation.gz" ]]; then
+                mv -f "$LOG_FILE.$generation.gz" "$LOG_FILE.$((generation + 1)).gz"
+            fi
+        done
+        if [[ $LOG_GENERATIONS -gt 0 ]]; then
+            gzip -c "$LOG_FILE" > "$LOG_FILE.1.gz.tmp"
+            mv -f "$LOG_FILE.1.gz.tmp" "$LOG_FILE.1.gz"
+        fi
+        : > "$LOG_FILE"
+    ) 9>>"$LOG_FILE.lock" || true
+}
+
 # Cleanup old log files
 cleanup_old_logs() {
     local max_age_days="${1:-7}"
@@ -394,6 +426,7 @@ cleanup_old_logs() {
             log_success "Cleaned up old log file"
         fi
     fi
+    rotate_log
 }
 
 # =============================================================================
@@ -31,6 +31,7 @@ COMMAND=""
 DELAY=""
 ACTIVE_WIN=""
 
+rotate_log
 log "==================== NEW EXECUTION ===================="
 
 ###############################################
@@ -102,14 +102,33 @@ def validate_environment():
 
 
 
+def import_core():
+    """
+    Config loading and argument building without the GUI wrappers: gui.config is fine for the GUI, but importing it
+    here would load Tk at every login for nothing. Nothing imported here may pull in tkinter or PIL, run
+    benchmarks/check_headless_imports.py after touching models.config, services.argument_builder or common.
+
+    Returns:
+        tuple: (ConfigManager, ArgumentBuilder)
+    """
+    from models.config import ConfigManager
+    from services.argument_builder import ArgumentBuilder
+    return ConfigManager, ArgumentBuilder
+
+
 def run_at_startup():
     """Main startup function"""
     try:
-        from gui.config import load_config, build_args
+        ConfigManager, ArgumentBuilder = import_core()
     except ImportError as e:
         log(f"[FATAL ERROR] Failed to import config module: {e}")
         sys.exit(1)
 
+    # Same size cap as the GUI and the bash scripts, the service may be the only writer for days
+    from common.log_files import rotate_log
+    if rotate_log(str(LOG_FILE)):
+        log("[STARTUP] Log file rotated")
+
     log("[STARTUP] ========== Linux Wallpaper Engine Startup ==========")
     log(f"[STARTUP] Working directory: {CORE_DIR}")
     log(f"[STARTUP] User: {os.environ.get('USER', 'unknown')}")
@@ -119,7 +138,7 @@ def run_at_startup():
         log("[WARNING] Some environment variables are missing, continuing anyway...")
 
     try:
-        config = load_config()
+        config = ConfigManager.load()
     except Exception as e:
         log(f"[ERROR] Failed to load configuration: {e}")
         sys.exit(1)
@@ -144,7 +163,7 @@ def run_at_startup():
     log(f"[STARTUP]   Pool size: {pool_size} wallpapers")
 
     try:
-        args = build_args(config, log_callback=log)
+        args = ArgumentBuilder(config, log_callback=log).build_arguments()
     except Exception as e:
         log(f"[ERROR] Failed to build arguments: {e}")
         sys.exit(1)
@@ -214,12 +214,11 @@ class EventHandlers:
 
         try:
             canvas_height = canvas.winfo_height()
-            content_bbox = canvas.bbox("all")
-            if not content_bbox:
+            # Virtualized galleries only have widgets for the visible rows, bbox("all") would lie
+            content_height = self.ui['gallery_canvas'].content_height()
+            if not content_height:
                 return
 
-            content_height = content_bbox[3] - content_bbox[1]
-
 
             if content_height <= canvas_height:
                 return
@@ -294,14 +293,31 @@ class EventHandlers:
             messagebox.showerror("Error", f"Failed to configure startup: {str(e)}")
             flags.startup.set(not enabled)
 
-    def sync_startup_state(self):
-        """Syncs config with actual systemd state on startup"""
+    def get_startup_state_query(self):
+        """
+        Callable that tells whether the systemd service is enabled. It spawns systemctl but never touches Tk, so it can
+        run in a worker and its result be passed to sync_startup_state() on the main thread
+
+        Returns:
+            callable or None: None if systemd_manager can't be imported
+        """
+        systemd = self._get_systemd_manager()
+        return systemd.is_service_enabled if systemd else None
+
+    def sync_startup_state(self, systemd_enabled=None):
+        """
+        Syncs config with actual systemd state on startup
+
+        Args:
+            systemd_enabled: State already queried through get_startup_state_query(), None queries it here (blocking)
+        """
         try:
-            systemd = self._get_systemd_manager()
-            if not systemd:
-                return False
+            if systemd_enabled is None:
+                systemd = self._get_systemd_manager()
+                if not systemd:
+                    return False
+                systemd_enabled = systemd.is_service_enabled()
 
-            systemd_enabled = systemd.is_service_enabled()
             config_enabled = self.config.get("__run_at_startup__", False)
 
             if systemd_enabled != config_enabled:
@@ -349,6 +365,7 @@ class EventHandlers:
             proc = Popen([script_path, "--stop"], stdout=DEVNULL, stderr=DEVNULL)
 
             import threading
+            # self.log is safe from this thread, WallpaperEngineGUI._log hands the message to the UI dispatcher
             def wait_and_log():
                 returncode = proc.wait()
                 if returncode == 0:
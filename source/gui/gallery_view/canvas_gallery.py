@@ -0,0 +1,181 @@
+"""Canvas-native wallpaper gallery"""
+"""Same virtualization as VirtualGallery, but a tile is not a Frame with Labels: it's a handful of canvas items (border,
+image, caption, star) drawn straight on GalleryCanvas.canvas. There are no per-tile widgets and no per-tile bindings,
+the bindings on the canvas map clicks (and hovering) back to wallpapers with the grid coordinates of the pointer.
+
+The context menu and double click callbacks are the same ones the widget tiles use, so everything built on top of
+them (favorites, groups, 'not working'...) keeps working."""
+
+from types import SimpleNamespace
+
+from common.constants import THUMB_SIZE, UI_COLORS
+from gui.gallery_view.virtual_gallery import VirtualGallery
+from gui.groups import is_favorite
+
+
+class CanvasTile:
+    """Canvas item ids of a single tile, all of them share a tag so the tile moves and hides as a whole"""
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.wallpaper_id = None
+        self.image = None # the canvas doesn't keep a reference to the PhotoImage, this does
+        self.origin = (0, 0)
+        self.border_id = None
+        self.image_id = None
+        self.caption_bar_id = None
+        self.caption_id = None
+        self.no_preview_id = None
+        self.star_id = None
+
+
+class CanvasGallery(VirtualGallery):
+    """Draws the visible wallpaper tiles as canvas items and hit-tests clicks on the grid"""
+
+    BORDER = 3
+    INNER_PADDING = 5
+    CAPTION_HEIGHT = 16
+
+    def __init__(self, gallery_canvas, thumbnails, on_double_click, on_right_click, on_click=None, on_hover=None):
+        super().__init__(gallery_canvas, thumbnails, on_double_click, on_right_click, on_hover)
+        self.on_click = on_click
+        self._hovered = None # wallpaper under the pointer, <Motion> only reports changes
+        self.tile_width = THUMB_SIZE[0] + 2 * (self.BORDER + self.INNER_PADDING)
+        self.tile_height = THUMB_SIZE[1] + self.CAPTION_HEIGHT + 2 * (self.BORDER + self.INNER_PADDING)
+        self._tile_counter = 0
+
+        self.canvas.bind("<Button-1>", self._on_button_1, add="+")
+        self.canvas.bind("<Double-Button-1>", self._on_double_button_1, add="+")
+        self.canvas.bind("<Button-3>", self._on_button_3, add="+")
+        if on_hover:
+            self.canvas.bind("<Motion>", self._on_motion, add="+")
+            self.canvas.bind("<Leave>", self._on_leave, add="+")
+
+    def wallpaper_at(self, x, y):
+        """
+        Map widget coordinates (event.x, event.y) to the wallpaper drawn there
+
+        Returns:
+            str or None: Wallpaper id, or None if the point is outside of every tile
+        """
+        if not self.active:
+            return None
+        canvas_x = self.canvas.canvasx(x)
+        canvas_y = self.canvas.canvasy(y)
+        col = int(canvas_x // self.cell_width)
+        row = int(canvas_y // self.cell_height)
+        if canvas_x < 0 or canvas_y < 0 or col >= self.columns:
+            return None
+        # The gap between tiles belongs to nobody
+        if canvas_x - col * self.cell_width > self.tile_width or canvas_y - row * self.cell_height > self.tile_height:
+            return None
+
+        index = row * self.columns + col
+        return self.items[index] if index < len(self.items) else None
+
+    def _on_button_1(self, event):
+        wallpaper_id = self.wallpaper_at(event.x, event.y)
+        if wallpaper_id and self.on_click:
+            self.on_click(wallpaper_id)
+
+    def _on_double_button_1(self, event):
+        wallpaper_id = self.wallpaper_at(event.x, event.y)
+        if wallpaper_id:
+            self.on_double_click(wallpaper_id)
+
+    def _on_button_3(self, event):
+        wallpaper_id = self.wallpaper_at(event.x, event.y)
+        if wallpaper_id:
+            self.on_right_click(event, wallpaper_id)
+
+    def _on_motion(self, event):
+        wallpaper_id = self.wallpaper_at(event.x, event.y)
+        if wallpaper_id != self._hovered:
+            self._hovered = wallpaper_id
+            self.on_hover(event, wallpaper_id)
+
+    def _on_leave(self, event):
+        if self._hovered is not None:
+            self._hovered = None
+            self.on_hover(event, None)
+
+    def update_visible(self):
+        super().update_visible()
+        # Scrolling moves another wallpaper under a pointer that didn't move, no <Motion> for that
+        if self._hovered is not None:
+            self._hit_test_pointer()
+
+    def _hit_test_pointer(self):
+        """Hit-test the current pointer position, on_hover only hears about it if the wallpaper under it changed"""
+        try:
+            x_root, y_root = self.canvas.winfo_pointerxy()
+            x, y = x_root - self.canvas.winfo_rootx(), y_root - self.canvas.winfo_rooty()
+            inside = 0 <= x < self.canvas.winfo_width() and 0 <= y < self.canvas.winfo_height()
+        except Exception:
+            x_root = y_root = x = y = None
+            inside = False
+        wallpaper_id = self.wallpaper_at(x, y) if inside else None
+        if wallpaper_id != self._hovered:
+            self._hovered = wallpaper_id
+            self.on_hover(SimpleNamespace(x=x, y=y, x_root=x_root, y_root=y_root), wallpaper_id)
+
+    def _create_tile(self):
+        self._tile_counter += 1
+        tile = CanvasTile(f"canvas_tile_{self._tile_counter}")
+        width, height = self.tile_width, self.tile_height
+        inset = self.BORDER + self.INNER_PADDING
+        tags = ("canvas_tile", tile.tag)
+
+        tile.border_id = self.canvas.create_rectangle(
+            1, 1, width - 1, height - 1, outline=UI_COLORS["accent_blue"], width=self.BORDER,
+            fill=UI_COLORS["bg_tertiary"], tags=tags
+        )
+        tile.image_id = self.canvas.create_image(
+            width // 2, inset + THUMB_SIZE[1] // 2, anchor="center", tags=tags
+        )
+        tile.no_preview_id = self.canvas.create_text(
+            width // 2, inset + THUMB_SIZE[1] // 2, text="no preview", fill=UI_COLORS["fg_text"],
+            font=("Arial", 8), state="hidden", tags=tags
+        )
+        tile.caption_bar_id = self.canvas.create_rectangle(
+            inset, height - inset - self.CAPTION_HEIGHT, width - inset, height - inset,
+            fill=UI_COLORS["accent_blue"], width=0, tags=tags
+        )
+        tile.caption_id = self.canvas.create_text(
+            width // 2, height - inset - self.CAPTION_HEIGHT // 2, text="", fill=UI_COLORS["fg_text"],
+            font=("Courier", 8), tags=tags
+        )
+        tile.star_id = self.canvas.create_text(
+            self.BORDER + 2, self.BORDER + 2, text="★", anchor="nw", fill=UI_COLORS["accent_yellow"],
+            font=("Arial", 16), state="hidden", tags=tags
+        )
+        return tile
+
+    def _place_tile(self, tile, x, y):
+        self.canvas.move(tile.tag, x - tile.origin[0], y - tile.origin[1])
+        tile.origin = (x, y)
+        self.canvas.itemconfigure(tile.tag, state="normal")
+
+    def _hide_tile(self, tile):
+        self.canvas.itemconfigure(tile.tag, state="hidden")
+
+    def _bind_tile(self, tile, wallpaper_id):
+        tile.wallpaper_id = wallpaper_id
+        tile.image = None
+        self.canvas.itemconfigure(tile.image_id, image="")
+        self.canvas.itemconfigure(tile.caption_id, text=wallpaper_id or "")
+        self.canvas.itemconfigure(tile.no_preview_id, state="hidden")
+        self._refresh_tile(tile)
+
+    def _refresh_tile(self, tile):
+        favorite = tile.wallpaper_id is not None and is_favorite(self.thumbnails.config, tile.wallpaper_id)
+        self.canvas.itemconfigure(tile.star_id, state="normal" if favorite else "hidden")
+
+    def _set_tile_image(self, tile, img):
+        tile.image = img
+        if img:
+            self.canvas.itemconfigure(tile.image_id, image=img)
+            self.canvas.itemconfigure(tile.no_preview_id, state="hidden")
+        else:
+            self.canvas.itemconfigure(tile.image_id, image="")
+            self.canvas.itemconfigure(tile.no_preview_id, state="normal")
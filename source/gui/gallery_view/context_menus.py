@@ -91,4 +91,35 @@ class ContextMenuManager:
         else:
             menu.add_command(label="Cannot delete this folder", state="disabled")
 
-        menu.tk_popup(event.x_root, event.y_root)
\ No newline at end of file
+        menu.tk_popup(event.x_root, event.y_root)
+
+    def show_temporary_group_menu(self, event, group_id, callbacks):
+        """
+        Display context menu for a temporary group (duplicate finder, largest wallpapers...) with bulk actions.
+
+        callbacks dictionary must contain:
+        - on_mark_extras_not_working: function that receives group_id
+        - on_save_as_group: function that receives group_id
+        - on_discard: function that receives group_id
+        """
+        menu = Menu(self.parent, tearoff=0, bg=UI_COLORS["text_input_bg"], fg=UI_COLORS["accent_cyan"], activebackground=UI_COLORS["accent_cyan"], activeforeground=UI_COLORS["bg_secondary"])
+        temporary_group = self.group_manager.temporary_groups[group_id]
+
+        menu.add_command(
+            label=f"Mark {len(temporary_group['extras'])} {temporary_group['extras_label']} as not working",
+            command=lambda: callbacks['on_mark_extras_not_working'](group_id),
+            state="normal" if temporary_group["extras"] else "disabled"
+        )
+        menu.add_command(
+            label="Save as group…", # the name is asked for, see GalleryView._save_temporary_group_and_refresh
+            command=lambda: callbacks['on_save_as_group'](group_id)
+        )
+
+        menu.add_separator()
+
+        menu.add_command(
+            label="Discard",
+            command=lambda: callbacks['on_discard'](group_id)
+        )
+
+        menu.tk_popup(event.x_root, event.y_root)
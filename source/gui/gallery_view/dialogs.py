@@ -49,6 +49,37 @@ class DialogManager:
         entry.bind("<Return>", on_enter)
         Button(win, text="CREATE", bg=UI_COLORS["accent_cyan"], fg=UI_COLORS["bg_secondary"], font=("Arial", 10, "bold"), activebackground=UI_COLORS["accent_cyan_bright"], activeforeground=UI_COLORS["bg_secondary"], bd=2, relief="raised", cursor="hand2", command=create).pack(pady=10)
 
+    def show_save_group_dialog(self, default_name, on_save):
+        """
+        Display dialog asking for the name of a new group to save wallpapers to.
+
+        default_name: name the entry is filled with
+        on_save: callback function called with the chosen name, returns False to keep the dialog open (name taken)
+        """
+        win = Toplevel(self.parent)
+        win.title("Save as group")
+        win.geometry("250x120")
+        win.config(bg=UI_COLORS["bg_secondary"])
+
+        Label(win, text="Group name:", bg=UI_COLORS["bg_secondary"], fg=UI_COLORS["accent_cyan"], font=("Arial", 10, "bold")).pack(pady=5)
+        entry = Entry(win, bg=UI_COLORS["text_input_bg"], fg=UI_COLORS["accent_cyan"], insertbackground=UI_COLORS["accent_cyan"], font=("Arial", 10))
+        entry.insert(0, default_name)
+        entry.select_range(0, "end")
+        entry.pack(pady=5)
+        entry.focus()
+
+        def save():
+            name = entry.get().strip()
+            if name and not on_save(name):
+                return
+            win.destroy()
+
+        def on_enter(event):
+            save()
+
+        entry.bind("<Return>", on_enter)
+        Button(win, text="SAVE", bg=UI_COLORS["accent_cyan"], fg=UI_COLORS["bg_secondary"], font=("Arial", 10, "bold"), activebackground=UI_COLORS["accent_cyan_bright"], activeforeground=UI_COLORS["bg_secondary"], bd=2, relief="raised", cursor="hand2", command=save).pack(pady=10)
+
     def show_assign_groups_dialog(self, wallpaper_id, on_closed=None):
         """
         Display dialog for assigning/removing wallpaper from groups.
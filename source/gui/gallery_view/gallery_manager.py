@@ -1,22 +1,87 @@
+import os
 from os import path
-from gui.wallpaper_loader import count_all_wallpapers, count_favorite_wallpapers, get_wallpapers_list
+import time
+from gui.wallpaper_loader import get_wallpapers_list
+from services.library_scanner import scan_library
+from services.group_counts import GroupCountCache
+from services.search_index import SearchIndex
+from services.disk_usage import format_size
+from services.thumbnail_cache import ThumbnailDiskCache
 
 
 class GalleryManager:
     """Manages gallery state and rendering logic for wallpapers and groups"""
 
-    def __init__(self, gallery_view, loader, config):
+    def __init__(self, gallery_view, loader, config, preview_pipeline=None, log_callback=None, catalog=None,
+                 group_counts=None, metadata_indexer=None, disk_usage=None, prefetcher=None):
         self.gallery_view = gallery_view
         self.loader = loader
         self.config = config
+        # Optional PreviewDecodePipeline, without it previews are decoded synchronously
+        self.preview_pipeline = preview_pipeline
+        # Optional ThumbnailPrefetcher (virtualized galleries), shares the pipeline and is reset with it
+        self.prefetcher = prefetcher
+        self.log_callback = log_callback
+        # Optional WallpaperCatalog, lists and counts are then indexed queries instead of directory walks
+        self.catalog = catalog
+        # LibraryScan of --dir when there is no catalog, and (--dir, its mtime) as of the last refresh
+        self.library_scan = None
+        self._library_state = None
+        # Counts of the groups view, computed synchronously when no asynchronous GroupCountCache is given
+        self.group_counts = group_counts or GroupCountCache(catalog=catalog)
+        # Optional MetadataIndexer, keeps the project.json fields of the catalog up to date
+        self.metadata_indexer = metadata_indexer
+        # Criteria for WallpaperCatalog.filter_wallpaper_ids() applied to the wallpapers view, None shows everything
+        self.metadata_filter = None
+        # Search bar text, narrows the wallpapers view through an in-memory SearchIndex
+        self.search_query = ""
+        self._search_index = None
+        self._search_index_root = None
+        # Wallpapers of the current group before search filtering, set_search() works on it
+        self._view_wallpapers = []
+        # Optional DiskUsageAnalyzer, sizes of the last analysis of wallpaper_sizes_root: {wallpaper_id: bytes}
+        self.disk_usage = disk_usage
+        self.wallpaper_sizes = {}
+        self.wallpaper_sizes_root = None
+        # Largest first in both views, once the sizes are known
+        self.sort_by_size = False
+        # PreviewDecodePipeline.decoded at the last thumbnail pack sync, nothing new to pack while it's unchanged
+        self._pack_synced_decodes = None
+        # (view, group, dir) currently on screen, an incremental refresh is only possible if it didn't change
+        self._rendered_view_key = None
+        # Directories whose metadata index and thumbnail pack were synced with the catalog this session
+        self._synced_roots = set()
+        # Directories with a catalog rescan_async() this manager waits for, refreshes meanwhile don't ask again
+        self._awaited_rescans = set()
         # Use the group manager from gallery_view
         self.group_manager = gallery_view.group_manager
 
-    def refresh(self) -> None:
-        """Refresh complete gallery display based on current view state"""
-        self.gallery_view.clear_gallery()
+    def refresh(self, full: bool = False) -> None:
+        """
+        Refresh gallery display based on current view state
 
+        Args:
+            full: Destroy and rebuild every tile. Otherwise, when the same wallpapers view is already on screen
+                  (favorite toggles, group changes...), only the tiles that changed are touched
+        """
         root_dir = self.config["--dir"]
+        if full:
+            self.group_counts.invalidate()
+        view_key = (self.gallery_view.current_view, self.gallery_view.current_group, root_dir)
+        self._update_catalog(root_dir, rescan=full)
+        self._update_library_scan(root_dir, rescan=full)
+
+        if not full and self.gallery_view.current_view == "wallpapers" and view_key == self._rendered_view_key \
+                and root_dir and path.isdir(root_dir):
+            self._update_wallpapers_view(root_dir)
+            return
+
+        if self.preview_pipeline:
+            self.preview_pipeline.cancel_pending()
+        if self.prefetcher:
+            self.prefetcher.reset()
+        self.gallery_view.clear_gallery()
+        self._rendered_view_key = None
 
         if not root_dir or not path.exists(root_dir) or not path.isdir(root_dir):
             self.gallery_view.item_list = []
@@ -26,62 +91,466 @@ class GalleryManager:
             self._render_groups_view(root_dir)
         else:
             self._render_wallpapers_view(root_dir)
+        self._rendered_view_key = view_key
+
+    def apply_library_changes(self, root_dir: str, changed_ids, full_rescan: bool = False) -> None:
+        """
+        Apply a batch of changes reported by the LibraryWatcher: update the catalog for those folders only, drop
+        their cached previews and refresh the gallery incrementally (changed tiles reload their preview)
+        """
+        if root_dir != self.config["--dir"]:
+            return
+
+        if self.catalog is not None and full_rescan:
+            # Metadata, pack and view follow when the rescan arrives
+            self._update_catalog(root_dir, rescan=True, reindex_all=True)
+        elif self.catalog is not None and changed_ids:
+            try:
+                self.catalog.refresh_folders(root_dir, changed_ids)
+            except Exception as e:
+                print(f"[WARNING] Wallpaper catalog update failed: {e}")
+
+        self.library_scan = None # taken again by the refresh below
+        self.group_counts.invalidate()
+        self._invalidate_search_index()
+        if self.catalog is None or not full_rescan:
+            self._update_metadata(root_dir, changed_ids)
+            self.update_thumbnail_pack()
+        for wallpaper_id in changed_ids:
+            self.loader.invalidate_preview(path.join(root_dir, wallpaper_id))
+            self.wallpaper_sizes.pop(wallpaper_id, None) # measured again on the next analysis
+
+        if self.log_callback:
+            detail = "full rescan" if full_rescan else f"{len(changed_ids)} wallpapers changed"
+            self.log_callback(f"[WATCHER] Library changed: {detail}")
+
+        self.refresh()
+        self._reload_previews(root_dir, changed_ids)
+
+    def _reload_previews(self, root_dir: str, wallpaper_ids) -> None:
+        """Request the preview again for the tiles on screen of wallpapers whose files changed"""
+        if self.gallery_view.current_view != "wallpapers" or not wallpaper_ids:
+            return
+        if self.gallery_view.virtual_gallery is not None and self.gallery_view.virtual_gallery.active:
+            self.gallery_view.virtual_gallery.reload(wallpaper_ids)
+            return
+        for index, wallpaper_id in self.gallery_view.visible_wallpaper_tiles(wallpaper_ids):
+            self._request_preview(root_dir, index, wallpaper_id)
+
+    def _update_catalog(self, root_dir: str, rescan: bool = False, reindex_all: bool = False) -> None:
+        """
+        Keep the catalog of root_dir up to date without walking it on the Tk thread: views render from the catalog as
+        it is, a rescan runs on the catalog's scanner thread when needed and its changes are applied when it arrives
+
+        Args:
+            rescan: Rescan even if the mtime of root_dir didn't move (full refresh, catches previews updated inside
+                    existing folders when the watcher is off). Otherwise only a root_dir this session never scanned
+                    or whose mtime moved (wallpapers added or removed) is rescanned, checking that is a single stat
+            reindex_all: Stat every project.json afterwards, not only those of the folders the rescan found changed
+        """
+        if self.catalog is None or not root_dir or not path.isdir(root_dir):
+            return
+        if rescan or (root_dir not in self._awaited_rescans and self.catalog.needs_rescan(root_dir)):
+            self._awaited_rescans.add(root_dir)
+            self.catalog.rescan_async(root_dir,
+                                      lambda result: self._on_catalog_rescanned(root_dir, result, reindex_all))
+        elif root_dir not in self._synced_roots and root_dir not in self._awaited_rescans:
+            # Scanned before this manager asked (startup scan), only the first metadata and pack sync is missing
+            self._on_catalog_rescanned(root_dir, ([], [], []))
+
+    def _on_catalog_rescanned(self, root_dir: str, result, reindex_all: bool = False) -> None:
+        """Main thread: apply a background rescan of root_dir, the view is refreshed if wallpapers changed"""
+        self._awaited_rescans.discard(root_dir)
+        if result is None:
+            return
+        added, changed, removed = result
+        # First scan of root_dir this session: every project.json and the whole pack are checked once
+        first_sync = reindex_all or root_dir not in self._synced_roots
+        self._synced_roots.add(root_dir)
+        if first_sync:
+            self._update_metadata(root_dir)
+        elif any(result):
+            self._update_metadata(root_dir, added + changed + removed)
+        if root_dir != self.config["--dir"]:
+            return # switched away meanwhile, the pack and the view follow --dir
+        if first_sync or any(result):
+            self.update_thumbnail_pack()
+        if not any(result):
+            return
+        for wallpaper_id in changed + removed:
+            self.loader.invalidate_preview(path.join(root_dir, wallpaper_id))
+            self.wallpaper_sizes.pop(wallpaper_id, None)
+        self.group_counts.invalidate()
+        self._invalidate_search_index()
+        if self.log_callback:
+            self.log_callback(f"[CATALOG] {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+        self.refresh()
+        self._reload_previews(root_dir, changed)
+
+    def _update_metadata(self, root_dir: str, wallpaper_ids=None) -> None:
+        """Re-index the project.json of root_dir in the background, only the modified files are parsed"""
+        if self.metadata_indexer is None:
+            return
+
+        def on_done(parsed, unchanged, removed):
+            if parsed or removed:
+                self._invalidate_search_index()
+                if self.search_query.strip():
+                    self.set_search(self.search_query) # titles and tags may match now
+            if (parsed or removed) and self.log_callback:
+                self.log_callback(f"[METADATA] {parsed} project.json parsed, {unchanged} unchanged, {removed} removed")
+
+        self.metadata_indexer.update_async(root_dir, wallpaper_ids, on_done)
+
+    def update_thumbnail_pack(self, only_if_decoded: bool = False) -> None:
+        """
+        Sync the thumbnail pack with the catalog of --dir in the background: changed and removed wallpapers are
+        dropped, thumbnails the disk cache got since the last sync are packed
+
+        Args:
+            only_if_decoded: Skip the sync unless the pipeline decoded previews since the last one (called on idle)
+        """
+        pack = self.loader.pack
+        root_dir = self.config["--dir"]
+        if pack is None or self.catalog is None or self.loader.disk_cache is None or not root_dir:
+            return
+        decoded = self.preview_pipeline.decoded if self.preview_pipeline else None
+        if only_if_decoded and (pack.busy or decoded == self._pack_synced_decodes):
+            return
+        self._pack_synced_decodes = decoded
+
+        try:
+            entries = {}
+            for wallpaper_id, (preview_path, mtime_ns, size) in self.catalog.preview_stats(root_dir).items():
+                # The catalog stores absolute paths, the disk cache keys are built from --dir as configured
+                folder = path.join(root_dir, wallpaper_id)
+                entries[folder] = ThumbnailDiskCache.key_of(path.join(folder, path.basename(preview_path)), mtime_ns, size)
+        except Exception as e:
+            print(f"[WARNING] Thumbnail pack update failed: {e}")
+            return
+
+        def on_done(packed, dropped):
+            if (packed or dropped) and self.log_callback:
+                self.log_callback(f"[CACHE] Thumbnail pack: {packed} packed, {dropped} dropped, {len(pack)} total")
+
+        pack.sync_async(entries, self.loader.disk_cache, on_done)
+
+    def _update_library_scan(self, root_dir: str, rescan: bool = False) -> None:
+        """
+        Without a catalog, keep one LibraryScan of root_dir for the refreshes instead of one walk per list. It is only
+        taken again on a full refresh or when root_dir changed (other directory or its mtime moved: wallpapers added
+        or removed), group and favorite edits reuse it. Such a change also drops the counts of the groups view
+        """
+        if self.catalog is not None or not root_dir or not path.isdir(root_dir):
+            self.library_scan = None
+            self._library_state = None
+            return
+        try:
+            state = (root_dir, os.stat(root_dir).st_mtime_ns)
+        except OSError:
+            state = None
+        changed = rescan or state is None or state != self._library_state
+        if changed and self._library_state is not None:
+            # Counts were taken from another state of the library
+            self.group_counts.invalidate()
+        self._library_state = state
+        if changed:
+            self.library_scan = None
+            self._invalidate_search_index()
+        if self.gallery_view.current_view == "groups" or self.library_scan is not None:
+            return # the groups view doesn't list wallpapers, its counts come from self.group_counts
+        self.library_scan = scan_library(root_dir)
 
     def _render_groups_view(self, root_dir: str) -> None:
-        """Render the groups view showing all wallpaper groups"""
+        """Render the groups view showing all wallpaper groups, counts that aren't cached show up when computed"""
 
         groups = self.group_manager.get_all_groups()
-        self.gallery_view.item_list = ["__ALL__", "__FAVORITES__"] + groups + ["__NEW_GROUP__"]
-
+        temporary_groups = list(self.group_manager.temporary_groups)
+        sizes = self._get_wallpaper_sizes(root_dir)
+        if sizes and self.sort_by_size:
+            groups.sort(key=lambda group_id: self._group_size(sizes, self.group_manager.get_group_contents(group_id)),
+                        reverse=True)
+        self.gallery_view.item_list = ["__ALL__", "__FAVORITES__"] + temporary_groups + groups + ["__NEW_GROUP__"]
+        self.loader.pin_previews([])
 
+        missing = {}
         for index, group_id in enumerate(self.gallery_view.item_list):
             row = index // self.gallery_view.max_cols
             col = index % self.gallery_view.max_cols
 
             if group_id == "__NEW_GROUP__":
                 self.gallery_view.create_new_group_thumbnail(index, row, col)
+                continue
 
-            elif group_id == "__ALL__":
-                count = count_all_wallpapers(root_dir, self.loader)
-                self.gallery_view.create_group_thumbnail(
-                    index, row, col, group_id, "All wallpapers", count
-                )
-
+            if group_id == "__ALL__":
+                name, members = "All wallpapers", None
             elif group_id == "__FAVORITES__":
-                count = count_favorite_wallpapers(
-                    root_dir, self.config["--favorites"], self.loader
-                )
-                self.gallery_view.create_group_thumbnail(
-                    index, row, col, group_id, "Favorites", count
-                )
-
+                name, members = "Favorites", list(self.config["--favorites"])
+            elif self.group_manager.is_temporary_group(group_id):
+                temporary_group = self.group_manager.temporary_groups[group_id]
+                name, members = temporary_group["label"], list(temporary_group["members"])
             else:
-                count = len(self.group_manager.get_group_contents(group_id))
-                self.gallery_view.create_group_thumbnail(
-                    index, row, col, group_id, group_id, count
-                )
+                name, members = group_id, list(self.group_manager.get_group_contents(group_id))
 
-    def _render_wallpapers_view(self, root_dir: str) -> None:
-        """Render the wallpapers view showing thumbnails for selected group or all"""
+            count = self.group_counts.get(root_dir, group_id, members)
+            if count is None:
+                missing[group_id] = members
+            size = format_size(self._group_size(sizes, members)) if sizes else None
+            self.gallery_view.create_group_thumbnail(index, row, col, group_id, name, count, size)
 
-        wallpapers = get_wallpapers_list(
+        self.group_counts.request(root_dir, missing, self.gallery_view.set_group_count)
+
+    def _list_wallpapers(self, root_dir: str) -> list:
+        """Wallpapers of the current group (before search filtering), remembered for set_search()"""
+        group = self.gallery_view.current_group
+        temporary = self.group_manager.is_temporary_group(group)
+        groups_dict = {group: self.group_manager.get_group_contents(group)} if temporary else self.config["--groups"]
+        self._view_wallpapers = get_wallpapers_list(
             root_dir,
             self.loader,
-            self.gallery_view.current_group,
+            group,
             self.config["--favorites"],
-            self.config["--groups"]
+            groups_dict,
+            catalog=self.catalog,
+            scan=self.library_scan,
+            metadata_filter=self.metadata_filter
         )
+        if temporary:
+            # Keep the order of the temporary group (duplicates next to each other)
+            order = {wallpaper_id: index for index, wallpaper_id in enumerate(groups_dict[group])}
+            self._view_wallpapers.sort(key=order.__getitem__)
+        elif self.sort_by_size:
+            sizes = self._get_wallpaper_sizes(root_dir)
+            if sizes:
+                self._view_wallpapers.sort(key=lambda wallpaper_id: sizes.get(wallpaper_id, 0), reverse=True)
+        return self._filter_search(root_dir, self._view_wallpapers)
+
+    def _render_wallpapers_view(self, root_dir: str) -> None:
+        """Render the wallpapers view showing thumbnails for selected group or all"""
+
+        wallpapers = self._list_wallpapers(root_dir)
         self.gallery_view.item_list = wallpapers
 
+        if self.gallery_view.virtual_gallery is not None:
+            # Only the visible tiles exist, so only their previews are requested and pinned
+            self.gallery_view.show_virtual_wallpapers(
+                wallpapers,
+                lambda index, wallpaper_id: self._request_preview(root_dir, index, wallpaper_id),
+                lambda visible: self.loader.pin_previews(path.join(root_dir, w) for w in visible),
+                self.preview_pipeline.cancel_request if self.preview_pipeline else None
+            )
+            return
+
+        # Every widget tile keeps its own PhotoImage, pinning them all would only stop the cache from evicting: the
+        # budget can't bound a view that displays the whole library, only virtual/canvas mode can
+        self.loader.pin_previews([])
 
         for index, wallpaper_id in enumerate(wallpapers):
             row = index // self.gallery_view.max_cols
             col = index % self.gallery_view.max_cols
+            self._create_wallpaper_tile(root_dir, index, row, col, wallpaper_id)
+
+        if not self.preview_pipeline:
+            self.loader.flush_disk_cache(in_background=True)
+            if self.log_callback:
+                self.log_callback(f"[CACHE] {self.loader.cache_stats()}")
+
+    def _update_wallpapers_view(self, root_dir: str) -> None:
+        """Incremental refresh of the wallpapers view: only new, removed or moved tiles cost widget work"""
+        self._show_wallpapers(root_dir, self._list_wallpapers(root_dir))
+
+    def _show_wallpapers(self, root_dir: str, wallpapers: list, keep_hidden: bool = False) -> None:
+        """Diff the wallpapers view against a new list, creating only the tiles that don't exist yet"""
+        if self.gallery_view.virtual_gallery is not None:
+            self.gallery_view.update_virtual_wallpapers(wallpapers)
+            return
+
+        missing = self.gallery_view.update_wallpaper_thumbnails(wallpapers, keep_hidden=keep_hidden)
+        for index, row, col, wallpaper_id in missing:
+            self._create_wallpaper_tile(root_dir, index, row, col, wallpaper_id)
+
+    def show_duplicates(self, clusters) -> None:
+        """
+        Show the result of the duplicate finder as the temporary '__DUPLICATES__' group and open it
+
+        Args:
+            clusters: Lists of wallpaper ids that look alike, see services.duplicate_finder.cluster_pairs()
+        """
+        if not clusters:
+            self.group_manager.discard_temporary_group("__DUPLICATES__")
+            if self.log_callback:
+                self.log_callback("[DUPES] No duplicates found")
+            self.refresh()
+            return
+
+        members = [wallpaper_id for cluster in clusters for wallpaper_id in cluster]
+        # The lowest Workshop id is the oldest upload, likely the original: the others are the extra copies
+        extras = [wallpaper_id for cluster in clusters for wallpaper_id in cluster[1:]]
+        self.group_manager.set_temporary_group("__DUPLICATES__", "Duplicates", members, extras)
+        self.group_counts.invalidate()
+        if self.log_callback:
+            self.log_callback(f"[DUPES] {len(clusters)} sets of duplicates, {len(extras)} extra copies")
+        self.gallery_view.open_group("__DUPLICATES__")
+
+    def analyze_disk_usage(self, show_largest: bool = False) -> bool:
+        """
+        Measure every wallpaper folder of --dir in the background, the gallery is refreshed with the sizes when done
+
+        Args:
+            show_largest: Then open the 'Largest N' temporary group (--disk-usage.largest_count wallpapers)
+
+        Returns:
+            bool: False when there is nothing to measure or an analysis is already running
+        """
+        root_dir = self.config["--dir"]
+        if self.disk_usage is None or not root_dir or not path.isdir(root_dir):
+            return False
+        if self.disk_usage.busy:
+            if self.log_callback:
+                self.log_callback("[DISK] Already measuring...")
+            return False
+
+        started = time.perf_counter()
+
+        def on_done(sizes, walked):
+            if root_dir != self.config["--dir"]:
+                return
+            self.wallpaper_sizes = sizes
+            self.wallpaper_sizes_root = root_dir
+            if self.log_callback:
+                self.log_callback(f"[DISK] {len(sizes)} wallpapers, {format_size(sum(sizes.values()))} in total "
+                                  f"({walked} folders walked, {len(sizes) - walked} cached) "
+                                  f"in {time.perf_counter() - started:.1f}s")
+            if show_largest:
+                self.show_largest()
+            elif self.gallery_view.on_refresh_needed:
+                self.gallery_view.on_refresh_needed() # the scroll region follows the new order too
+            else:
+                self.refresh()
+
+        if self.log_callback:
+            self.log_callback("[DISK] Measuring wallpaper folders...")
+        self.disk_usage.measure_async(root_dir, on_done=on_done)
+        return True
+
+    def show_largest(self, count: int = None) -> None:
+        """
+        Show the largest wallpapers as the temporary '__LARGEST__' group (largest first) and open it
+
+        Args:
+            count: How many, --disk-usage.largest_count by default
+        """
+        sizes = self._get_wallpaper_sizes(self.config["--dir"])
+        if not sizes:
+            return
+        if count is None:
+            count = self.config.get("--disk-usage", {}).get("largest_count", 50)
+        largest = sorted(sizes, key=sizes.__getitem__, reverse=True)[:count]
+        self.group_manager.set_temporary_group("__LARGEST__", f"Largest {len(largest)}", largest, largest,
+                                               extras_label="wallpapers")
+        self.group_counts.invalidate()
+        if self.log_callback:
+            total = sum(sizes[wallpaper_id] for wallpaper_id in largest)
+            self.log_callback(f"[DISK] Largest {len(largest)} wallpapers take {format_size(total)}")
+        self.gallery_view.open_group("__LARGEST__")
+
+    def set_sort_by_size(self, enabled: bool) -> None:
+        """Order groups and wallpapers largest first, the folders are measured first if needed"""
+        self.sort_by_size = enabled
+        if enabled and not self._get_wallpaper_sizes(self.config["--dir"]) and self.analyze_disk_usage():
+            return # refreshed when the sizes are in
+        self.refresh()
+
+    def _get_wallpaper_sizes(self, root_dir: str) -> dict:
+        """Sizes of the last analysis if it's about root_dir, empty otherwise"""
+        return self.wallpaper_sizes if self.wallpaper_sizes_root == root_dir else {}
+
+    @staticmethod
+    def _group_size(sizes: dict, members) -> int:
+        """Total bytes of a group, members=None is the whole directory"""
+        if members is None:
+            return sum(sizes.values())
+        return sum(sizes.get(str(wallpaper_id), 0) for wallpaper_id in members)
+
+    def set_search(self, query: str):
+        """
+        Filter the wallpapers view by id, title and tags without reloading it: the list on screen is narrowed (or
+        widened back) in memory and only the tiles that appear or disappear are touched
+
+        Args:
+            query: Search text, empty to show every wallpaper of the group
+
+        Returns:
+            tuple or None: (shown, total) wallpaper counts, None when there are no wallpapers on screen to filter
+        """
+        self.search_query = query
+        root_dir = self.config["--dir"]
+        if self.gallery_view.current_view != "wallpapers" or self._rendered_view_key is None:
+            return None
+
+        wallpapers = self._filter_search(root_dir, self._view_wallpapers)
+        self._show_wallpapers(root_dir, wallpapers, keep_hidden=True)
+        return len(wallpapers), len(self._view_wallpapers)
+
+    def _filter_search(self, root_dir: str, wallpapers: list) -> list:
+        """Keep the wallpapers matching the current search query (all of them when there is none)"""
+        if not self.search_query.strip():
+            return wallpapers
+        matches = self._get_search_index(root_dir).search(self.search_query)
+        if matches is None:
+            return wallpapers
+        return [wallpaper_id for wallpaper_id in wallpapers if wallpaper_id in matches]
+
+    def _get_search_index(self, root_dir: str) -> SearchIndex:
+        """Search index of root_dir, built on first use from the catalog metadata (ids only without a catalog)"""
+        if self._search_index is None or self._search_index_root != root_dir:
+            if self.catalog is not None:
+                entries = self.catalog.search_entries(root_dir)
+            else:
+                scan = self.library_scan or scan_library(root_dir)
+                entries = [(wallpaper_id, None, ()) for wallpaper_id in scan.wallpaper_ids]
+            self._search_index = SearchIndex(entries)
+            self._search_index_root = root_dir
+        return self._search_index
+
+    def _invalidate_search_index(self) -> None:
+        """The library or its metadata changed, the index is rebuilt on the next search"""
+        self._search_index = None
+
+    def _create_wallpaper_tile(self, root_dir: str, index: int, row: int, col: int, wallpaper_id: str) -> None:
+        """Create a single wallpaper tile and load its preview (asynchronously when the pipeline is available)"""
+        folder = path.join(root_dir, wallpaper_id)
+
+        if self.preview_pipeline:
+            # Placeholder first, the tile is filled in when the worker threads are done with it
+            self.gallery_view.create_wallpaper_thumbnail(
+                index, row, col, wallpaper_id, None
+            )
+            self.preview_pipeline.request(
+                folder,
+                lambda img: self.gallery_view.set_wallpaper_image(index, wallpaper_id, img)
+            )
+            return
+
+        img = self.loader.load_preview(folder)
+        self.gallery_view.create_wallpaper_thumbnail(
+            index, row, col, wallpaper_id, img
+        )
+        if not img:
+            self.gallery_view.set_wallpaper_image(index, wallpaper_id, None)
 
-            folder = path.join(root_dir, wallpaper_id)
-            img = self.loader.load_preview(folder)
+    def _request_preview(self, root_dir: str, index: int, wallpaper_id: str):
+        """
+        Load the preview of a single tile, asynchronously when the decode pipeline is available
 
-            if img:
-                self.gallery_view.create_wallpaper_thumbnail(
-                    index, row, col, wallpaper_id, img
-                )
\ No newline at end of file
+        Returns:
+            tuple or None: Pipeline handle while the decode is pending, see PreviewDecodePipeline.cancel_request()
+        """
+        folder = path.join(root_dir, wallpaper_id)
+        if self.preview_pipeline:
+            return self.preview_pipeline.request(
+                folder,
+                lambda img: self.gallery_view.set_wallpaper_image(index, wallpaper_id, img)
+            )
+        self.gallery_view.set_wallpaper_image(index, wallpaper_id, self.loader.load_preview(folder))
+        return None
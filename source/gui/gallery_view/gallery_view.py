@@ -1,7 +1,10 @@
+from os import path
 from common.constants import THUMB_SIZE
 from gui.gallery_view.thumbnails import ThumbnailFactory
 from gui.gallery_view.context_menus import ContextMenuManager
 from gui.gallery_view.dialogs import DialogManager
+from gui.gallery_view.virtual_gallery import VirtualGallery
+from gui.gallery_view.canvas_gallery import CanvasGallery
 from models.groups import GroupManager
 
 
@@ -20,6 +23,8 @@ class GalleryView:
 
         self.item_list = []
         self.thumbnail_widgets = {}
+        self.wallpaper_tiles = {} # wallpaper id -> thumbnail frame, lets refreshes reuse tiles that only moved
+        self.hidden_tiles = {} # wallpaper id -> thumbnail frame filtered out by a search, kept to show it back cheaply
         self.current_view = "groups"
         self.current_group = None
         self.current_wallpaper = None
@@ -32,6 +37,10 @@ class GalleryView:
         self.thumbnails = ThumbnailFactory(inner_frame, config)
         self.context_menu_manager = ContextMenuManager(canvas, config, self.group_manager)
         self.dialog_manager = DialogManager(canvas, config, log_callback)
+        # Set by enable_virtual_mode(), the wallpapers view then only materializes the visible tiles
+        self.virtual_gallery = None
+        # Optional HoverPreview, larger (animated) preview of the wallpaper under the pointer
+        self.hover_preview = None
 
 
         self.on_wallpaper_applied = None # placeholders for event_handler for future implementation
@@ -47,18 +56,57 @@ class GalleryView:
         for widget in self.inner_frame.winfo_children():
             widget.destroy()
         self.thumbnail_widgets = {}
+        self.wallpaper_tiles = {}
+        self.hidden_tiles = {}
+        if self.hover_preview:
+            self.hover_preview.hide() # its tile may be gone without a <Leave>
+        if self.virtual_gallery:
+            self.virtual_gallery.clear()
+
+    def enable_virtual_mode(self, gallery_canvas, draw_on_canvas=False) -> None:
+        """
+        Render the wallpapers view with a pool of reusable tiles instead of one widget tree per wallpaper,
+        draw_on_canvas=True draws them as canvas items (no widgets at all) and hit-tests clicks on the grid
+        """
+        gallery_class = CanvasGallery if draw_on_canvas else VirtualGallery
+        self.virtual_gallery = gallery_class(
+            gallery_canvas, self.thumbnails,
+            on_double_click=self.apply_wallpaper,
+            on_right_click=self._handle_wallpaper_right_click,
+            on_hover=self._handle_wallpaper_hover
+        )
 
+    def show_virtual_wallpapers(self, wallpapers, request_image, on_visible_changed=None, cancel_request=None) -> None:
+        """Display wallpapers through the virtual gallery (enable_virtual_mode() must have been called)"""
+        self.virtual_gallery.show(
+            wallpapers, self.max_cols,
+            current_wallpaper=self.current_wallpaper,
+            request_image=request_image,
+            on_visible_changed=on_visible_changed,
+            cancel_request=cancel_request
+        )
 
 
-    def create_group_thumbnail(self, index: int, row: int, col: int, group_id: str, name: str, count: int) -> None:
-        """Create a group thumbnail widget"""
+
+    def create_group_thumbnail(self, index: int, row: int, col: int, group_id: str, name: str, count,
+                               size: str = None) -> None:
+        """Create a group thumbnail widget, count=None shows a placeholder until set_group_count(), size is a readout"""
         frame = self.thumbnails.create_group_thumbnail(
             index, row, col, group_id, name, count,
             on_click=self.open_group,
-            on_right_click=self._handle_group_right_click
+            on_right_click=self._handle_group_right_click,
+            size=size
         )
         self.thumbnail_widgets[index] = frame
 
+    def set_group_count(self, group_id: str, count: int) -> None:
+        """Fill in the count of a group thumbnail once it's known, if the groups view is still on screen"""
+        if self.current_view != "groups":
+            return
+        for frame in self.thumbnail_widgets.values():
+            if getattr(frame, "group_id", None) == group_id:
+                self.thumbnails.set_group_count(frame, count)
+
     def create_new_group_thumbnail(self, index: int, row: int, col: int) -> None:
         """Create thumbnail button for creating a new group"""
         frame = self.thumbnails.create_new_group_thumbnail(
@@ -73,10 +121,92 @@ class GalleryView:
             index, row, col, wallpaper_id, img,
             current_wallpaper=self.current_wallpaper,
             on_double_click=self.apply_wallpaper,
-            on_right_click=self._handle_wallpaper_right_click
+            on_right_click=self._handle_wallpaper_right_click,
+            on_hover=self._handle_wallpaper_hover
         )
         self.thumbnail_widgets[index] = frame
-        print(f"[GalleryView] Created thumbnail for wallpaper '{wallpaper_id}' at index {index} (row {row}, col {col})")
+        self.wallpaper_tiles[wallpaper_id] = frame
+
+    def update_wallpaper_thumbnails(self, wallpapers, keep_hidden: bool = False) -> list:
+        """
+        Diff the wallpapers on screen against a new list: tiles of wallpapers still listed are kept (decorations
+        updated in place, re-gridded only if their cell changed), the others are destroyed
+
+        Args:
+            wallpapers: New wallpaper ids in display order
+            keep_hidden: Ungrid the tiles that are no longer listed instead of destroying them (search filtering,
+                         they are likely to come back)
+
+        Returns:
+            list: (index, row, col, wallpaper_id) of the wallpapers that have no tile yet, for the caller to create
+        """
+        old_tiles = self.wallpaper_tiles
+        hidden_tiles = self.hidden_tiles
+        self.item_list = wallpapers
+        self.thumbnail_widgets = {}
+        self.wallpaper_tiles = {}
+        self.hidden_tiles = {}
+
+        missing = []
+        for index, wallpaper_id in enumerate(wallpapers):
+            row, col = divmod(index, self.max_cols)
+            frame = old_tiles.pop(wallpaper_id, None) or hidden_tiles.pop(wallpaper_id, None)
+            if frame is None:
+                missing.append((index, row, col, wallpaper_id))
+                continue
+
+            if frame.grid_position != (row, col):
+                frame.grid(row=row, column=col)
+                frame.grid_position = (row, col)
+            self.thumbnails.update_wallpaper_thumbnail(frame, self.current_wallpaper)
+            self.thumbnail_widgets[index] = frame
+            self.wallpaper_tiles[wallpaper_id] = frame
+
+        if keep_hidden:
+            for wallpaper_id, frame in old_tiles.items():
+                frame.grid_remove()
+                frame.grid_position = None
+                hidden_tiles[wallpaper_id] = frame
+            self.hidden_tiles = hidden_tiles
+        else:
+            for frame in list(old_tiles.values()) + list(hidden_tiles.values()):
+                frame.destroy()
+        return missing
+
+    def update_virtual_wallpapers(self, wallpapers) -> None:
+        """Diff-based counterpart of show_virtual_wallpapers(), only visible tiles are touched"""
+        self.item_list = wallpapers
+        self.virtual_gallery.update_items(wallpapers, self.max_cols, current_wallpaper=self.current_wallpaper)
+
+    def visible_wallpaper_tiles(self, wallpaper_ids) -> list:
+        """(index, wallpaper_id) of the widget tiles showing any of these wallpapers"""
+        indexes = {wallpaper_id: index for index, wallpaper_id in enumerate(self.item_list)}
+        return [
+            (indexes[wallpaper_id], wallpaper_id) for wallpaper_id in wallpaper_ids
+            if wallpaper_id in self.wallpaper_tiles and wallpaper_id in indexes
+        ]
+
+    def relayout(self) -> None:
+        """Re-grid the tiles on screen for the current max_cols, without rescanning or reloading anything"""
+        if self.virtual_gallery and self.virtual_gallery.active:
+            self.virtual_gallery.relayout(self.max_cols)
+            return
+        for index, frame in self.thumbnail_widgets.items():
+            row, col = divmod(index, self.max_cols)
+            if getattr(frame, "grid_position", None) != (row, col):
+                frame.grid(row=row, column=col)
+                frame.grid_position = (row, col)
+
+    def set_wallpaper_image(self, index: int, wallpaper_id: str, img) -> None:
+        """Fill a placeholder wallpaper thumbnail once its preview has been decoded"""
+        if self.virtual_gallery and self.virtual_gallery.active:
+            if index < len(self.item_list) and self.item_list[index] == wallpaper_id:
+                self.virtual_gallery.set_image(index, wallpaper_id, img)
+            return
+        # Looked up by id, incremental refreshes may have moved the tile since the decode was requested
+        frame = self.wallpaper_tiles.get(wallpaper_id) or self.hidden_tiles.get(wallpaper_id)
+        if frame is not None:
+            self.thumbnails.set_wallpaper_image(frame, img)
 
 
 
@@ -113,8 +243,25 @@ class GalleryView:
         }
         self.context_menu_manager.show_wallpaper_menu(event, wallpaper_id, callbacks)
 
+    def _handle_wallpaper_hover(self, event, wallpaper_id):
+        """Pointer entered (wallpaper_id) or left (None) a wallpaper tile"""
+        if self.hover_preview is None:
+            return
+        if not wallpaper_id or not self.config.get("--dir"):
+            self.hover_preview.hide()
+            return
+        preview_path = self.loader.find_preview(path.join(self.config["--dir"], wallpaper_id))
+        self.hover_preview.show(preview_path, event.x_root, event.y_root)
+
     def _handle_group_right_click(self, event, group_id):
         """Handle right-click context menu on a group"""
+        if self.group_manager.is_temporary_group(group_id):
+            self.context_menu_manager.show_temporary_group_menu(event, group_id, {
+                'on_mark_extras_not_working': self._mark_extras_not_working_and_refresh,
+                'on_save_as_group': self._save_temporary_group_and_refresh,
+                'on_discard': self._discard_temporary_group_and_refresh
+            })
+            return
         self.context_menu_manager.show_group_menu(
             event, group_id,
             on_delete=self._delete_group_and_refresh
@@ -160,6 +307,39 @@ class GalleryView:
         self.log(f"[GUI] Deleted group '{group_id}'")
         self._trigger_refresh()
 
+    def _mark_extras_not_working_and_refresh(self, group_id):
+        """Move the extra copies of a temporary group (duplicates) to 'not working' in one go"""
+        extras = self.group_manager.temporary_groups[group_id]["extras"]
+        added = self.group_manager.add_many_to_group("not working", extras)
+        self.log(f"[GUI] Marked {added} wallpapers as 'not working'")
+        self._trigger_refresh()
+
+    def _save_temporary_group_and_refresh(self, group_id):
+        """Save every wallpaper of a temporary group to a new regular group, named by the user"""
+        temporary_group = self.group_manager.temporary_groups[group_id]
+        members = list(temporary_group["members"])
+
+        def save(name):
+            # Saving into an existing group would silently merge two different results
+            if name in self.group_manager.get_all_groups():
+                self.log(f"[GUI] Group '{name}' already exists, pick another name")
+                return False
+            added = self.group_manager.add_many_to_group(name, members)
+            self.log(f"[GUI] Saved {added} wallpapers to group '{name}'")
+            self._trigger_refresh()
+            return True
+
+        default_name = self.group_manager.unique_group_name(temporary_group["label"].lower())
+        self.dialog_manager.show_save_group_dialog(default_name, on_save=save)
+
+    def _discard_temporary_group_and_refresh(self, group_id):
+        """Drop a temporary group"""
+        self.group_manager.discard_temporary_group(group_id)
+        if self.current_group == group_id:
+            self.current_view = "groups"
+            self.current_group = None
+        self._trigger_refresh()
+
     def _show_assign_groups_dialog(self, wallpaper_id):
         """Display dialog for assigning wallpaper to groups"""
         self.dialog_manager.show_assign_groups_dialog(
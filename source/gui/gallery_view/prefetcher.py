@@ -0,0 +1,162 @@
+"""Scroll-direction-aware thumbnail prefetcher"""
+"""The virtualized galleries only request a preview when its tile is bound, so scrolling fast through a cold library
+shows blank tiles: the decode starts when the tile is already on screen. ThumbnailPrefetcher follows the view (the
+mouse wheel and the scrollbar both end up in GalleryCanvas' yscrollcommand, which calls the view listeners) and keeps
+the decode pipeline busy with the rows that are about to scroll in:
+
+- the direction and the speed come from the last view positions, the faster the scroll the more screens ahead
+- the wanted rows are requested nearest first, never more than max_in_flight at a time, so the tiles that really are
+  on screen never wait behind a long list of prefetches
+- after every move, queued prefetches outside the window are dropped and the ones that fell far behind the view are
+  withdrawn from the pipeline
+- a tile bound while its prefetch is still decoding doesn't decode it again, the pipeline merges both requests
+
+Prefetched previews land in the loader's memory cache, the tile finds them there when it's bound. The hit rate is
+the share of tiles that scrolled into view with their preview already cached."""
+
+import time
+from collections import deque
+
+
+class ThumbnailPrefetcher:
+    """Requests the previews of the rows ahead of the scroll, see the module docstring"""
+
+    MAX_SCREENS = 6 # cap of the velocity boost
+    KEEP_BEHIND_SCREENS = 1 # in-flight prefetches closer than this behind the view are left alone
+    VELOCITY_SMOOTHING = 0.5
+
+    def __init__(self, pipeline, virtual_gallery, folder_of, screens=2, max_in_flight=4):
+        """
+        Args:
+            pipeline: PreviewDecodePipeline that does the decoding
+            virtual_gallery: VirtualGallery (or CanvasGallery) whose view is followed
+            folder_of: Maps a wallpaper id to its folder (depends on --dir)
+            screens: Screens prefetched ahead at low speed
+            max_in_flight: Prefetches queued in the pipeline at once
+        """
+        self.pipeline = pipeline
+        self.gallery = virtual_gallery
+        self.folder_of = folder_of
+        self.screens = max(1, screens)
+        self.max_in_flight = max(1, max_in_flight)
+
+        self._generation = 0
+        self._queue = deque() # (index, wallpaper_id) nearest first, not requested yet
+        self._in_flight = {} # wallpaper_id -> (index, handle)
+        self._visible = range(0)
+        self._last_top = None
+        self._last_time = None
+        self._velocity = 0.0 # px/s, positive scrolling down
+        self._direction = 1
+
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.cancelled = 0
+
+        virtual_gallery.gallery_canvas.view_listeners.append(self.update)
+
+    def reset(self):
+        """The gallery was rebuilt (and the pipeline's pending work cancelled): forget the queue and the view"""
+        self._generation += 1
+        self._queue.clear()
+        self._in_flight = {}
+        self._visible = range(0)
+        self._last_top = None
+        self._velocity = 0.0
+
+    def update(self):
+        """View listener: account for the tiles that scrolled in and re-plan the prefetch window"""
+        gallery = self.gallery
+        if not gallery.active or not gallery.items:
+            return
+
+        canvas = gallery.canvas
+        top = canvas.canvasy(0)
+        now = time.perf_counter()
+        if self._last_top is not None and top != self._last_top:
+            elapsed = max(now - self._last_time, 1e-3)
+            speed = (top - self._last_top) / elapsed
+            self._velocity = self.VELOCITY_SMOOTHING * self._velocity + (1 - self.VELOCITY_SMOOTHING) * speed
+            self._direction = 1 if top > self._last_top else -1
+        first_view = self._last_top is None
+        self._last_top, self._last_time = top, now
+
+        visible = gallery.visible_range()
+        if not first_view:
+            # Only tiles brought in by scrolling count, the first screen of a view can't have been prefetched
+            for index in visible:
+                if index not in self._visible:
+                    if self.pipeline.loader.get_cached_preview(self.folder_of(gallery.items[index])):
+                        self.hits += 1
+                    else:
+                        self.misses += 1
+        self._visible = visible
+        self._plan(visible, max(canvas.winfo_height(), gallery.cell_height))
+
+    def _plan(self, visible, view_height):
+        gallery = self.gallery
+        columns = gallery.columns
+        rows_per_screen = max(1, int(view_height // gallery.cell_height))
+        screens = min(self.MAX_SCREENS, self.screens + int(abs(self._velocity) / view_height))
+        first_row = visible.start // columns
+        last_row = (visible.stop - 1) // columns if len(visible) else first_row
+        total_rows = (len(gallery.items) + columns - 1) // columns
+
+        ahead = screens * rows_per_screen
+        behind = self.KEEP_BEHIND_SCREENS * rows_per_screen
+        if self._direction > 0:
+            rows = range(last_row + 1, min(total_rows, last_row + 1 + ahead))
+            keep = range(max(0, first_row - behind) * columns, (last_row + 1 + ahead) * columns)
+        else:
+            rows = range(first_row - 1, max(-1, first_row - 1 - ahead), -1)
+            keep = range(max(0, first_row - ahead) * columns, (last_row + 1 + behind) * columns)
+
+        for wallpaper_id, (index, handle) in list(self._in_flight.items()):
+            if index not in keep and self.pipeline.cancel_request(handle):
+                del self._in_flight[wallpaper_id]
+                self.cancelled += 1
+
+        self._queue.clear()
+        loader = self.pipeline.loader
+        for row in rows:
+            for index in range(row * columns, min(len(gallery.items), (row + 1) * columns)):
+                wallpaper_id = gallery.items[index]
+                if wallpaper_id in self._in_flight or loader.get_cached_preview(self.folder_of(wallpaper_id)):
+                    continue
+                self._queue.append((index, wallpaper_id))
+        self._pump()
+
+    def _pump(self):
+        """Request queued prefetches while there is room in flight"""
+        while self._queue and len(self._in_flight) < self.max_in_flight:
+            index, wallpaper_id = self._queue.popleft()
+            generation = self._generation
+            self._in_flight[wallpaper_id] = (index, None)
+            handle = self.pipeline.request(
+                self.folder_of(wallpaper_id),
+                lambda img, wallpaper_id=wallpaper_id: self._on_ready(generation, wallpaper_id)
+            )
+            if wallpaper_id in self._in_flight: # not served from the cache right away
+                self._in_flight[wallpaper_id] = (index, handle)
+
+    def _on_ready(self, generation, wallpaper_id):
+        """Main thread (pipeline drain): a prefetch is done, the preview is in the memory cache"""
+        if generation != self._generation:
+            return
+        if self._in_flight.pop(wallpaper_id, None) is not None:
+            self.prefetched += 1
+        self._pump()
+
+    def hit_rate(self):
+        """Share of the tiles that scrolled in with their preview ready, None before any scrolling"""
+        seen = self.hits + self.misses
+        return self.hits / seen if seen else None
+
+    def describe(self):
+        """One line summary for the log area"""
+        rate = self.hit_rate()
+        if rate is None:
+            return "prefetch: no scrolling yet"
+        return (f"prefetch: {rate:.0%} of tiles ready when scrolled in ({self.hits}/{self.hits + self.misses}), "
+                f"{self.prefetched} prefetched, {self.cancelled} cancelled")
@@ -1,6 +1,6 @@
-from tkinter import Frame, Label
+from tkinter import Frame, Label, PhotoImage
 from gui.groups import is_favorite
-from common.constants import UI_COLORS
+from common.constants import UI_COLORS, THUMB_SIZE
 
 
 class ThumbnailFactory:
@@ -9,17 +9,23 @@ class ThumbnailFactory:
     def __init__(self, inner_frame, config):
         self.inner_frame = inner_frame
         self.config = config
+        self._placeholder_img = None
 
-    def create_group_thumbnail(self, index, row, col, group_id, name, count, on_click, on_right_click=None):
-        """Crea un thumbnail de grupo/carpeta"""
+    def create_group_thumbnail(self, index, row, col, group_id, name, count, on_click, on_right_click=None, size=None):
+        """Crea un thumbnail de grupo/carpeta, count=None muestra '…' hasta que se llame a set_group_count(), size (texto) solo si se conoce"""
         frame = Frame(self.inner_frame, bg=UI_COLORS["bg_tertiary"], bd=2, relief="solid", highlightthickness=2, highlightcolor=UI_COLORS["accent_blue"], highlightbackground=UI_COLORS["accent_blue"], padx=20, pady=20)
         frame.grid(row=row, column=col, padx=10, pady=10)
+        frame.group_id = group_id
 
         icon = Label(frame, text="📁", font=("Arial", 36), bg=UI_COLORS["bg_tertiary"], fg=UI_COLORS["accent_cyan_bright"])
         icon.pack()
 
         Label(frame, text=f"{name}", fg=UI_COLORS["fg_text"], bg=UI_COLORS["bg_tertiary"], font=("Arial", 12, "bold")).pack(pady=(5, 0))
-        Label(frame, text=f"{count} items", fg=UI_COLORS["fg_text"], bg=UI_COLORS["bg_tertiary"], font=("Arial", 9)).pack()
+        frame.count_label = Label(frame, fg=UI_COLORS["fg_text"], bg=UI_COLORS["bg_tertiary"], font=("Arial", 9))
+        frame.count_label.pack()
+        self.set_group_count(frame, count)
+        if size:
+            Label(frame, text=size, fg=UI_COLORS["accent_cyan"], bg=UI_COLORS["bg_tertiary"], font=("Arial", 9)).pack()
 
 
         frame.bind("<Button-1>", lambda e: on_click(group_id))
@@ -31,6 +37,10 @@ class ThumbnailFactory:
 
         return frame
 
+    def set_group_count(self, frame, count):
+        """Actualiza el número de wallpapers de un thumbnail de grupo (None = todavía contando)"""
+        frame.count_label.configure(text="… items" if count is None else f"{count} items")
+
     def create_new_group_thumbnail(self, index, row, col, on_click):
         """Crea el thumbnail '+' para crear nuevo grupo"""
         frame = Frame(self.inner_frame, bg=UI_COLORS["bg_tertiary"], bd=2, relief="solid", highlightthickness=2, highlightcolor=UI_COLORS["accent_purple_dark"], highlightbackground=UI_COLORS["accent_purple_dark"], padx=20, pady=20)
@@ -48,28 +58,117 @@ class ThumbnailFactory:
         return frame
 
     def create_wallpaper_thumbnail(self, index, row, col, wallpaper_id, img,
-                                   current_wallpaper, on_double_click, on_right_click, on_click=None):
-        """Crea un thumbnail de wallpaper"""
-        border_color = UI_COLORS["accent_blue"] if wallpaper_id == current_wallpaper else UI_COLORS["accent_blue"]
-
-        thumb_frame = Frame(self.inner_frame, bg=border_color, bd=3, relief="solid", padx=5, pady=5)
+                                   current_wallpaper, on_double_click, on_right_click, on_click=None, on_hover=None):
+        """
+        Crea un thumbnail de wallpaper, img=None deja un placeholder hasta que llegue el preview.
+        on_hover recibe (event, wallpaper_id) al entrar el puntero y (event, None) al salir
+        """
+        thumb_frame = Frame(self.inner_frame, bd=3, relief="solid", padx=5, pady=5)
         thumb_frame.grid(row=row, column=col)
+        thumb_frame.grid_position = (row, col)
+        thumb_frame.wallpaper_id = wallpaper_id
+        thumb_frame.star = None
 
-        label_img = Label(thumb_frame, image=img, bg=UI_COLORS["bg_tertiary"])
+        label_img = Label(thumb_frame, image=img or self._get_placeholder_image(), bg=UI_COLORS["bg_tertiary"])
         label_img.pack()
+        label_img.image = img # the preview cache may evict it, the label must keep its own reference
+        thumb_frame.image_label = label_img
 
 
         if on_click:
             label_img.bind("<Button-1>", lambda e: on_click(wallpaper_id))
         label_img.bind("<Double-Button-1>", lambda e: on_double_click(wallpaper_id))
         label_img.bind("<Button-3>", lambda e: on_right_click(e, wallpaper_id))
+        if on_hover:
+            label_img.bind("<Enter>", lambda e: on_hover(e, wallpaper_id))
+            label_img.bind("<Leave>", lambda e: on_hover(e, None))
+
+        thumb_frame.caption = Label(thumb_frame, fg=UI_COLORS["fg_text"], bg=UI_COLORS["accent_blue"], font=("Courier", 8))
+        thumb_frame.caption.pack()
+
+        self._update_decorations(thumb_frame, wallpaper_id, current_wallpaper)
+
+        return thumb_frame
+
+    def update_wallpaper_thumbnail(self, thumb_frame, current_wallpaper):
+        """Actualiza en el sitio la estrella, el borde y el texto de un thumbnail (tras marcar favorito, etc.)"""
+        self._update_decorations(thumb_frame, thumb_frame.wallpaper_id, current_wallpaper)
+
+    def set_wallpaper_image(self, thumb_frame, img):
+        """Replace the placeholder of a wallpaper thumbnail with its preview (or a 'no preview' text)"""
+        label_img = getattr(thumb_frame, "image_label", None)
+        if label_img is None or not label_img.winfo_exists():
+            return
+        if img:
+            label_img.config(image=img, text="", width=0, height=0)
+            label_img.image = img
+        else:
+            label_img.config(image="", text="no preview", fg=UI_COLORS["fg_text"], font=("Arial", 8),
+                             width=THUMB_SIZE[0] // 8, height=THUMB_SIZE[1] // 16)
+
+    def create_wallpaper_tile(self, parent, on_double_click, on_right_click, on_click=None, on_hover=None):
+        """
+        Crea un thumbnail de wallpaper reutilizable (galeria virtualizada), sin posicionar ni asignar a ningun wallpaper.
+        Los bindings leen tile.wallpaper_id, asi que bind_wallpaper_tile() basta para reasignarlo
+        """
+        tile = Frame(parent, bg=UI_COLORS["accent_blue"], bd=3, relief="solid", padx=5, pady=5)
+        tile.wallpaper_id = None
+
+        label_img = Label(tile, image=self._get_placeholder_image(), bg=UI_COLORS["bg_tertiary"])
+        label_img.pack()
+        label_img.image = None
+        tile.image_label = label_img
 
-        Label(thumb_frame, text=wallpaper_id, fg=UI_COLORS["fg_text"], bg=UI_COLORS["accent_blue"], font=("Courier", 8)).pack()
+        tile.caption = Label(tile, text="", fg=UI_COLORS["fg_text"], bg=UI_COLORS["accent_blue"], font=("Courier", 8))
+        tile.caption.pack()
 
+        tile.star = None
 
-        if is_favorite(self.config, wallpaper_id):
-            star = Label(thumb_frame, text="★", fg=UI_COLORS["accent_yellow"], bg=border_color, font=("Arial", 16))
+        if on_click:
+            label_img.bind("<Button-1>", lambda e: tile.wallpaper_id and on_click(tile.wallpaper_id))
+        label_img.bind("<Double-Button-1>", lambda e: tile.wallpaper_id and on_double_click(tile.wallpaper_id))
+        label_img.bind("<Button-3>", lambda e: tile.wallpaper_id and on_right_click(e, tile.wallpaper_id))
+        if on_hover:
+            label_img.bind("<Enter>", lambda e: on_hover(e, tile.wallpaper_id))
+            label_img.bind("<Leave>", lambda e: on_hover(e, None))
+
+        return tile
+
+    def bind_wallpaper_tile(self, tile, wallpaper_id, img, current_wallpaper):
+        """Reasigna un thumbnail reutilizable a otro wallpaper, img=None deja el placeholder"""
+        tile.wallpaper_id = wallpaper_id
+        self._update_decorations(tile, wallpaper_id, current_wallpaper)
+
+        tile.image_label.config(image=img or self._get_placeholder_image(), text="", width=0, height=0)
+        tile.image_label.image = img
+
+    def _update_decorations(self, thumb_frame, wallpaper_id, current_wallpaper):
+        """
+        Borde, texto y estrella de favorito, la estrella solo se crea la primera vez que hace falta.
+        Si nada cambio no se toca Tk, asi un refresh incremental solo cuesta trabajo en los thumbnails afectados
+        """
+        border_color = UI_COLORS["accent_blue"] if wallpaper_id == current_wallpaper else UI_COLORS["accent_blue"]
+        favorite = bool(wallpaper_id) and is_favorite(self.config, wallpaper_id)
+        state = (wallpaper_id, border_color, favorite)
+        if getattr(thumb_frame, "decoration_state", None) == state:
+            return
+        thumb_frame.decoration_state = state
+
+        thumb_frame.config(bg=border_color)
+        thumb_frame.caption.config(text=wallpaper_id or "")
+
+        star = thumb_frame.star
+        if favorite:
+            if star is None:
+                star = thumb_frame.star = Label(thumb_frame, text="★", fg=UI_COLORS["accent_yellow"], font=("Arial", 16))
+            star.config(bg=border_color)
             star.place(x=2, y=2)
             star.lift()
-
-        return thumb_frame
\ No newline at end of file
+        elif star is not None:
+            star.place_forget()
+
+    def _get_placeholder_image(self):
+        """Blank THUMB_SIZE image shared by every placeholder tile, so the grid doesn't jump when previews arrive"""
+        if self._placeholder_img is None:
+            self._placeholder_img = PhotoImage(width=THUMB_SIZE[0], height=THUMB_SIZE[1])
+        return self._placeholder_img
@@ -0,0 +1,225 @@
+"""Virtualized wallpaper gallery"""
+"""Instead of a Frame + 2-3 Labels per wallpaper gridded into the inner frame, only the rows that are on screen (plus
+OVERSCAN_ROWS above and below) get a tile. Tiles are canvas windows taken from a pool and rebound to other wallpapers
+as you scroll, so the widget count depends on the window size and not on the library size.
+
+The scroll region is computed from the item count, see GalleryCanvas.set_virtual_size(). Every time the view moves
+(scrollbar, mouse wheel, resize) GalleryCanvas calls update_visible() through its view_listeners."""
+
+from common.constants import THUMB_CELL_SIZE
+
+
+class VirtualGallery:
+    """Lays out a pool of reusable wallpaper tiles on the gallery canvas, only for the visible rows"""
+
+    OVERSCAN_ROWS = 1
+
+    def __init__(self, gallery_canvas, thumbnails, on_double_click, on_right_click, on_hover=None):
+        """
+        Args:
+            gallery_canvas: GalleryCanvas to draw on
+            thumbnails: ThumbnailFactory used to create and rebind tiles
+            on_double_click: Called with the wallpaper id of a double-clicked tile
+            on_right_click: Called with (event, wallpaper_id) on right click
+            on_hover: Called with (event, wallpaper_id) when the pointer enters a tile, (event, None) when it leaves
+        """
+        self.gallery_canvas = gallery_canvas
+        self.canvas = gallery_canvas.canvas
+        self.thumbnails = thumbnails
+        self.on_double_click = on_double_click
+        self.on_right_click = on_right_click
+        self.on_hover = on_hover
+
+        self.cell_width, self.cell_height = THUMB_CELL_SIZE # same footprint as the gridded thumbnails
+
+        self.active = False
+        self.items = []
+        self.columns = 1
+        self.current_wallpaper = None
+        self.request_image = None # (index, wallpaper_id) -> handle or None, fills the tile later through set_image()
+        self.cancel_request = None # (handle) -> None, drops the request of a tile that scrolled out before its preview
+        self.on_visible_changed = None # (list of visible wallpaper ids) -> None
+        self._requests = {} # index -> handle returned by request_image
+
+        self._free_tiles = []
+        self._bound = {} # index -> tile
+        self._updating = False
+
+        gallery_canvas.view_listeners.append(self.update_visible)
+
+    def show(self, items, columns, current_wallpaper=None, request_image=None, on_visible_changed=None,
+             cancel_request=None):
+        """
+        Display a list of wallpapers, only the visible ones get a tile
+
+        Args:
+            items: Wallpaper ids in display order
+            columns: Tiles per row
+            current_wallpaper: Id of the wallpaper being applied, if any
+            request_image: Called with (index, wallpaper_id) when a tile is bound and needs its preview
+            on_visible_changed: Called with the list of visible wallpaper ids after every view change
+            cancel_request: Called with what request_image returned when the tile is released before set_image()
+        """
+        self._release_all()
+        self.items = list(items)
+        self.columns = max(1, columns)
+        self.current_wallpaper = current_wallpaper
+        self.request_image = request_image
+        self.cancel_request = cancel_request
+        self.on_visible_changed = on_visible_changed
+        self.active = True
+
+        rows = (len(self.items) + self.columns - 1) // self.columns
+        self.gallery_canvas.set_virtual_size((self.columns * self.cell_width, rows * self.cell_height))
+        self.update_visible()
+
+    def update_items(self, items, columns, current_wallpaper=None):
+        """
+        Swap the item list in place: visible tiles still showing the same wallpaper in the same cell only get their
+        decorations refreshed (no new preview request), the rest are rebound
+        """
+        columns = max(1, columns)
+        same_layout = columns == self.columns
+        self.items = list(items)
+        self.columns = columns
+        self.current_wallpaper = current_wallpaper
+
+        for index, tile in list(self._bound.items()):
+            if same_layout and index < len(self.items) and self.items[index] == tile.wallpaper_id:
+                self._refresh_tile(tile)
+            else:
+                self._release(index)
+
+        rows = (len(self.items) + self.columns - 1) // self.columns
+        self.gallery_canvas.set_virtual_size((self.columns * self.cell_width, rows * self.cell_height))
+        self.update_visible()
+
+    def relayout(self, columns):
+        """Move the bound tiles to their cells for a new column count, nothing is rebound or reloaded"""
+        columns = max(1, columns)
+        if not self.active or columns == self.columns:
+            return
+        self.columns = columns
+        for index, tile in self._bound.items():
+            row, col = divmod(index, columns)
+            self._place_tile(tile, col * self.cell_width, row * self.cell_height)
+
+        rows = (len(self.items) + self.columns - 1) // self.columns
+        self.gallery_canvas.set_virtual_size((self.columns * self.cell_width, rows * self.cell_height))
+        self.update_visible()
+
+    def clear(self):
+        """Hide every tile and give the canvas back to the gridded inner frame"""
+        if not self.active:
+            return
+        self._release_all()
+        self.items = []
+        self.active = False
+        self.request_image = None
+        self.cancel_request = None
+        self.on_visible_changed = None
+        self.gallery_canvas.set_virtual_size(None)
+
+    def set_image(self, index, wallpaper_id, img):
+        """Fill the tile of an item if it is still on screen (it may have been scrolled away or rebound)"""
+        tile = self._bound.get(index)
+        if tile is not None and tile.wallpaper_id == wallpaper_id:
+            self._requests.pop(index, None)
+            self._set_tile_image(tile, img)
+
+    def reload(self, wallpaper_ids):
+        """Request the preview again for the visible tiles of these wallpapers (their files changed)"""
+        if not self.request_image:
+            return
+        for index, tile in list(self._bound.items()):
+            if tile.wallpaper_id in wallpaper_ids:
+                request = self._requests.pop(index, None)
+                if request is not None and self.cancel_request:
+                    self.cancel_request(request) # its on_ready would otherwise outlive the handle kept for the tile
+                self._requests[index] = self.request_image(index, tile.wallpaper_id)
+
+    def tile_count(self):
+        """Number of tile widgets ever created (bound + pooled)"""
+        return len(self._bound) + len(self._free_tiles)
+
+    def visible_range(self):
+        """Range of item indexes that should have a tile for the current view"""
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.cell_height)
+        first_row = max(0, int(top // self.cell_height) - self.OVERSCAN_ROWS)
+        last_row = int((top + height) // self.cell_height) + self.OVERSCAN_ROWS
+        return range(first_row * self.columns, min(len(self.items), (last_row + 1) * self.columns))
+
+    def update_visible(self):
+        """Bind tiles to the items that scrolled in, return the ones that scrolled out to the pool"""
+        if not self.active or self._updating:
+            return
+        self._updating = True
+        try:
+            visible = self.visible_range()
+            changed = False
+            for index in list(self._bound.keys()):
+                if index not in visible:
+                    self._release(index)
+                    changed = True
+            for index in visible:
+                if index not in self._bound:
+                    self._bind(index)
+                    changed = True
+
+            if changed and self.on_visible_changed:
+                self.on_visible_changed([self.items[index] for index in visible])
+        finally:
+            self._updating = False
+
+    def _bind(self, index):
+        """Take a tile from the pool (or create one), move it to the cell of index and rebind it"""
+        tile = self._free_tiles.pop() if self._free_tiles else self._create_tile()
+
+        row, col = divmod(index, self.columns)
+        self._place_tile(tile, col * self.cell_width, row * self.cell_height)
+
+        wallpaper_id = self.items[index]
+        self._bind_tile(tile, wallpaper_id)
+        self._bound[index] = tile
+
+        if self.request_image:
+            self._requests[index] = self.request_image(index, wallpaper_id)
+
+    def _release(self, index):
+        """Hide a tile and drop its image reference so the preview cache can evict it"""
+        tile = self._bound.pop(index)
+        request = self._requests.pop(index, None)
+        if request is not None and self.cancel_request:
+            self.cancel_request(request) # scrolled out before its preview arrived, don't decode it for nothing
+        self._hide_tile(tile)
+        self._bind_tile(tile, None)
+        self._free_tiles.append(tile)
+
+    def _release_all(self):
+        for index in list(self._bound.keys()):
+            self._release(index)
+
+    # Tile primitives, overridden by CanvasGallery which draws canvas items instead of widgets
+
+    def _create_tile(self):
+        tile = self.thumbnails.create_wallpaper_tile(self.canvas, self.on_double_click, self.on_right_click,
+                                                     on_hover=self.on_hover)
+        tile.window_id = self.canvas.create_window(0, 0, window=tile, anchor="nw")
+        return tile
+
+    def _place_tile(self, tile, x, y):
+        self.canvas.coords(tile.window_id, x, y)
+        self.canvas.itemconfigure(tile.window_id, state="normal")
+
+    def _hide_tile(self, tile):
+        self.canvas.itemconfigure(tile.window_id, state="hidden")
+
+    def _bind_tile(self, tile, wallpaper_id):
+        self.thumbnails.bind_wallpaper_tile(tile, wallpaper_id, None, self.current_wallpaper)
+
+    def _refresh_tile(self, tile):
+        self.thumbnails.update_wallpaper_thumbnail(tile, self.current_wallpaper)
+
+    def _set_tile_image(self, tile, img):
+        self.thumbnails.set_wallpaper_image(tile, img)
@@ -7,28 +7,52 @@ creating the UI components, connecting the callbacks, etc."""
 
 from tkinter import Tk
 from os import path
+import time
 from gui.config import load_config, merge_config, DEFAULT_CONFIG, save_config
 from gui.wallpaper_loader import WallpaperLoader
+from services.wallpaper_service import PreviewDecodePipeline
+from services.thumbnail_cache import ThumbnailDiskCache
+from services.thumbnail_pack import ThumbnailPack
+from services.preview_memory_cache import PreviewMemoryCache
+from services.wallpaper_catalog import WallpaperCatalog
+from services.library_watcher import LibraryWatcher
+from services.group_counts import GroupCountCache
+from services.metadata_index import MetadataIndexer
+from services.duplicate_finder import DuplicateFinder
+from services.disk_usage import DiskUsageAnalyzer
+from services.library_scanner import scan_library
+from services.ui_dispatcher import UiDispatcher
+from concurrent.futures import ThreadPoolExecutor
 from gui.engine_controller import EngineController
 from gui.gallery_view.gallery_view import GalleryView
 from gui.groups import delete_not_working_wallpapers, set_log_callback
 from models.groups import GroupManager
-from common.constants import UI_COLORS, DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT, THUMB_SIZE, STANDARD_COLS
+from common.constants import UI_COLORS, DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT, THUMB_CELL_SIZE, STANDARD_COLS, THUMBNAIL_CACHE_MAX_MB, PREVIEW_MEMORY_CACHE_MB, GALLERY_MODES, HOVER_FRAME_CACHE_MB, BACKEND_LOG_PATH, BACKEND_LOG_MAX_MB, BACKEND_LOG_GENERATIONS, BACKEND_LOG_TAIL_LINES, LOG_AREA_MAX_LINES, LOG_AREA_STATS_INTERVAL_S
+from common.log_files import rotate_log, tail_lines
 
 from gui.ui_components.log_area import LogArea
 from gui.ui_components.directory_controls import DirectoryControls
 from gui.ui_components.flags import FlagsPanel
 from gui.ui_components.sound_panel import SoundPanel
 from gui.ui_components.gallery_canvas import GalleryCanvas
+from gui.ui_components.search_bar import SearchBar
+from gui.ui_components.hover_preview import HoverPreview
 from gui.event_handler.event_handler import EventHandlers
 from gui.gallery_view.gallery_manager import GalleryManager
+from gui.gallery_view.prefetcher import ThumbnailPrefetcher
 from gui.keybinding_manager import KeybindingController
 
 
 class WallpaperEngineGUI:
     """Main GUI application class that orchestrates all UI components and engine interaction"""
 
+    STARTUP_FALLBACK_MS = 500 # deferred phases start on the first <Expose>, or after this if the window never shows
+
     def __init__(self):
+        # Only the window shell is built here, whatever depends on the library size or spawns processes runs in the
+        # deferred startup phases once the window has been drawn (see _run_next_startup_phase)
+        started = time.perf_counter()
+        self._startup_started = started
 
         self.main_window = Tk()
         self.main_window.title("Linux Wallpaper Engine GUI")
@@ -56,11 +80,29 @@ class WallpaperEngineGUI:
         self._load_config()
 
 
-        self.log_area = LogArea(self.main_window)
+        # Created before anything logs or starts a worker: _log() from a worker thread and every background result
+        # (previews, watcher, counts, pack, metadata, disk usage, startup phases...) reach Tk through it
+        self.dispatcher = UiDispatcher(self.main_window)
+        self.dispatcher.start()
+        self.log_area = LogArea(self.main_window, self._log_area_max_lines())
         self.log_area.grid(column=0, row=3, columnspan=2, sticky="nsew")
 
 
-        self.loader = WallpaperLoader()
+        self.catalog = self._create_catalog()
+        self._start_catalog_scan()
+        self._startup_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        # Loading the thumbnail cache index and mapping the pack grow with the library: they run while the window is
+        # built and the first deferred phase hands them to the loader
+        self._thumbnail_caches = self._startup_executor.submit(self._open_thumbnail_caches, time.perf_counter())
+        self.loader = WallpaperLoader(None, self._create_preview_memory_cache(), None)
+        # project.json fields are stored in the catalog, no catalog means no metadata
+        self.metadata_indexer = MetadataIndexer(self.catalog, self.dispatcher) if self.catalog else None
+        # Folder sizes for the DISK USAGE button and the "largest first" ordering, its cache is read on first use
+        self.disk_usage = DiskUsageAnalyzer(self.dispatcher)
+        # Created on first use of the DUPLICATES button
+        self.duplicate_finder = None
+        self._duplicates_executor = None
+        self._duplicates_future = None
         self.engine = EngineController(DEFAULT_CONFIG, self._log)
 
 
@@ -82,10 +124,21 @@ class WallpaperEngineGUI:
         self._initialize_ui_values()
 
 
-        self._load_backend_logs()
-
-
-        self.gallery_manager.refresh()
+        self._startup_phases = [
+            ("thumbnail caches", self._install_thumbnail_caches),
+            ("backend logs", self._load_backend_logs),
+            ("systemd sync", self._start_systemd_sync),
+            ("thumbnail cache cleanup", self._start_thumbnail_cache_cleanup),
+            ("gallery", self._populate_gallery)
+        ]
+        self._deferred_started = False
+        self._first_paint_logged = False
+        self._log_startup_phase("window shell", started)
+        self.main_window.bind("<Expose>", self._on_first_expose, add="+")
+        self.main_window.after(self.STARTUP_FALLBACK_MS, self._start_deferred_phases)
+        # Stats lines already in the log area, {name: line}, a line is only logged again once its numbers changed
+        self._logged_stats = {}
+        self.main_window.after(self._stats_interval_ms(), self._log_stats)
 
 
         self.main_window.protocol("WM_DELETE_WINDOW", self._on_window_close)
@@ -106,6 +159,93 @@ class WallpaperEngineGUI:
 
 
 
+    def _create_thumbnail_cache(self):
+        """Create the persistent thumbnail cache (or None if disabled) and drop entries of removed wallpapers"""
+        thumb_config = DEFAULT_CONFIG.get("--thumbnails", {})
+        if not thumb_config.get("disk_cache", True):
+            return None
+
+        try:
+            max_mb = int(thumb_config.get("disk_cache_max_mb", THUMBNAIL_CACHE_MAX_MB))
+            return ThumbnailDiskCache(max_bytes=max_mb * 1024 * 1024) # cleaned up in a deferred startup phase
+        except Exception as e:
+            self._log(f"[WARNING] Thumbnail disk cache disabled: {str(e)}")
+            return None
+
+
+
+    def _create_thumbnail_pack(self, disk_cache):
+        """Open the mmap'ed thumbnail pack (or None if disabled), it mirrors the disk cache and follows the catalog"""
+        thumb_config = DEFAULT_CONFIG.get("--thumbnails", {})
+        if not thumb_config.get("pack", True) or disk_cache is None or self.catalog is None:
+            return None
+
+        try:
+            pack = ThumbnailPack(dispatcher=self.dispatcher)
+            self._log(f"[CACHE] Thumbnail pack: {len(pack)} thumbnails")
+            return pack
+        except Exception as e:
+            self._log(f"[WARNING] Thumbnail pack disabled: {str(e)}")
+            return None
+
+    def _open_thumbnail_caches(self, started: float):
+        """Startup executor: (disk cache, pack) as configured, either may be None"""
+        disk_cache = self._create_thumbnail_cache()
+        pack = self._create_thumbnail_pack(disk_cache)
+        self._log_startup_phase("thumbnail caches (background)", started)
+        return disk_cache, pack
+
+    def _install_thumbnail_caches(self) -> None:
+        """Give the loader the caches opened during the window construction, waits for them if they aren't ready"""
+        try:
+            self.loader.disk_cache, self.loader.pack = self._thumbnail_caches.result()
+        except Exception as e:
+            self._log(f"[WARNING] Thumbnail caches disabled: {str(e)}")
+
+    def _start_catalog_scan(self) -> None:
+        """Start the first catalog scan of --dir on the catalog's scanner thread, it walks the whole library: the
+        gallery phase joins it and the gallery follows its result"""
+        root_dir = DEFAULT_CONFIG.get("--dir")
+        if self.catalog is None or not root_dir or not path.isdir(root_dir):
+            return
+        started = time.perf_counter()
+        self.catalog.rescan_async(root_dir, lambda result: self._log_startup_phase("catalog scan (background)", started))
+
+    def _create_catalog(self):
+        """Open the persistent wallpaper catalog, without it the gallery falls back to walking --dir"""
+        try:
+            return WallpaperCatalog(dispatcher=self.dispatcher)
+        except Exception as e:
+            self._log(f"[WARNING] Wallpaper catalog disabled: {str(e)}")
+            return None
+
+    def _log_area_max_lines(self) -> int:
+        """Lines kept in the log area, from the config"""
+        try:
+            return int(DEFAULT_CONFIG.get("--log-area", {}).get("max_lines", LOG_AREA_MAX_LINES))
+        except (TypeError, ValueError):
+            return LOG_AREA_MAX_LINES
+
+    def _stats_interval_ms(self) -> int:
+        """Interval between two stats reports in the log area, from the config"""
+        try:
+            interval_s = float(DEFAULT_CONFIG.get("--log-area", {}).get("stats_interval_s", LOG_AREA_STATS_INTERVAL_S))
+        except (TypeError, ValueError):
+            interval_s = LOG_AREA_STATS_INTERVAL_S
+        return max(1000, int(interval_s * 1000))
+
+    def _create_preview_memory_cache(self):
+        """Create the in-memory LRU of preview images with the configured budget"""
+        thumb_config = DEFAULT_CONFIG.get("--thumbnails", {})
+        try:
+            max_mb = int(thumb_config.get("memory_cache_mb", PREVIEW_MEMORY_CACHE_MB))
+        except (TypeError, ValueError):
+            max_mb = PREVIEW_MEMORY_CACHE_MB
+        self._log(f"[CACHE] Preview memory budget: {max_mb} MB")
+        return PreviewMemoryCache(max_bytes=max_mb * 1024 * 1024)
+
+
+
     def _create_ui(self) -> None:
         """Create all UI components except log_area which is created first"""
 
@@ -121,6 +261,9 @@ class WallpaperEngineGUI:
         self.gallery_canvas = GalleryCanvas(self.main_window)
         self.gallery_canvas.grid(column=0, row=1, columnspan=1, sticky="nsew")
 
+        self.search_bar = SearchBar(self.gallery_canvas.container, self._on_search, self._on_sort_by_size)
+        self.search_bar.grid(column=0, row=0, columnspan=2, sticky="ew")
+
     def _create_gallery_view(self) -> None:
         """Initialize the gallery view for displaying wallpapers and groups"""
         # Create group manager instance to be shared
@@ -135,6 +278,22 @@ class WallpaperEngineGUI:
             self.group_manager
         )
 
+        gallery_mode = DEFAULT_CONFIG.get("--gallery", {}).get("mode", "virtual")
+        if gallery_mode not in GALLERY_MODES:
+            self._log(f"[WARNING] Unknown gallery mode '{gallery_mode}', using virtual")
+            gallery_mode = "virtual"
+        if gallery_mode in ("virtual", "canvas"):
+            self.gallery_view.enable_virtual_mode(self.gallery_canvas, draw_on_canvas=gallery_mode == "canvas")
+        self._log(f"[GUI] Gallery mode: {gallery_mode}")
+
+        hover_config = DEFAULT_CONFIG.get("--hover-preview", {})
+        if hover_config.get("enabled", True):
+            self.gallery_view.hover_preview = HoverPreview(
+                self.main_window,
+                int(hover_config.get("delay_ms", 400)),
+                int(hover_config.get("frame_cache_mb", HOVER_FRAME_CACHE_MB))
+            )
+
     def _create_managers(self) -> None:
         """Create and configure application managers (gallery, event handlers, keybindings)"""
 
@@ -157,12 +316,48 @@ class WallpaperEngineGUI:
         )
 
 
+        thumb_config = DEFAULT_CONFIG.get("--thumbnails", {})
+        self.preview_pipeline = PreviewDecodePipeline(
+            self.loader,
+            self.dispatcher,
+            thumb_config.get("decode_workers", 0),
+            thumb_config.get("decode_mode", "thread"),
+            on_idle=self._on_previews_idle
+        )
+        self._log(f"[CACHE] Preview decoding: {self.preview_pipeline.mode} mode, {self.preview_pipeline.workers} workers")
+
+        # Widget mode creates (and requests) every tile up front, there is nothing to prefetch
+        self.prefetcher = None
+        if self.gallery_view.virtual_gallery is not None:
+            self.prefetcher = ThumbnailPrefetcher(
+                self.preview_pipeline,
+                self.gallery_view.virtual_gallery,
+                lambda wallpaper_id: path.join(DEFAULT_CONFIG["--dir"], wallpaper_id),
+                thumb_config.get("prefetch_screens", 2),
+                thumb_config.get("prefetch_max_in_flight", 4)
+            )
+
         self.gallery_manager = GalleryManager(
             self.gallery_view,
             self.loader,
-            DEFAULT_CONFIG
+            DEFAULT_CONFIG,
+            self.preview_pipeline,
+            self._log,
+            self.catalog,
+            GroupCountCache(self.dispatcher, self.catalog),
+            self.metadata_indexer,
+            self.disk_usage,
+            self.prefetcher
         )
 
+        watcher_config = DEFAULT_CONFIG.get("--watcher", {})
+        self.library_watcher = LibraryWatcher(
+            self.dispatcher,
+            self.gallery_manager.apply_library_changes,
+            watcher_config.get("poll_interval_s", 5.0)
+        )
+        self._watch_library()
+
         self.gallery_view.max_cols = getattr(self.gallery_view, "max_cols", 6)
 
 
@@ -173,7 +368,8 @@ class WallpaperEngineGUI:
             self.engine,
             self.event_handlers,
             self.gallery_view,
-            self._log
+            self._log,
+            self.dispatcher
         )
 
 
@@ -194,6 +390,12 @@ class WallpaperEngineGUI:
         self.directory_controls.stop_button.config(
             command=self.event_handlers.on_stop
         )
+        self.directory_controls.duplicates_button.config(
+            command=self._on_find_duplicates
+        )
+        self.directory_controls.disk_usage_button.config(
+            command=self._on_disk_usage
+        )
 
 
         self.flags_panel.window_checkbox.config(
@@ -231,24 +433,18 @@ class WallpaperEngineGUI:
         )
 
 
-        self.gallery_canvas.inner_frame.bind(
-            "<Configure>",
-            self.gallery_canvas.update_scroll_region
-        )
         self.gallery_canvas.bind_scroll_events(
             self.event_handlers.on_mousewheel
         )
 
+        # Resizes only request a layout pass, columns and scroll region are recomputed once per frame
+        self.gallery_canvas.layout.add_pass(self._update_gallery_columns, first=True)
         try:
-            self.gallery_canvas.canvas.bind("<Configure>", self._on_canvas_resize)
-        except Exception:
-            pass
-        try:
-            self.gallery_canvas.container.bind("<Configure>", self._on_canvas_resize)
+            self.gallery_canvas.container.bind("<Configure>", self.gallery_canvas.layout.request, add="+")
         except Exception:
             pass
         try:
-            self.main_window.bind("<Configure>", self._on_canvas_resize)
+            self.main_window.bind("<Configure>", self.gallery_canvas.layout.request, add="+")
         except Exception:
             pass
 
@@ -270,8 +466,7 @@ class WallpaperEngineGUI:
         self.flags_panel.random_mode.set(
             DEFAULT_CONFIG["--random"] or DEFAULT_CONFIG["--delay"]["active"]
         )
-        self.flags_panel.startup.set(DEFAULT_CONFIG.get("__run_at_startup__", False))
-        self.event_handlers.sync_startup_state()
+        self.flags_panel.startup.set(DEFAULT_CONFIG.get("__run_at_startup__", False)) # synced with systemd later
 
 
         logs_visible = DEFAULT_CONFIG.get("--show-logs", True)
@@ -291,17 +486,90 @@ class WallpaperEngineGUI:
 
         try:
             self.main_window.update_idletasks()
-
-            screen_width = self.main_window.winfo_screenwidth()
-            col_width = THUMB_SIZE[0]
-            initial_cols = max(1, screen_width // col_width) if col_width > 0 else STANDARD_COLS # I lied, i actually used it
-            self.gallery_view.max_cols = initial_cols
+            self.gallery_view.max_cols = self._compute_gallery_columns()
         except Exception:
-            pass
+            self.gallery_view.max_cols = STANDARD_COLS # I lied, i actually used it
 
 
         self._log_keybindings()
 
+    def _log_startup_phase(self, name: str, started: float) -> None:
+        self._log(f"[STARTUP] {name}: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _on_first_expose(self, event) -> None:
+        """The shell is on screen: log the time to first paint and start the deferred phases"""
+        # Bound on the toplevel, so the first <Expose> of any widget of the window lands here
+        if self._first_paint_logged:
+            return
+        self._first_paint_logged = True
+        self._log_startup_phase("first paint", self._startup_started)
+        # Idle callbacks run after the redraws the expose queued, the phases never delay the first frame
+        self.main_window.after_idle(self._start_deferred_phases)
+
+    def _start_deferred_phases(self) -> None:
+        if self._deferred_started:
+            return
+        self._deferred_started = True
+        self.main_window.after_idle(self._run_next_startup_phase)
+
+    def _run_next_startup_phase(self) -> None:
+        """Run one deferred startup phase, the next one is scheduled after Tk had a chance to handle events"""
+        name, phase = self._startup_phases.pop(0)
+        started = time.perf_counter()
+        try:
+            phase()
+        except Exception as e:
+            self._log(f"[WARNING] Startup phase '{name}' failed: {str(e)}")
+        self._log_startup_phase(name, started)
+
+        if self._startup_phases:
+            self.main_window.after(1, self._run_next_startup_phase)
+        else:
+            self._log_startup_phase("ready", self._startup_started) # background phases may still be running
+
+    def _run_in_background(self, name: str, work, on_done) -> None:
+        """Run a Tk-free startup task on the startup executor, on_done gets its result on the main thread"""
+        started = time.perf_counter()
+        future = self._startup_executor.submit(work)
+        future.add_done_callback(
+            lambda done: self.dispatcher.call_soon(self._finish_background_phase, name, done, started, on_done)
+        )
+
+    def _finish_background_phase(self, name: str, future, started: float, on_done) -> None:
+        """Main thread: hand the result of a background startup task over"""
+        if future.cancelled():
+            return # closing
+        try:
+            result = future.result()
+        except Exception as e:
+            self._log(f"[WARNING] Startup phase '{name}' failed: {str(e)}")
+            return
+        on_done(result)
+        self._log_startup_phase(f"{name} (background)", started)
+
+    def _start_systemd_sync(self) -> None:
+        """Ask systemd (systemctl spawn) in a worker, the config and the checkbox are synced back on the main thread"""
+        query = self.event_handlers.get_startup_state_query()
+        if query is not None:
+            self._run_in_background("systemd sync", query, self.event_handlers.sync_startup_state)
+
+    def _start_thumbnail_cache_cleanup(self) -> None:
+        """Drop the disk cache entries of removed wallpapers in a worker, it walks the whole index"""
+        if self.loader.disk_cache is None:
+            return
+
+        def on_done(removed):
+            if removed:
+                self._log(f"[CACHE] Removed {removed} stale thumbnails from disk cache")
+
+        self._run_in_background("thumbnail cache cleanup", self.loader.disk_cache.collect_garbage, on_done)
+
+    def _populate_gallery(self) -> None:
+        """First gallery refresh: tiles from the catalog as saved, the catalog scan started in __init__ brings the
+        changes since the last session when it arrives"""
+        self.gallery_manager.refresh()
+        self.gallery_canvas.layout.request()
+
     def _log_keybindings(self) -> None:
         """Log available keybindings to the user at application startup"""
         keybindings_info = self.keybinding_controller.get_keybindings_info()
@@ -313,35 +581,31 @@ class WallpaperEngineGUI:
             self._log("[KEYBIND] No keybindings configured. Click 'KEYBINDINGS' button to set them up!")
 
 
-    def _on_canvas_resize(self, event=None) -> None:
-        """Handler that recalculates gallery columns based on screen width and thumbnail size"""
-        try:
+    def _compute_gallery_columns(self) -> int:
+        """Columns that fit in the gallery canvas (the screen width until the canvas has been mapped)"""
+        width = self.gallery_canvas.canvas.winfo_width()
+        if width <= 1:
+            width = self.main_window.winfo_screenwidth()
+        return max(1, width // THUMB_CELL_SIZE[0])
 
-            screen_width = self.main_window.winfo_screenwidth()
-            col_width = THUMB_SIZE[0]
-            new_cols = max(1, screen_width // col_width) if col_width > 0 else 6
-            if new_cols != getattr(self.gallery_view, "max_cols", None):
-                self.gallery_view.max_cols = new_cols
-                self.gallery_manager.refresh()
-        except Exception:
-            pass
+    def _update_gallery_columns(self) -> None:
+        """Layout pass: on a column count change re-grid the tiles on screen, never rescan or reload previews"""
+        new_cols = self._compute_gallery_columns()
+        if new_cols != getattr(self.gallery_view, "max_cols", None):
+            self.gallery_view.max_cols = new_cols
+            self.gallery_view.relayout()
 
     def _load_backend_logs(self) -> None:
-        """Load and display recent backend logs if they exist (last 200 lines only)"""
-        log_file = path.expanduser(
-            "~/.local/share/linux-wallpaper-engine-features/logs.txt"
-        )
-        if path.exists(log_file):
-            try:
-                with open(log_file, "r") as f:
-                    lines = f.readlines()
-                    # Only load the last 50 lines to avoid flooding the UI
-                    recent_lines = lines[-200:] if len(lines) > 50 else lines # you could also just add a constant for this... but i like my spaghetti
-                    # if you wonder why 200, a typical execution of the app generates around 100-300 logs, if you need more... ssssshange it =)
-                    for line in recent_lines:
-                        self._log("[FILE] " + line.strip())
-            except Exception as e:
-                self._log(f"[WARNING] Error loading backend logs: {str(e)}")
+        """Rotate the backend log if it grew past its cap and display its last lines (read backwards from the end)"""
+        if rotate_log():
+            self._log(f"[FILE] Backend log rotated ({BACKEND_LOG_MAX_MB} MB cap, {BACKEND_LOG_GENERATIONS} gzip generations kept)")
+        if not path.exists(BACKEND_LOG_PATH):
+            return
+        try:
+            for line in tail_lines(BACKEND_LOG_PATH, BACKEND_LOG_TAIL_LINES):
+                self._log("[FILE] " + line.strip())
+        except Exception as e:
+            self._log(f"[WARNING] Error loading backend logs: {str(e)}")
 
 
 
@@ -395,18 +659,105 @@ class WallpaperEngineGUI:
 
 
     def _log(self, message: str) -> None:
-        """Centralized logging function that sends messages to the log area"""
-        self.log_area.log(message)
+        """Centralized logging function that sends messages to the log area, callable from any thread"""
+        self.dispatcher.run_on_main(self.log_area.log, message)
+
+    def _on_previews_idle(self) -> None:
+        """Preview pipeline ran dry: pack what was just decoded"""
+        self.gallery_manager.update_thumbnail_pack(only_if_decoded=True)
+
+    def _log_stats(self) -> None:
+        """Timer: log the preview cache, prefetch and UI queue stats that changed since the last report. The pipeline
+        runs dry after every scroll burst, logging them from there would flood the log area and push real messages out
+        of it"""
+        lines = {"cache": f"[CACHE] {self.loader.cache_stats()}"}
+        if self.prefetcher and self.prefetcher.hit_rate() is not None:
+            lines["prefetch"] = f"[CACHE] {self.prefetcher.describe()}"
+        if self.dispatcher.calls:
+            lines["dispatch"] = f"[DISPATCH] UI queue latency: {self.dispatcher.latency_stats()}"
+        for name, line in lines.items():
+            if self._logged_stats.get(name) != line:
+                self._logged_stats[name] = line
+                self._log(line)
+        self.main_window.after(self._stats_interval_ms(), self._log_stats)
+
+    def _watch_library(self) -> None:
+        """Follow the current --dir with the library watcher, if enabled (called again whenever --dir changes)"""
+        if not DEFAULT_CONFIG.get("--watcher", {}).get("enabled", True):
+            return
+        root_dir = DEFAULT_CONFIG["--dir"]
+        if root_dir == self.library_watcher.root_dir:
+            return
+        self.library_watcher.watch(root_dir)
+        if self.library_watcher.root_dir:
+            self._log(f"[WATCHER] Watching {root_dir} for changes")
+
+    def _on_find_duplicates(self) -> None:
+        """Hash every preview in the background and show the near-identical ones as a temporary group"""
+        if self._duplicates_future is not None:
+            self._log("[DUPES] Already looking for duplicates...")
+            return
+        root_dir = DEFAULT_CONFIG["--dir"]
+        if not root_dir or not path.isdir(root_dir):
+            self._log("[WARNING] Pick a wallpaper directory first")
+            return
+
+        previews = self.catalog.previews(root_dir) if self.catalog else scan_library(root_dir).previews
+        max_distance = DEFAULT_CONFIG.get("--duplicates", {}).get("max_distance", 6)
+        if self.duplicate_finder is None:
+            self.duplicate_finder = DuplicateFinder()
+            self._duplicates_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="duplicates")
+        self._log(f"[DUPES] Hashing {len(previews)} previews (max distance {max_distance})...")
+        started = time.perf_counter()
+        self._duplicates_future = self._duplicates_executor.submit(
+            self.duplicate_finder.find, root_dir, previews, max_distance
+        )
+        self._duplicates_future.add_done_callback(
+            lambda done: self.dispatcher.call_soon(self._on_duplicates_found, root_dir, done, started)
+        )
+
+    def _on_duplicates_found(self, root_dir: str, future, started: float) -> None:
+        """Main thread: show what the duplicate finder found"""
+        self._duplicates_future = None
+        if future.cancelled():
+            return # closing
+        try:
+            clusters = future.result()
+        except Exception as e:
+            self._log(f"[WARNING] Duplicate search failed: {str(e)}")
+            return
+        self._log(f"[DUPES] Done in {time.perf_counter() - started:.1f}s")
+        if root_dir == DEFAULT_CONFIG["--dir"]:
+            self.gallery_manager.show_duplicates(clusters)
+
+    def _on_disk_usage(self) -> None:
+        """Measure every wallpaper folder in the background and open the 'Largest N' temporary group"""
+        if not self.gallery_manager.analyze_disk_usage(show_largest=True) and not self.disk_usage.busy:
+            self._log("[WARNING] Pick a wallpaper directory first")
+
+    def _on_sort_by_size(self, enabled: bool) -> None:
+        """"largest first" box of the search bar"""
+        self.gallery_manager.set_sort_by_size(enabled)
+        self.gallery_canvas.layout.request()
+
+    def _on_search(self, query: str) -> None:
+        """Search bar keystroke: narrow the wallpapers on screen, no refresh involved"""
+        started = time.perf_counter()
+        result = self.gallery_manager.set_search(query)
+        if result is None:
+            self.search_bar.set_status("open a group to search" if query.strip() else "")
+            return
+        shown, total = result
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.search_bar.set_status(f"{shown}/{total} · {elapsed_ms:.1f} ms" if query.strip() else "")
+        self.gallery_canvas.layout.request()
 
     def _refresh_with_scroll_update(self) -> None:
         """Refresh gallery display and update scroll region"""
+        self._watch_library()
         self.gallery_manager.refresh()
-        # Multiple update calls to ensure all geometry calculations complete
-        self.gallery_canvas.container.update_idletasks()
-        self.gallery_canvas.inner_frame.update_idletasks()
-        self.gallery_canvas.canvas.update_idletasks()
-        # Schedule scroll region update after all pending tasks
-        self.gallery_canvas.canvas.after(50, self.gallery_canvas.update_scroll_region)
+        # Geometry is settled by the deferred layout pass, together with any resize that happens meanwhile
+        self.gallery_canvas.layout.request()
 
     def _on_window_close(self) -> None:
         """Handle window closing event and cleanup resources"""
@@ -415,7 +766,23 @@ class WallpaperEngineGUI:
             delete_not_working_wallpapers(DEFAULT_CONFIG)
         except Exception as e:
             self._log(f"[WARNING] Error deleting 'not working' wallpapers during shutdown: {str(e)}")
+        self.library_watcher.stop()
+        self.preview_pipeline.shutdown()
+        self.loader.flush_disk_cache()
+        if self.metadata_indexer:
+            self.metadata_indexer.shutdown()
+        if self._duplicates_executor:
+            self._duplicates_executor.shutdown(wait=False, cancel_futures=True)
+        self.disk_usage.shutdown()
+        self._startup_executor.shutdown(wait=False, cancel_futures=True)
+        if self.loader.pack:
+            self.loader.pack.shutdown()
+        if self.gallery_view.hover_preview:
+            self.gallery_view.hover_preview.shutdown()
+        if self.catalog:
+            self.catalog.close()
         self._log("[GUI] Cleanup complete, exiting.")
+        self.dispatcher.stop()
         self.main_window.destroy()
 
 
@@ -44,7 +44,8 @@ class KeybindingController:
         engine_controller,
         event_handlers,
         gallery_view,
-        log_callback: Callable = None
+        log_callback: Callable = None,
+        dispatcher=None
     ):
         """
         Initialize the keybinding controller.
@@ -56,6 +57,8 @@ class KeybindingController:
             event_handlers: Instance of EventHandlers
             gallery_view: Instance of GalleryView
             log_callback: Optional logging callback
+            dispatcher: Optional UiDispatcher: UI-only actions run on the Tk thread through it, the others run on a
+                thread of their own and send their messageboxes through it
         """
         self.main_window = main_window
         self.config = config
@@ -63,9 +66,10 @@ class KeybindingController:
         self.event_handlers = event_handlers
         self.gallery_view = gallery_view
         self.log = log_callback or (lambda msg: None)
+        self.dispatcher = dispatcher
 
 
-        self.keybinding_service = KeybindingService(config, log_callback)
+        self.keybinding_service = KeybindingService(config, log_callback, dispatcher)
 
 
         self._register_action_handlers()
@@ -103,37 +107,50 @@ class KeybindingController:
 
         self.keybinding_service.register_action_handler(
             KeybindingAction.TOGGLE_RANDOM_MODE,
-            self._action_toggle_random_mode
+            self._action_toggle_random_mode,
+            on_main_thread=True
         )
 
         self.keybinding_service.register_action_handler(
             KeybindingAction.TOGGLE_DELAY_MODE,
-            self._action_toggle_delay_mode
+            self._action_toggle_delay_mode,
+            on_main_thread=True
         )
 
         self.keybinding_service.register_action_handler(
             KeybindingAction.TOGGLE_WINDOW_MODE,
-            self._action_toggle_window_mode
+            self._action_toggle_window_mode,
+            on_main_thread=True
         )
 
         self.keybinding_service.register_action_handler(
             KeybindingAction.TOGGLE_ABOVE,
-            self._action_toggle_above
+            self._action_toggle_above,
+            on_main_thread=True
         )
 
 
         self.keybinding_service.register_action_handler(
             KeybindingAction.NEXT_WALLPAPER,
-            self._action_next_wallpaper
+            self._action_next_wallpaper,
+            on_main_thread=True
         )
 
         self.keybinding_service.register_action_handler(
             KeybindingAction.PREVIOUS_WALLPAPER,
-            self._action_previous_wallpaper
+            self._action_previous_wallpaper,
+            on_main_thread=True
         )
 
         self.log("[KEYBIND] All action handlers registered")
 
+    def _on_main(self, callback, *args) -> None:
+        """Run a UI effect on the Tk thread, the engine actions run on a worker thread"""
+        if self.dispatcher:
+            self.dispatcher.run_on_main(callback, *args)
+        else:
+            callback(*args)
+
     def _setup_key_bindings(self) -> None:
         """Setup Tkinter key bindings on the main window"""
 
@@ -172,14 +189,16 @@ class KeybindingController:
 
         if not self.config.get("--dir"):
             self.log("[KEYBIND ACTION] No directory selected")
-            messagebox.showwarning(
+            self._on_main(
+                messagebox.showwarning,
                 "No Directory",
                 "Please select a wallpaper directory first"
             )
             return
 
         self.log("[KEYBIND ACTION] Starting engine with current config")
-        self.engine_controller.run_engine()
+        # Directory problems are logged, a messagebox from this thread could crash Tk
+        self.engine_controller.run_engine(show_gui_warning=False)
 
     def _action_stop_engine(self) -> None:
         """Stop the engine"""
@@ -196,7 +215,8 @@ class KeybindingController:
         """
         if not self.config.get("--dir"):
             self.log("[KEYBIND ACTION] No directory selected")
-            messagebox.showwarning(
+            self._on_main(
+                messagebox.showwarning,
                 "No Directory",
                 "Please select a wallpaper directory first"
             )
@@ -215,7 +235,7 @@ class KeybindingController:
         )
 
         if not wallpapers:
-            messagebox.showinfo("No Wallpapers", "No wallpapers found in directory")
+            self._on_main(messagebox.showinfo, "No Wallpapers", "No wallpapers found in directory")
             return
 
         selected = wallpapers[0]
@@ -223,7 +243,8 @@ class KeybindingController:
         self.engine_controller.apply_wallpaper(
             selected.id,
             wallpapers,
-            "all"
+            "all",
+            show_gui_warning=False
         )
 
     def _action_select_random(self) -> None:
@@ -239,7 +260,7 @@ class KeybindingController:
             )
 
             if not wallpapers:
-                messagebox.showinfo("No Wallpapers", "No wallpapers found")
+                self._on_main(messagebox.showinfo, "No Wallpapers", "No wallpapers found")
                 return
 
             import random
@@ -249,11 +270,12 @@ class KeybindingController:
             self.engine_controller.apply_wallpaper(
                 selected.id,
                 wallpapers,
-                "all"
+                "all",
+                show_gui_warning=False
             )
         except Exception as e:
             self.log(f"[KEYBIND ACTION ERROR] {str(e)}")
-            messagebox.showerror("Error", f"Failed to select random wallpaper: {str(e)}")
+            self._on_main(messagebox.showerror, "Error", f"Failed to select random wallpaper: {str(e)}")
 
     def _toggle_config_flag(self, config_path: tuple, ui_attr: str = None, mode_name: str = "mode") -> None:
         """
@@ -25,6 +25,12 @@ class DirectoryControls:
         self.execute_button = Button(self.frame, text="EXECUTE", bg=UI_COLORS["accent_blue"], fg=UI_COLORS["fg_text"], font=("Arial", 9, "bold"), activebackground=UI_COLORS["accent_blue_light"], activeforeground=UI_COLORS["accent_red"], bd=2, relief="raised", cursor="hand2")
         self.execute_button.grid(column=0, row=2, padx=5, pady=5)
 
+        self.duplicates_button = Button(self.frame, text="DUPLICATES", bg=UI_COLORS["accent_blue"], fg=UI_COLORS["fg_text"], font=("Arial", 9, "bold"), activebackground=UI_COLORS["accent_blue_light"], activeforeground=UI_COLORS["accent_red"], bd=2, relief="raised", cursor="hand2")
+        self.duplicates_button.grid(column=1, row=2, padx=5, pady=5)
+
+        self.disk_usage_button = Button(self.frame, text="DISK USAGE", bg=UI_COLORS["accent_blue"], fg=UI_COLORS["fg_text"], font=("Arial", 9, "bold"), activebackground=UI_COLORS["accent_blue_light"], activeforeground=UI_COLORS["accent_red"], bd=2, relief="raised", cursor="hand2")
+        self.disk_usage_button.grid(column=1, row=3, padx=5, pady=5)
+
         self.stop_button = Button(self.frame, text="STOP", bg=UI_COLORS["danger_dark"], fg=UI_COLORS["fg_text"], font=("Arial", 9, "bold"), activebackground=UI_COLORS["danger_light"], activeforeground=UI_COLORS["accent_red"], bd=2, relief="raised", cursor="hand2")
         self.stop_button.grid(column=0, row=6, padx=5, pady=10)
 
@@ -1,5 +1,6 @@
 from tkinter import Frame, Canvas, ttk
 from common.constants import UI_COLORS
+from gui.ui_components.layout_scheduler import LayoutScheduler
 
 
 class GalleryCanvas:
@@ -9,12 +10,12 @@ class GalleryCanvas:
         self.container = Frame(parent, bg=UI_COLORS["bg_secondary"], bd=3, relief="solid", highlightthickness=3,
                                highlightcolor=UI_COLORS["accent_blue"], highlightbackground=UI_COLORS["accent_blue"])
         
-        # Configure container to allow expansion
-        self.container.rowconfigure(0, weight=1) # 0 gives funny behaviour
+        # Configure container to allow expansion, row 0 is left for a header (search bar)
+        self.container.rowconfigure(1, weight=1) # 0 gives funny behaviour
         self.container.columnconfigure(0, weight=1) # try 0 if like me you don't care about life
 
         self.canvas = Canvas(self.container, bg=UI_COLORS["bg_tertiary"], bd=0, highlightthickness=0)
-        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.canvas.grid(row=1, column=0, sticky="nsew")
 
 
         self.scrollbar = ttk.Scrollbar(
@@ -22,10 +23,15 @@ class GalleryCanvas:
             orient="vertical",
             command=self.canvas.yview
         )
-        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
         self.scrollbar.grid_remove()
 
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_yview_changed)
+
+        # Set by the virtualized gallery: the scroll region comes from the item count, not from real widgets
+        self.virtual_size = None
+        # Called with no arguments every time the visible part of the canvas changes (scroll, resize, new region)
+        self.view_listeners = []
 
 
         self.inner_frame = Frame(self.canvas, bg=UI_COLORS["bg_tertiary"])
@@ -37,15 +43,13 @@ class GalleryCanvas:
         # does absolutely nothing..? burn this codebase... pls...
 
 
-        def _on_canvas_config(event):
-            try:
-                # Update inner window width to match canvas width
-                self.canvas.itemconfig(self.inner_window) # Here there should be a width=self.canvas.winfo_width() but it causes weird bugs
-                # i don't intend to fix as it's easier to just stalin debug. 
-                self.canvas.after(10, self.update_scroll_region)
-            except Exception:
-                pass
-        self.canvas.bind("<Configure>", _on_canvas_config)
+        # Every resize / content change goes through here, the scroll region is recomputed once per frame at most
+        self.layout = LayoutScheduler(self.canvas)
+        self.layout.add_pass(self.update_scroll_region)
+        # Here there should be an itemconfig(self.inner_window, width=self.canvas.winfo_width()) but it causes weird
+        # bugs, i don't intend to fix as it's easier to just stalin debug.
+        self.canvas.bind("<Configure>", self.layout.request, add="+")
+        self.inner_frame.bind("<Configure>", self.layout.request, add="+")
 
     def update_scroll_region(self, event=None):
         """Update canvas scroll region and show/hide scrollbar based on content size"""
@@ -53,13 +57,15 @@ class GalleryCanvas:
         self.inner_frame.update_idletasks()
         
         # Update the scrollregion to encompass all content
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        if self.virtual_size is not None:
+            self.canvas.configure(scrollregion=(0, 0, self.virtual_size[0], self.virtual_size[1]))
+        else:
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
         try:
             canvas_height = self.canvas.winfo_height()
-            content_bbox = self.canvas.bbox("all")
-            if content_bbox:
-                content_height = content_bbox[3] - content_bbox[1]
+            content_height = self.content_height()
+            if content_height:
                 if content_height > canvas_height:
                     self.scrollbar.grid()
                 else:
@@ -67,6 +73,32 @@ class GalleryCanvas:
         except Exception:
             pass
 
+    def set_virtual_size(self, size):
+        """Size the scroll region as (width, height) without real widgets behind it, None goes back to the inner frame"""
+        self.virtual_size = size
+        if size is None:
+            self.canvas.itemconfigure(self.inner_window, state="normal")
+        else:
+            # The empty inner frame would otherwise sit on top of the tiles at (0, 0)
+            self.canvas.itemconfigure(self.inner_window, state="hidden")
+        self.layout.request()
+
+    def content_height(self):
+        """Height of the scrollable content, virtual or real"""
+        if self.virtual_size is not None:
+            return self.virtual_size[1]
+        content_bbox = self.canvas.bbox("all")
+        return content_bbox[3] - content_bbox[1] if content_bbox else 0
+
+    def _on_yview_changed(self, first, last):
+        """yscrollcommand: keep the scrollbar in sync and tell the listeners the view moved"""
+        self.scrollbar.set(first, last)
+        for listener in self.view_listeners:
+            try:
+                listener()
+            except Exception as e:
+                print(f"[WARNING] Error updating gallery view: {e}")
+
     def bind_scroll_events(self, on_mousewheel):
         """Configura los eventos de scroll (rueda del mouse)"""
         self.canvas.bind_all("<MouseWheel>", on_mousewheel)
@@ -0,0 +1,224 @@
+"""Hover preview"""
+"""Resting the pointer on a wallpaper tile for delay_ms opens a larger preview next to it, animated if the preview is
+an animated GIF. Nothing is decoded until then: a worker thread walks the frames with iter_preview_frames() and hands
+them over through a queue of two, so it never runs more than two frames ahead of the animation.
+
+The frames are kept in a FrameCache so the animation loops without decoding again. The cache is strictly bounded, an
+animation that doesn't fit is never cached at all: its frames are streamed (decoded again on every loop) and dropped
+once shown. Leaving the tile releases everything, idle memory doesn't depend on how many previews were hovered.
+
+A single after() timer drives the whole thing (hover delay, frame ticks, polling the decoder), there are no per-tile
+timers."""
+
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty, Full
+from tkinter import Toplevel, Label
+
+from PIL import ImageTk
+
+from common.constants import UI_COLORS, HOVER_PREVIEW_SIZE, HOVER_FRAME_CACHE_MB
+from services.preview_decoders import iter_preview_frames
+
+
+class FrameCache:
+    """Decoded frames of the hovered preview, never more than max_bytes: a frame that doesn't fit is refused"""
+
+    BYTES_PER_PIXEL = 4 # same estimate as PreviewMemoryCache, Tk keeps 32 bit pixels
+
+    def __init__(self, max_bytes=HOVER_FRAME_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.frames = [] # (PhotoImage, duration_ms) in playback order
+        self.bytes = 0
+
+    @classmethod
+    def frame_bytes(cls, width, height):
+        return width * height * cls.BYTES_PER_PIXEL
+
+    def put(self, tk_img, duration):
+        """Append a frame, returns False (and keeps nothing) if it would go over budget"""
+        size = self.frame_bytes(tk_img.width(), tk_img.height())
+        if self.bytes + size > self.max_bytes:
+            return False
+        self.frames.append((tk_img, duration))
+        self.bytes += size
+        return True
+
+    def release(self):
+        """Drop every frame"""
+        self.frames = []
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class HoverPreview:
+    """Larger, animated preview popup that follows the hovered wallpaper tile"""
+
+    POLL_MS = 15 # waiting for the decoder
+    OFFSET = 20 # from the pointer, so the popup never ends up under it (that would fire <Leave> on the tile)
+
+    def __init__(self, parent, delay_ms=400, frame_cache_mb=HOVER_FRAME_CACHE_MB, size=HOVER_PREVIEW_SIZE):
+        """
+        Args:
+            parent: Main window, the popup is a Toplevel of it
+            delay_ms: Hover time before the preview opens
+            frame_cache_mb: Budget of the FrameCache
+            size: Bounding box of the preview
+        """
+        self.parent = parent
+        self.delay_ms = delay_ms
+        self.size = size
+        self.frame_cache = FrameCache(frame_cache_mb * 1024 * 1024)
+
+        self.window = Toplevel(parent, bg=UI_COLORS["accent_blue"])
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.label = Label(self.window, bg=UI_COLORS["bg_tertiary"], bd=0)
+        self.label.pack(padx=2, pady=2)
+
+        self._decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hover-preview")
+        self._generation = 0 # bumped on every show/hide, stale decoders stop on their own
+        self._timer = None # the only after() id in use
+        self._frames = None # Queue of the current decoder
+        self._preview_path = None
+        self._pointer = (0, 0)
+        self._complete = False # every frame is in frame_cache, play from there
+        self._index = 0
+        self._current = None # PhotoImage on screen
+
+    def show(self, preview_path, x_root, y_root):
+        """
+        Pointer entered a tile: open the preview of preview_path after delay_ms
+
+        Args:
+            preview_path: Preview file of the hovered wallpaper, None hides the popup
+            x_root, y_root: Pointer position on screen
+        """
+        if preview_path is None:
+            self.hide()
+            return
+        self._pointer = (x_root, y_root)
+        if preview_path == self._preview_path:
+            return
+        self.hide()
+        self._preview_path = preview_path
+        self._schedule(self.delay_ms, self._start)
+
+    def hide(self):
+        """Pointer left the tile: stop the animation and release every frame"""
+        self._cancel_timer()
+        self._generation += 1
+        self._frames = None
+        self._preview_path = None
+        self._complete = False
+        self._current = None
+        self.frame_cache.release()
+        if self.window.winfo_exists():
+            self.window.withdraw()
+            self.label.configure(image="")
+
+    def shutdown(self):
+        """Stop the decoder thread"""
+        self.hide()
+        self._decoder.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self, delay_ms, callback):
+        self._cancel_timer()
+        self._timer = self.parent.after(delay_ms, callback)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self.parent.after_cancel(self._timer)
+            self._timer = None
+
+    def _start(self):
+        """Hover delay elapsed: start decoding and poll for the first frame"""
+        self._timer = None
+        self._frames = Queue(maxsize=2)
+        self._index = 0
+        self._decoder.submit(self._decode, self._generation, self._preview_path, self._frames)
+        self._schedule(self.POLL_MS, self._tick)
+
+    # Worker thread, never touches Tk
+
+    def _decode(self, generation, preview_path, frames):
+        """Feed frames to the queue, a second pass (and more) only if the animation is too big to be cached"""
+        total = 0
+        streaming = False
+        try:
+            while True:
+                for frame, duration in iter_preview_frames(preview_path, self.size):
+                    total += FrameCache.frame_bytes(frame.width, frame.height)
+                    streaming = streaming or total > self.frame_cache.max_bytes
+                    if not self._put(generation, frames, (frame, duration, streaming)):
+                        return
+                if not streaming or duration == 0:
+                    self._put(generation, frames, None) # end of an animation that was cached
+                    return
+        except Exception as e:
+            print(f"[WARNING] Could not decode hover preview {preview_path}: {e}")
+
+    def _put(self, generation, frames, item):
+        """Blocking put that gives up as soon as the preview is hidden or replaced"""
+        while generation == self._generation:
+            try:
+                frames.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    # Main thread
+
+    def _tick(self):
+        """Show the next frame, from the cache once the animation is complete, from the decoder before that"""
+        self._timer = None
+        if self._complete:
+            self._index = (self._index + 1) % len(self.frame_cache)
+            tk_img, duration = self.frame_cache.frames[self._index]
+            self._display(tk_img)
+            self._schedule(duration, self._tick)
+            return
+
+        try:
+            item = self._frames.get_nowait()
+        except Empty:
+            self._schedule(self.POLL_MS, self._tick)
+            return
+
+        if item is None:
+            # Whole animation cached, static previews (a single frame) need no timer at all
+            self._complete = True
+            if len(self.frame_cache) > 1:
+                self._index = len(self.frame_cache) - 1
+                self._tick()
+            return
+
+        frame, duration, streaming = item
+        tk_img = ImageTk.PhotoImage(frame)
+        if streaming:
+            self.frame_cache.release()
+        else:
+            self.frame_cache.put(tk_img, duration)
+        self._display(tk_img)
+        if duration:
+            self._schedule(duration, self._tick)
+        else:
+            self._schedule(self.POLL_MS, self._tick) # static preview, the end marker is next
+
+    def _display(self, tk_img):
+        self._current = tk_img # the label doesn't keep a reference
+        self.label.configure(image=tk_img)
+        if self.window.state() == "withdrawn":
+            self._place(tk_img.width(), tk_img.height())
+            self.window.deiconify()
+            self.window.lift()
+
+    def _place(self, width, height):
+        """Next to the pointer, on the side where the popup fits"""
+        x, y = self._pointer
+        screen_width, screen_height = self.window.winfo_screenwidth(), self.window.winfo_screenheight()
+        left = x + self.OFFSET if x + self.OFFSET + width < screen_width else max(0, x - self.OFFSET - width)
+        top = y + self.OFFSET if y + self.OFFSET + height < screen_height else max(0, y - self.OFFSET - height)
+        self.window.geometry(f"+{left}+{top}")
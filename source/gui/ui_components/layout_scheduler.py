@@ -0,0 +1,53 @@
+"""Deferred layout passes"""
+"""Resizing the window fires <Configure> on the root (which sees the events of every child), on the gallery container,
+on the canvas and on the inner frame, dozens of times per second. Instead of relaying out on each of them, everybody
+calls request() and the registered passes run once, FRAME_MS later, no matter how many requests piled up."""
+
+
+class LayoutScheduler:
+    """Coalesces layout requests into a single deferred pass per frame"""
+
+    FRAME_MS = 16
+
+    def __init__(self, widget):
+        """
+        Args:
+            widget: Any Tk widget, used for after() scheduling
+        """
+        self.widget = widget
+        self._passes = []
+        self._pending = None
+
+    def add_pass(self, layout_pass, first=False):
+        """Register a callable run on every layout pass, passes run in registration order unless first=True"""
+        if first:
+            self._passes.insert(0, layout_pass)
+        else:
+            self._passes.append(layout_pass)
+
+    def request(self, event=None):
+        """Schedule a layout pass if none is pending (usable directly as an event callback)"""
+        if self._pending is not None:
+            return
+        try:
+            self._pending = self.widget.after(self.FRAME_MS, self._run)
+        except Exception:
+            self._pending = None # widget destroyed while closing
+
+    def cancel(self):
+        """Drop the pending pass, if any"""
+        if self._pending is None:
+            return
+        try:
+            self.widget.after_cancel(self._pending)
+        except Exception:
+            pass
+        self._pending = None
+
+    def _run(self):
+        self._pending = None
+        for layout_pass in self._passes:
+            try:
+                layout_pass()
+            except Exception as e:
+                print(f"[WARNING] Layout pass {getattr(layout_pass, '__name__', layout_pass)} failed: {e}")
@@ -1,11 +1,16 @@
+from collections import deque
 from tkinter import Frame, Entry, Button, Label, BooleanVar, Checkbutton, Text, Canvas, ttk
-from common.constants import UI_COLORS, DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT
+from common.constants import UI_COLORS, DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT, LOG_AREA_MAX_LINES, LOG_AREA_FLUSH_MS
 
 
 class LogArea:
-    """Manages the application log display area with colored text output"""
+    """Manages the application log display area with colored text output
 
-    def __init__(self, parent):
+    log() only appends to a buffer, whatever piled up is inserted at once by a flush scheduled with after(), at most
+    one every flush_ms: a burst of hundreds of lines costs one insert and one redraw. The widget keeps the last
+    max_lines lines. Main thread only, workers log through the UiDispatcher (WallpaperEngineGUI._log does it for them)."""
+
+    def __init__(self, parent, max_lines=LOG_AREA_MAX_LINES, flush_ms=LOG_AREA_FLUSH_MS):
         self.frame = Frame(parent, bg=UI_COLORS["bg_secondary"], bd=2, relief="solid", highlightthickness=2, highlightcolor=UI_COLORS["accent_blue"], highlightbackground=UI_COLORS["accent_blue"])
 
         self.text_widget = Text(
@@ -20,17 +25,45 @@ class LogArea:
         )
         self.text_widget.pack(fill="both", expand=True, padx=2, pady=2)
 
+        self.max_lines = max(1, max_lines)
+        self.flush_ms = max(1, flush_ms)
+        # Lines older than max_lines would be trimmed right after the insert anyway, the deque drops them instead
+        self._pending = deque(maxlen=self.max_lines)
+        self._flush_scheduled = False
+
     def log(self, message):
-        """Add a message to the log display"""
+        """Queue a message for the log display, the insert happens at the next flush"""
+        self._pending.append(message)
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        try:
+            self.text_widget.after(self.flush_ms, self._flush)
+        except Exception as e:
+            self._flush_scheduled = False
+            print(f"[LOG_ERROR] Error scheduling log flush: {str(e)}")
+
+    def _flush(self):
+        """Insert every buffered line at once, then trim the oldest lines past max_lines"""
+        self._flush_scheduled = False
+        lines = []
+        while self._pending:
+            lines.append(self._pending.popleft())
+        if not lines:
+            return
         try:
-            self.text_widget.insert("end", message + "\n")
+            self.text_widget.insert("end", "\n".join(lines) + "\n")
+            # The Text always ends with a newline of its own, "end-1c" is on the empty line after the last message
+            excess = int(self.text_widget.index("end-1c").split(".")[0]) - 1 - self.max_lines
+            if excess > 0:
+                self.text_widget.delete("1.0", f"{excess + 1}.0")
             self.text_widget.see("end")
-            self.text_widget.update_idletasks()
         except Exception as e:
             print(f"[LOG_ERROR] Error writing to log: {str(e)}")
 
     def clear(self):
         """Limpia el log"""
+        self._pending.clear()
         self.text_widget.delete("1.0", "end")
 
     def grid(self, **kwargs):
@@ -0,0 +1,52 @@
+from tkinter import Frame, Entry, Button, Label, StringVar, BooleanVar, Checkbutton
+from common.constants import UI_COLORS
+
+
+class SearchBar:
+    """Search-as-you-type box shown above the gallery, filters the wallpapers view by id, title and tags"""
+
+    def __init__(self, parent, on_change, on_sort_by_size=None):
+        """
+        Args:
+            parent: Widget to build the bar in (the GalleryCanvas container)
+            on_change: Called with the query text on every keystroke
+            on_sort_by_size: Called with True/False when the "largest first" box is toggled, no box if not given
+        """
+        self.on_change = on_change
+        self.frame = Frame(parent, bg=UI_COLORS["bg_secondary"])
+        self.frame.columnconfigure(1, weight=1)
+
+
+        Label(self.frame, text="🔍", bg=UI_COLORS["bg_secondary"], fg=UI_COLORS["fg_text"], font=("Arial", 10)).grid(column=0, row=0, padx=(5, 2), pady=3)
+
+
+        self.query = StringVar()
+        self.entry = Entry(self.frame, textvariable=self.query, bg=UI_COLORS["text_input_bg"], fg=UI_COLORS["fg_text_dark"], insertbackground=UI_COLORS["text_input_cursor"], font=("Courier", 9))
+        self.entry.grid(column=1, row=0, sticky="ew", padx=2, pady=3)
+        self.entry.bind("<Escape>", lambda e: self.clear())
+
+        self.clear_button = Button(self.frame, text="✕", bg=UI_COLORS["button_cancel"], fg=UI_COLORS["fg_text"], font=("Arial", 8, "bold"), bd=1, relief="raised", cursor="hand2", command=self.clear)
+        self.clear_button.grid(column=2, row=0, padx=2, pady=3)
+
+        self.status_label = Label(self.frame, text="", bg=UI_COLORS["bg_secondary"], fg=UI_COLORS["fg_text"], font=("Courier", 8))
+        self.status_label.grid(column=3, row=0, padx=(2, 5), pady=3)
+
+        self.sort_by_size = BooleanVar()
+        if on_sort_by_size:
+            self.sort_checkbox = Checkbutton(self.frame, text="largest first", variable=self.sort_by_size, bg=UI_COLORS["bg_secondary"], fg=UI_COLORS["fg_text"], font=("Arial", 8, "bold"), activebackground=UI_COLORS["bg_secondary"], activeforeground=UI_COLORS["accent_red"], selectcolor=UI_COLORS["bg_secondary"], command=lambda: on_sort_by_size(self.sort_by_size.get()))
+            self.sort_checkbox.grid(column=4, row=0, padx=(2, 5), pady=3)
+
+
+        self.query.trace_add("write", lambda *args: self.on_change(self.query.get()))
+
+    def clear(self) -> None:
+        """Empty the search box (shows every wallpaper again)"""
+        self.query.set("")
+
+    def set_status(self, text: str) -> None:
+        """Show a short result summary next to the box"""
+        self.status_label.configure(text=text)
+
+    def grid(self, **kwargs) -> None:
+        """Grid the search bar frame"""
+        self.frame.grid(**kwargs)
@@ -16,23 +16,31 @@ __all__ = [
     'THUMB_SIZE',
     'count_all_wallpapers',
     'count_favorite_wallpapers',
+    'count_group_wallpapers',
     'get_wallpapers_list'
 ]
 
 
 
-def count_all_wallpapers(root_dir, loader):
+def count_all_wallpapers(root_dir, loader, catalog=None, scan=None):
     """Backward compatibility wrapper"""
-    return WallpaperFinder.count_all(root_dir, loader)
+    return WallpaperFinder.count_all(root_dir, loader, catalog=catalog, scan=scan)
 
 
-def count_favorite_wallpapers(root_dir, favorites, loader):
+def count_favorite_wallpapers(root_dir, favorites, loader, catalog=None, scan=None):
     """Backward compatibility wrapper"""
-    return WallpaperFinder.count_favorites(root_dir, favorites, loader)
+    return WallpaperFinder.count_favorites(root_dir, favorites, loader, catalog=catalog, scan=scan)
 
 
-def get_wallpapers_list(root_dir, loader, group=None, favorites=None, groups_dict=None):
+def count_group_wallpapers(root_dir, group_contents, catalog=None, scan=None):
+    """Backward compatibility wrapper"""
+    return WallpaperFinder.count_group(root_dir, group_contents, catalog=catalog, scan=scan)
+
+
+def get_wallpapers_list(root_dir, loader, group=None, favorites=None, groups_dict=None, catalog=None, scan=None,
+                        metadata_filter=None):
     """Backward compatibility wrapper"""
     return WallpaperFinder.get_wallpapers_list(
-        root_dir, loader, group=group, favorites=favorites, groups_dict=groups_dict
+        root_dir, loader, group=group, favorites=favorites, groups_dict=groups_dict, catalog=catalog, scan=scan,
+        metadata_filter=metadata_filter
     )
\ No newline at end of file
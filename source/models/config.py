@@ -4,7 +4,7 @@ in python used for handling all the flags, normalizing data... etc."""
 import json
 from os import path, makedirs
 
-from common.constants import CONFIG_PATH, RESOLUTIONS
+from common.constants import CONFIG_PATH, RESOLUTIONS, THUMBNAIL_CACHE_MAX_MB, PREVIEW_MEMORY_CACHE_MB, HOVER_FRAME_CACHE_MB, LOG_AREA_MAX_LINES, LOG_AREA_STATS_INTERVAL_S
 
 
 DEFAULT_CONFIG = {
@@ -34,6 +34,38 @@ DEFAULT_CONFIG = {
     "--pool": [],
     "--keybindings": {
         "bindings": []
+    },
+    "--thumbnails": {
+        "disk_cache": True,
+        "disk_cache_max_mb": THUMBNAIL_CACHE_MAX_MB,
+        "pack": True,
+        "memory_cache_mb": PREVIEW_MEMORY_CACHE_MB,
+        "decode_workers": 0,
+        "decode_mode": "thread",
+        "prefetch_screens": 2,
+        "prefetch_max_in_flight": 4
+    },
+    "--gallery": {
+        "mode": "virtual"
+    },
+    "--log-area": {
+        "max_lines": LOG_AREA_MAX_LINES,
+        "stats_interval_s": LOG_AREA_STATS_INTERVAL_S
+    },
+    "--watcher": {
+        "enabled": True,
+        "poll_interval_s": 5.0
+    },
+    "--duplicates": {
+        "max_distance": 6
+    },
+    "--disk-usage": {
+        "largest_count": 50
+    },
+    "--hover-preview": {
+        "enabled": True,
+        "delay_ms": 400,
+        "frame_cache_mb": HOVER_FRAME_CACHE_MB
     }
 }
 
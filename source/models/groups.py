@@ -20,6 +20,9 @@ staging area for wallpapers that are working but you don't want to use for some
 or you just don't like them. That being said, the -random mode currently works via "pools" (refer to the main.sh documentation)
 so you can just create a group called "blacklist" in the config.json as a standard group and then remove it from the pool.
 
+- Temporary groups (e.g. the results of the duplicate finder) live in the GroupManager instance only, they are never
+saved to the config. They show up as folders like any other group until discarded or until the GUI is closed.
+
 - The main issue that needs work to be done here is the persistance of "not working" wallpapers (mainly when accessing 
 WallpaperEngine (not the linux-one) since it will download the wallpapers again), not hard, but out of the current version 
 scope.
@@ -35,6 +38,8 @@ class GroupManager:
     def __init__(self, config):
         self.config = config
         self.logger = get_logger()
+        # group id -> {"label", "members", "extras"}, not persisted
+        self.temporary_groups = {}
 
 
     def toggle_favorite(self, wallpaper_id):
@@ -86,6 +91,59 @@ class GroupManager:
         else:
             self.logger.component("GROUPS", f"{wallpaper_id} already in group '{group}'", "WARNING")
 
+    def add_many_to_group(self, group, wallpaper_ids):
+        """Add several wallpapers to a group with a single config save, returns how many were added"""
+        groups = self.config["--groups"]
+        members = groups.setdefault(group, [])
+        present = set(members)
+        added = 0
+        for wallpaper_id in wallpaper_ids:
+            wallpaper_id = str(wallpaper_id)
+            if wallpaper_id not in present:
+                members.append(wallpaper_id)
+                present.add(wallpaper_id)
+                added += 1
+        if added:
+            ConfigManager.save(self.config)
+        self.logger.component("GROUPS", f"Added {added} wallpapers to group '{group}'")
+        return added
+
+    def unique_group_name(self, name):
+        """name if no group uses it yet, otherwise the first free "name 2", "name 3"..."""
+        groups = self.config["--groups"]
+        candidate, suffix = name, 2
+        while candidate in groups:
+            candidate = f"{name} {suffix}"
+            suffix += 1
+        return candidate
+
+    def set_temporary_group(self, group_id, label, members, extras=(), extras_label="extra copies"):
+        """
+        Create or replace a temporary group
+
+        Args:
+            group_id: Id of the group, should not clash with a saved group (e.g. "__DUPLICATES__")
+            label: Name shown on its folder
+            members: Wallpaper ids, in display order
+            extras: Subset of members that bulk actions apply to (e.g. the copies of a duplicate, not the original)
+            extras_label: What the extras are, for the bulk actions menu
+        """
+        self.temporary_groups[group_id] = {
+            "label": label,
+            "members": [str(wallpaper_id) for wallpaper_id in members],
+            "extras": [str(wallpaper_id) for wallpaper_id in extras],
+            "extras_label": extras_label
+        }
+        self.logger.component("GROUPS", f"Temporary group '{label}' with {len(members)} wallpapers")
+
+    def discard_temporary_group(self, group_id):
+        """Forget a temporary group"""
+        self.temporary_groups.pop(group_id, None)
+
+    def is_temporary_group(self, group_id):
+        """Check if a group id is a temporary group"""
+        return group_id in self.temporary_groups
+
     def remove_from_group(self, group, wallpaper_id):
         """Remove wallpaper from group"""
         groups = self.config["--groups"]
@@ -116,7 +174,9 @@ class GroupManager:
         return list(self.config["--groups"].keys())
 
     def get_group_contents(self, group):
-        """Get wallpapers in a group"""
+        """Get wallpapers in a group (temporary groups included)"""
+        if group in self.temporary_groups:
+            return self.temporary_groups[group]["members"]
         return self.config["--groups"].get(group, [])
 
 
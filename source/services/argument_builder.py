@@ -4,7 +4,6 @@ you should not access them from outside of this module
 """
 from common.validators import validate_directory
 from common.constants import DEFAULT_WALLPAPER_PATH_SUGGESTION
-from tkinter import messagebox
 
 
 class ArgumentBuilder:
@@ -55,7 +54,7 @@ class ArgumentBuilder:
                     self.log("[WARNING] Application will continue. Please select a valid directory.")
 
                 if self.show_gui_warning:
-                    messagebox.showwarning(
+                    self._messagebox().showwarning(
                         "Invalid Directory",
                         f"The configured directory could not be found:\n\n{dir_path}\n\n"
                         f"Error: {error_msg}\n\n"
@@ -67,7 +66,7 @@ class ArgumentBuilder:
                 self.log("[INFO] No directory configured yet")
 
             if self.show_gui_warning:
-                messagebox.showinfo(
+                self._messagebox().showinfo(
                     "No Directory Selected",
                     "No wallpaper directory has been selected.\n\n"
                     "Please use 'PICK DIR' to select your wallpaper directory.\n\n"
@@ -76,6 +75,12 @@ class ArgumentBuilder:
 
         return args
 
+    @staticmethod
+    def _messagebox():
+        """Imported on demand: the login-time startup service builds arguments too and must never load Tk"""
+        from tkinter import messagebox
+        return messagebox
+
     def _add_window_arg(self, args):
         """Add --window argument if active"""
         window_config = self.config.get("--window", {})
@@ -0,0 +1,203 @@
+"""Per-wallpaper disk usage"""
+"""Some Workshop scene packages weigh several GB. DiskUsageAnalyzer walks every wallpaper folder with os.scandir (the
+file sizes come with the directory entries, one stat per file and no separate listdir) on a thread pool, the walks are
+all syscalls so the threads don't fight over the GIL.
+
+Totals are cached in a JSON file next to the thumbnail cache, with the mtime of every directory of the folder. Adding,
+removing or renaming a file changes the mtime of its directory, so a re-run only stats the directories of each
+wallpaper and walks again the ones that changed. A file rewritten in place with a different size goes unnoticed until
+something else changes in its directory, good enough for a size overview.
+
+measure_async() runs on a background thread and delivers on_done on the Tk main thread through the UiDispatcher."""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from os import path, makedirs
+
+from common.constants import DISK_USAGE_CACHE_PATH
+from services.library_scanner import folder_mtimes
+
+
+def format_size(size):
+    """Human readable size, e.g. 1.4 GB"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def walk_folder(folder):
+    """
+    Total size of the files under a folder
+
+    Args:
+        folder: Wallpaper folder
+
+    Returns:
+        tuple: (total bytes, {directory relative to folder: mtime_ns}), None if the folder can't be read
+    """
+    try:
+        root_mtime = os.stat(folder).st_mtime_ns
+    except OSError:
+        return None
+    total = 0
+    directories = {".": root_mtime}
+    pending = [(folder, ".")]
+    while pending:
+        directory, relative = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            child = entry.name if relative == "." else f"{relative}/{entry.name}"
+                            directories[child] = entry.stat(follow_symlinks=False).st_mtime_ns
+                            pending.append((entry.path, child))
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue # vanished while walking
+        except OSError:
+            continue
+    return total, directories
+
+
+class DiskUsageCache:
+    """Persistent {wallpaper folder: total bytes} map, validated against the mtimes of the folder's directories"""
+
+    def __init__(self, cache_path=DISK_USAGE_CACHE_PATH):
+        self.cache_path = cache_path
+        self._entries = None # loaded on first use, not at startup
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, wallpaper_folder):
+        """Cached total of a folder, None when it's unknown or one of its directories changed since"""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            entry = self._entries.get(wallpaper_folder)
+        if not entry:
+            return None
+        for relative, mtime_ns in entry["dirs"].items():
+            try:
+                if os.stat(path.join(wallpaper_folder, relative)).st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+        return entry["bytes"]
+
+    def put(self, wallpaper_folder, total, directories):
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            self._entries[wallpaper_folder] = {"bytes": total, "dirs": directories}
+            self._dirty = True
+
+    def save(self):
+        """Write the cache if it changed (atomic replace)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            makedirs(path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"[WARNING] Could not save disk usage cache: {e}")
+
+
+class DiskUsageAnalyzer:
+    """Measures how much disk every wallpaper of a directory takes"""
+
+    def __init__(self, dispatcher=None, cache=None, max_workers=0):
+        """
+        Args:
+            dispatcher: UiDispatcher, needed by measure_async() to call on_done on the main thread
+            cache: DiskUsageCache, a default one (DISK_USAGE_CACHE_PATH) is opened if not given
+            max_workers: Walker threads, 0 picks a default from the core count
+        """
+        self.dispatcher = dispatcher
+        self.cache = cache or DiskUsageCache()
+        self.workers = max_workers if max_workers and max_workers > 0 else min(8, (os.cpu_count() or 1) * 2)
+        # Runs are serialized on their own thread, each of them fans out to the walker pool
+        self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-usage")
+        self._walkers = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="disk-usage-walk")
+        self._pending = 0
+
+    def _measure_folder(self, wallpaper_folder):
+        total = self.cache.get(wallpaper_folder)
+        if total is not None:
+            return total, True
+        walked = walk_folder(wallpaper_folder)
+        if walked is None:
+            return None, False
+        self.cache.put(wallpaper_folder, *walked)
+        return walked[0], False
+
+    def measure(self, root_dir, wallpaper_ids=None):
+        """
+        Size of every wallpaper, blocking
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            wallpaper_ids: Wallpaper folders to measure, None for every folder of root_dir (with a preview or not)
+
+        Returns:
+            tuple: ({wallpaper_id: bytes}, walked) where walked counts the folders that weren't cached
+        """
+        wallpaper_ids = list(folder_mtimes(root_dir) if wallpaper_ids is None else wallpaper_ids)
+        sizes = {}
+        walked = 0
+        for wallpaper_id, (total, cached) in zip(wallpaper_ids, self._walkers.map(
+                lambda wallpaper_id: self._measure_folder(path.join(root_dir, wallpaper_id)),
+                wallpaper_ids, chunksize=16)):
+            if total is None:
+                continue
+            sizes[wallpaper_id] = total
+            walked += not cached
+        self.cache.save()
+        return sizes, walked
+
+    def measure_async(self, root_dir, wallpaper_ids=None, on_done=None):
+        """Run measure() in the background, on_done gets (sizes, walked) on the main thread"""
+        self._pending += 1
+        future = self._runner.submit(self.measure, root_dir, None if wallpaper_ids is None else list(wallpaper_ids))
+        future.add_done_callback(lambda done: self.dispatcher.call_soon(self._report, done, on_done))
+
+    @property
+    def busy(self):
+        """A measure_async() result is still to be delivered"""
+        return self._pending > 0
+
+    def shutdown(self):
+        """Stop the background threads without waiting for a run in progress"""
+        self._runner.shutdown(wait=False, cancel_futures=True)
+        self._walkers.shutdown(wait=False, cancel_futures=True)
+
+    def _report(self, future, on_done):
+        """Main thread: report a finished run"""
+        self._pending -= 1
+        if future.cancelled():
+            return # shut down
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"[WARNING] Disk usage analysis failed: {e}")
+            return
+        if on_done:
+            on_done(*result)
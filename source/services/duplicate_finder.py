@@ -0,0 +1,256 @@
+"""Duplicate wallpaper finder"""
+"""Workshop libraries pile up re-uploads of the same wallpaper under different ids. Each preview gets a 64 bit
+difference hash (dHash: a 9x8 grayscale copy, one bit per horizontally adjacent pair telling which one is brighter).
+Re-encoded, resized or slightly recolored copies of an image end up a few bits apart, so two wallpapers are duplicate
+candidates when the Hamming distance of their hashes is at most max_distance.
+
+Hashes are cached in a JSON file next to the thumbnail cache, keyed like the thumbnails (preview path, mtime, size).
+
+Matching is all-pairs. With NumPy the hashes are packed in a uint64 array and every row is XORed against the rest at
+once, the popcount is vectorized too. NumPy is optional: without it the pigeonhole principle does the job, split the
+64 bits in max_distance + 1 chunks and two hashes within max_distance bits must share at least one identical chunk,
+so only wallpapers colliding on a chunk are compared."""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from os import path, makedirs
+
+from PIL import Image
+
+from common.constants import PHASH_CACHE_PATH
+from services.thumbnail_cache import ThumbnailDiskCache
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+HASH_SIZE = 8 # 8x8 = 64 bit hashes
+DEFAULT_MAX_DISTANCE = 6
+
+
+def dhash(preview_path, hash_size=HASH_SIZE):
+    """
+    Difference hash of an image
+
+    Args:
+        preview_path: Path to the preview (first frame for a GIF)
+        hash_size: Rows of the hash, the hash has hash_size * hash_size bits
+
+    Returns:
+        int: The hash, bit i is set when pixel i is brighter than its right neighbour
+    """
+    with Image.open(preview_path) as img:
+        if img.format == "JPEG":
+            img.draft("L", (hash_size * 8, hash_size * 8)) # DCT scaling, no need for the full resolution
+        small = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+class HashCache:
+    """Persistent {wallpaper folder: dHash} map, entries are invalidated when the preview changes"""
+
+    def __init__(self, cache_path=PHASH_CACHE_PATH):
+        self.cache_path = cache_path
+        self._entries = self._load()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, wallpaper_folder, key):
+        with self._lock:
+            entry = self._entries.get(wallpaper_folder)
+        if entry and entry.get("key") == key:
+            return int(entry["dhash"], 16)
+        return None
+
+    def put(self, wallpaper_folder, key, value):
+        with self._lock:
+            self._entries[wallpaper_folder] = {"key": key, "dhash": f"{value:016x}"}
+            self._dirty = True
+
+    def save(self):
+        """Write the cache if it changed (atomic replace)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            makedirs(path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"[WARNING] Could not save perceptual hash cache: {e}")
+
+
+def _popcount_table():
+    return numpy.array([bin(i).count("1") for i in range(256)], dtype=numpy.uint8)
+
+
+def _pairs_numpy(ids, hashes, max_distance):
+    """All-pairs Hamming distances, one vectorized XOR + popcount per row"""
+    packed = numpy.array(hashes, dtype=numpy.uint64)
+    bit_count = getattr(numpy, "bitwise_count", None) # NumPy >= 2.0
+    table = None if bit_count else _popcount_table()
+    pairs = []
+    for i in range(len(packed) - 1):
+        xored = packed[i + 1:] ^ packed[i]
+        if bit_count:
+            distances = bit_count(xored)
+        else:
+            distances = table[xored.view(numpy.uint8)].reshape(-1, 8).sum(axis=1)
+        for j in numpy.nonzero(distances <= max_distance)[0]:
+            pairs.append((ids[i], ids[i + 1 + int(j)], int(distances[j])))
+    return pairs
+
+
+def _pairs_pigeonhole(ids, hashes, max_distance, bits=HASH_SIZE * HASH_SIZE):
+    """Same result without NumPy: only hashes sharing one of max_distance + 1 bit chunks are compared"""
+    chunks = min(max_distance + 1, bits)
+    bounds = [(bits * k // chunks, bits * (k + 1) // chunks) for k in range(chunks)]
+    buckets = {}
+    for index, value in enumerate(hashes):
+        for k, (low, high) in enumerate(bounds):
+            chunk = (value >> low) & ((1 << (high - low)) - 1)
+            buckets.setdefault((k, chunk), []).append(index)
+
+    seen = set()
+    pairs = []
+    for members in buckets.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                i, j = members[a], members[b]
+                if (i, j) in seen:
+                    continue
+                seen.add((i, j))
+                distance = (hashes[i] ^ hashes[j]).bit_count()
+                if distance <= max_distance:
+                    pairs.append((ids[i], ids[j], distance))
+    return pairs
+
+
+def find_similar_pairs(hashes, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Pairs of wallpapers whose hashes are at most max_distance bits apart
+
+    Args:
+        hashes: {wallpaper_id: dHash}
+        max_distance: Hamming distance threshold
+
+    Returns:
+        list: (wallpaper_id, wallpaper_id, distance) tuples
+    """
+    ids = sorted(hashes)
+    values = [hashes[wallpaper_id] for wallpaper_id in ids]
+    if numpy is not None:
+        return _pairs_numpy(ids, values, max_distance)
+    return _pairs_pigeonhole(ids, values, max_distance)
+
+
+def cluster_pairs(pairs):
+    """
+    Merge similar pairs into groups of duplicates (union-find)
+
+    Returns:
+        list: Sorted lists of wallpaper ids, the lists sorted by their first id
+    """
+    parent = {}
+
+    def find(item):
+        parent.setdefault(item, item)
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for a, b, _ in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters = {}
+    for item in parent:
+        clusters.setdefault(find(item), []).append(item)
+    return sorted((sorted(members) for members in clusters.values()), key=lambda members: members[0])
+
+
+class DuplicateFinder:
+    """Hashes the previews of a wallpaper directory and groups the near-identical ones"""
+
+    def __init__(self, hash_cache=None, max_workers=0):
+        """
+        Args:
+            hash_cache: HashCache, a default one (PHASH_CACHE_PATH) is opened if not given
+            max_workers: Hashing threads, 0 picks a default from the core count
+        """
+        self.hash_cache = hash_cache or HashCache()
+        self.workers = max_workers if max_workers and max_workers > 0 else min(4, os.cpu_count() or 1)
+
+    def _hash_preview(self, wallpaper_folder, preview_path):
+        try:
+            key = ThumbnailDiskCache.make_key(preview_path, os.stat(preview_path))
+        except OSError:
+            return None
+        value = self.hash_cache.get(wallpaper_folder, key)
+        if value is None:
+            try:
+                value = dhash(preview_path)
+            except Exception as e:
+                print(f"[WARNING] Could not hash preview {preview_path}: {e}")
+                return None
+            self.hash_cache.put(wallpaper_folder, key, value)
+        return value
+
+    def hash_previews(self, root_dir, previews):
+        """
+        dHash of every preview, from the cache when the preview didn't change
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            previews: {wallpaper_id: preview path}
+
+        Returns:
+            dict: {wallpaper_id: dHash} of the previews that could be hashed
+        """
+        items = list(previews.items())
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="phash") as executor:
+            values = executor.map(
+                lambda item: self._hash_preview(path.join(root_dir, item[0]), item[1]), items, chunksize=32
+            )
+            hashes = {wallpaper_id: value for (wallpaper_id, _), value in zip(items, values) if value is not None}
+        self.hash_cache.save()
+        return hashes
+
+    def find(self, root_dir, previews, max_distance=DEFAULT_MAX_DISTANCE):
+        """
+        Groups of duplicate wallpapers
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            previews: {wallpaper_id: preview path}, e.g. LibraryScan.previews
+            max_distance: Hamming distance threshold, 0 only finds identical hashes
+
+        Returns:
+            list: Sorted lists of wallpaper ids, see cluster_pairs()
+        """
+        hashes = self.hash_previews(root_dir, previews)
+        return cluster_pairs(find_similar_pairs(hashes, max_distance))
@@ -17,6 +17,9 @@ from typing import List, Optional
 from datetime import datetime
 import signal
 
+from common.constants import BACKEND_LOG_PATH
+from common.log_files import rotate_log
+
 
 class EngineLogger:
     """Centralized logging for engine operations - replaces bash logging"""
@@ -24,6 +27,7 @@ class EngineLogger:
     def __init__(self, log_file: Optional[str] = None):
         self.log_file = log_file or self._get_default_log_file()
         self._ensure_log_directory()
+        rotate_log(self.log_file)
         
         # Configure logger
         self.logger = logging.getLogger("Engine")
@@ -38,8 +42,7 @@ class EngineLogger:
     
     @staticmethod
     def _get_default_log_file() -> str:
-        data_dir = Path.home() / ".local/share/linux-wallpaper-engine-features"
-        return str(data_dir / "logs.txt")
+        return BACKEND_LOG_PATH
     
     def _ensure_log_directory(self):
         Path(self.log_file).parent.mkdir(parents=True, exist_ok=True)
@@ -436,6 +439,8 @@ class EngineStateManager:
             if file_age > max_age_seconds:
                 log_file.unlink()
                 self.logger.success("Cleaned up old log file")
+            elif rotate_log(str(log_file)):
+                self.logger.success("Rotated log file")
         
         # Keep only last 50 entries in running file
         self._trim_running_file(50)
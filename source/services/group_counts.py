@@ -0,0 +1,102 @@
+"""Wallpaper counts of the groups view"""
+"""The groups view shows how many wallpapers every folder holds. Those numbers only depend on which wallpapers have a
+preview (existence metadata, from the WallpaperCatalog or a LibraryScan) and on the members of each group, never on
+the previews themselves, so nothing is decoded to get them.
+
+Counts are cached per (directory, group, members): toggling a favorite or editing a group changes the members and
+thus the key, a change of the library itself calls invalidate() (watcher batch, a background catalog rescan that
+found changes, or without a catalog a new mtime of the directory noticed by the gallery manager). Going back to the
+groups view never waits for the library to be walked: the tiles are drawn from the catalog as it is and a rescan that
+finds changes redraws them with fresh counts. Missing counts are computed
+in a background thread, the view shows a placeholder meanwhile and on_ready fills it in on the Tk main thread (through
+the UiDispatcher)."""
+
+import threading
+
+from services.library_scanner import scan_library
+
+
+class GroupCountCache:
+    """Caches the counts of the groups view and computes the missing ones off the main thread"""
+
+    def __init__(self, dispatcher=None, catalog=None):
+        """
+        Args:
+            dispatcher: UiDispatcher the counts are delivered through. Without it counts are computed synchronously
+            catalog: Optional WallpaperCatalog, otherwise every computation takes its own LibraryScan
+        """
+        self.dispatcher = dispatcher
+        self.catalog = catalog
+        self._counts = {}
+        self._generation = 0
+
+    @staticmethod
+    def _key(root_dir, group_id, members):
+        return root_dir, group_id, None if members is None else frozenset(str(m) for m in members)
+
+    def get(self, root_dir, group_id, members=None):
+        """
+        Cached count of a group, or None if it has to be computed
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            group_id: Group name (or __ALL__ / __FAVORITES__)
+            members: Wallpaper ids of the group, None for every wallpaper of root_dir
+        """
+        return self._counts.get(self._key(root_dir, group_id, members))
+
+    def request(self, root_dir, groups, on_ready):
+        """
+        Compute the counts of several groups, in the background when a dispatcher is available
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            groups: {group_id: members} (members None for every wallpaper)
+            on_ready: Called on the main thread with (group_id, count) for every group
+        """
+        if not groups:
+            return
+        generation = self._generation
+        if self.dispatcher is None:
+            for group_id, count in self._compute(root_dir, groups).items():
+                self._store(generation, root_dir, groups, group_id, count, on_ready)
+            return
+
+        threading.Thread(
+            target=self._compute_in_background, args=(generation, root_dir, groups, on_ready),
+            name="group-counts", daemon=True
+        ).start()
+
+    def invalidate(self):
+        """Forget every count (the library changed), computations still running are discarded"""
+        self._counts.clear()
+        self._generation += 1
+
+    def _compute(self, root_dir, groups):
+        """{group_id: count}, from the catalog or from one scan shared by every group"""
+        if self.catalog is not None:
+            return {group_id: self.catalog.count(root_dir, members) for group_id, members in groups.items()}
+        scan = scan_library(root_dir)
+        return {group_id: scan.count(members) for group_id, members in groups.items()}
+
+    def _compute_in_background(self, generation, root_dir, groups, on_ready):
+        try:
+            counts = self._compute(root_dir, groups)
+        except Exception as e:
+            print(f"[WARNING] Could not count wallpapers of {root_dir}: {e}")
+            counts = {}
+        self.dispatcher.call_soon(self._deliver, generation, root_dir, groups, counts, on_ready)
+
+    def _store(self, generation, root_dir, groups, group_id, count, on_ready):
+        if generation != self._generation:
+            return
+        self._counts[self._key(root_dir, group_id, groups[group_id])] = count
+        on_ready(group_id, count)
+
+    def _deliver(self, generation, root_dir, groups, counts, on_ready):
+        """Main thread: store the finished counts and hand them to the view"""
+        for group_id, count in counts.items():
+            try:
+                self._store(generation, root_dir, groups, group_id, count, on_ready)
+            except Exception as e:
+                print(f"[WARNING] Error showing wallpaper count of {group_id}: {e}")
@@ -31,18 +31,21 @@ class KeyboardShortcutAPI:
         api.sync_to_window(main_window)
     """
 
-    def __init__(self, config: Dict, log_callback: Callable = None):
+    def __init__(self, config: Dict, log_callback: Callable = None, dispatcher=None):
         """
         Initialize the keyboard shortcut API.
         
         Args:
             config: Application configuration dictionary
             log_callback: Optional logging function
+            dispatcher: Optional UiDispatcher, runs the handlers registered with on_main_thread=True
         """
         self.config = config
         self.log = log_callback or (lambda msg: None)
+        self.dispatcher = dispatcher
         self.bindings: Dict[KeybindingAction, Dict[str, Any]] = {}
         self.handlers: Dict[KeybindingAction, Callable] = {}
+        self.main_thread_actions = set()
         self._bound_window = None
 
         self._load_bindings_from_config()
@@ -90,7 +93,8 @@ class KeyboardShortcutAPI:
     def on_action_handler(
         self,
         action: KeybindingAction,
-        handler: Callable
+        handler: Callable,
+        on_main_thread: bool = False
     ) -> None:
         """
         Register a handler function for an action.
@@ -98,6 +102,8 @@ class KeyboardShortcutAPI:
         Args:
             action: The action to handle
             handler: Callable that executes when the action is triggered
+            on_main_thread: Run it on the Tk thread through the dispatcher instead of a thread of its own, for
+                handlers that touch widgets, Tk variables or messageboxes
         
         Example:
             api.on_action_handler(
@@ -106,6 +112,10 @@ class KeyboardShortcutAPI:
             )
         """
         self.handlers[action] = handler
+        if on_main_thread:
+            self.main_thread_actions.add(action)
+        else:
+            self.main_thread_actions.discard(action)
         self.log(f"[KB API] Registered handler for {action.value}")
 
     def get_binding(self, action: KeybindingAction) -> Optional[Dict[str, Any]]:
@@ -245,10 +255,13 @@ class KeyboardShortcutAPI:
 
         try:
             handler = self.handlers[action]
-            import threading
+            if action in self.main_thread_actions and self.dispatcher:
+                self.dispatcher.call_soon(handler)
+            else:
+                import threading
 
-            thread = threading.Thread(target=handler, daemon=True)
-            thread.start()
+                thread = threading.Thread(target=handler, daemon=True)
+                thread.start()
             self.log(f"[KB API] Executed action: {action.value}")
         except Exception as e:
             self.log(f"[KB API ERROR] Failed to execute {action.value}: {str(e)}")
@@ -14,16 +14,18 @@ class KeybindingService:
     rather than system-wide hotkeys.
     """
 
-    def __init__(self, config: Dict, log_callback: Callable = None):
+    def __init__(self, config: Dict, log_callback: Callable = None, dispatcher=None):
         """
         Initialize the keybinding service.
         
         Args:
             config: Configuration dictionary
             log_callback: Optional logging callback
+            dispatcher: Optional UiDispatcher, runs the handlers registered with on_main_thread=True
         """
         self.config = config
         self.log = log_callback or (lambda msg: None)
+        self.dispatcher = dispatcher
 
         # Load keybindings from config or initialize empty manager
         keybinding_data = config.get("--keybindings", {"bindings": []})
@@ -31,11 +33,13 @@ class KeybindingService:
 
 
         self.action_handlers: Dict[KeybindingAction, Callable] = {}
+        self.main_thread_actions = set()
 
     def register_action_handler(
         self,
         action: KeybindingAction,
-        handler: Callable
+        handler: Callable,
+        on_main_thread: bool = False
     ) -> None:
         """
         Register a handler for a specific action.
@@ -43,8 +47,14 @@ class KeybindingService:
         Args:
             action: The action to handle
             handler: Callable that will be invoked when action is triggered
+            on_main_thread: Run it on the Tk thread through the dispatcher (handlers that only touch the UI) instead
+                of a thread of its own (handlers that block)
         """
         self.action_handlers[action] = handler
+        if on_main_thread:
+            self.main_thread_actions.add(action)
+        else:
+            self.main_thread_actions.discard(action)
         self.log(f"[KEYBIND] Registered handler for {action.value}")
 
     def on_key_press(self, key: str, modifiers: List[str]) -> bool:
@@ -66,8 +76,11 @@ class KeybindingService:
             try:
 
                 handler = self.action_handlers[action]
-                thread = threading.Thread(target=handler, daemon=True)
-                thread.start()
+                if action in self.main_thread_actions and self.dispatcher:
+                    self.dispatcher.call_soon(handler)
+                else:
+                    thread = threading.Thread(target=handler, daemon=True)
+                    thread.start()
             except Exception as e:
                 self.log(f"[KEYBIND ERROR] Failed to execute {action.value}: {str(e)}")
             return True
@@ -0,0 +1,116 @@
+"""Single-pass wallpaper directory scanner"""
+"""The groups view used to list --dir once for the 'All' count, once more for the 'Favorites' count, and opening a
+group listed it a third time, each pass doing a path.isdir() plus up to three path.exists() per folder.
+
+scan_library() walks --dir once with os.scandir: the folder test comes from the DirEntry type info (d_type, no stat),
+only the preview lookup touches each folder. The result is a LibraryScan, an immutable snapshot that answers every
+count and list of a refresh (All, Favorites, custom groups) without going back to the disk."""
+
+import os
+from os import path
+from types import MappingProxyType
+
+from common.constants import PREVIEW_FILENAMES
+
+
+class LibraryScan:
+    """Immutable snapshot of the wallpapers (with a preview) found in a wallpaper directory"""
+
+    __slots__ = ("_root_dir", "_previews", "_wallpaper_ids")
+
+    def __init__(self, root_dir, previews):
+        """
+        Args:
+            root_dir: Scanned wallpaper directory
+            previews: {wallpaper id: preview path} of the wallpapers that have a preview
+        """
+        self._root_dir = root_dir
+        self._previews = MappingProxyType(dict(sorted(previews.items())))
+        self._wallpaper_ids = tuple(self._previews)
+
+    @property
+    def root_dir(self):
+        return self._root_dir
+
+    @property
+    def wallpaper_ids(self):
+        """Sorted tuple of wallpaper ids, same order as WallpaperCatalog.wallpaper_ids()"""
+        return self._wallpaper_ids
+
+    @property
+    def previews(self):
+        """Read-only {wallpaper id: preview path} mapping"""
+        return self._previews
+
+    def __len__(self):
+        return len(self._wallpaper_ids)
+
+    def __contains__(self, wallpaper_id):
+        return str(wallpaper_id) in self._previews
+
+    def preview_path(self, wallpaper_id):
+        """Preview path of a wallpaper, or None if it wasn't found (or has no preview)"""
+        return self._previews.get(str(wallpaper_id))
+
+    def count(self, wallpaper_ids=None):
+        """Number of wallpapers with a preview, optionally restricted to a collection of ids (favorites, a group...)"""
+        if wallpaper_ids is None:
+            return len(self._wallpaper_ids)
+        return sum(1 for wallpaper_id in set(str(w) for w in wallpaper_ids) if wallpaper_id in self._previews)
+
+
+def find_preview_file(wallpaper_folder):
+    """First existing preview file of a folder (PREVIEW_FILENAMES order), or None"""
+    for name in PREVIEW_FILENAMES:
+        preview_path = path.join(wallpaper_folder, name)
+        try:
+            os.stat(preview_path)
+        except OSError:
+            continue
+        return preview_path
+    return None
+
+
+def scan_library(root_dir):
+    """
+    List a wallpaper directory once and locate the preview of every wallpaper folder
+
+    Args:
+        root_dir: Wallpaper directory (--dir)
+
+    Returns:
+        LibraryScan: Snapshot of the directory (empty if it can't be read)
+    """
+    previews = {}
+    try:
+        with os.scandir(root_dir) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_dir():
+                        continue
+                except OSError:
+                    continue
+                preview_path = find_preview_file(entry.path)
+                if preview_path:
+                    previews[entry.name] = preview_path
+    except OSError as e:
+        print(f"[WARNING] Could not scan wallpaper directory {root_dir}: {e}")
+    return LibraryScan(root_dir, previews)
+
+
+def folder_mtimes(root_dir):
+    """
+    {folder name: mtime_ns} of the wallpaper folders of a directory, in a single scandir pass
+
+    Raises:
+        OSError: root_dir can't be listed
+    """
+    mtimes = {}
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    mtimes[entry.name] = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+    return mtimes
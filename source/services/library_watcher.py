@@ -0,0 +1,282 @@
+"""Live wallpaper directory watcher"""
+"""Steam adds, updates and removes Workshop folders while the GUI is open. The watcher follows --dir and its immediate
+children with inotify (through ctypes, no extra dependency) and reports which wallpaper folders changed. Where inotify
+is not available (other kernels, exhausted watch limits...) it falls back to polling: the folder mtimes catch added,
+removed and replaced files, the mtime and size of the preview files and project.json of every folder catch the ones
+rewritten in place (that doesn't move the folder mtime, inotify reports it with IN_CLOSE_WRITE). A poll is a few stats
+per folder on the watcher thread.
+
+Events are collected in a background thread and debounced: a Workshop sync touching hundreds of folders ends up as a
+single batch, delivered once things have been quiet for DEBOUNCE_S (or after MAX_BATCH_DELAY_S at most). The batch is
+handed to on_change on the Tk main thread through the UiDispatcher, the watcher thread never touches Tk."""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from os import path
+
+from common.constants import PREVIEW_FILENAMES, PROJECT_FILENAME
+from services.library_scanner import folder_mtimes
+
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+CHILD_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal ctypes binding of the inotify syscalls"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, watch_path, mask):
+        """Watch a path, returns the watch descriptor (raises OSError, e.g. ENOSPC when out of watches)"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(watch_path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), watch_path)
+        return wd
+
+    def rm_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """Read every pending event as (wd, mask, name) tuples, without blocking"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + name_len].split(b"\0", 1)[0]
+            offset += name_len
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class LibraryWatcher:
+    """Watches a wallpaper directory and reports debounced batches of changed wallpaper folders"""
+
+    DEBOUNCE_S = 1.0
+    MAX_BATCH_DELAY_S = 5.0
+    POLLED_FILES = PREVIEW_FILENAMES + (PROJECT_FILENAME,) # rewritten in place without moving the folder mtime
+
+    def __init__(self, dispatcher, on_change, poll_interval=5.0, use_inotify=True):
+        """
+        Args:
+            dispatcher: UiDispatcher the batches are delivered through
+            on_change: Called on the main thread with (root_dir, changed_ids, full_rescan). changed_ids is a set of
+                       wallpaper ids (folder names) that were added, removed or modified. full_rescan is True when
+                       events were lost (inotify queue overflow, root replaced) and only a rescan can tell
+            poll_interval: Seconds between two mtime polls in fallback mode
+            use_inotify: Set to False to force the polling fallback
+        """
+        self.dispatcher = dispatcher
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+
+        self.root_dir = None
+        self.mode = None # "inotify" or "poll" once started
+        self._thread = None
+        self._stop = threading.Event()
+
+    def watch(self, root_dir):
+        """(Re)start watching root_dir, an empty or missing directory just stops the watcher"""
+        self.stop()
+        if not root_dir or not path.isdir(root_dir):
+            self.root_dir = None
+            return
+        self.root_dir = root_dir
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(root_dir, self._stop), name="library-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread, pending events are dropped"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self, root_dir, stop_event):
+        """Watcher thread: inotify if possible, mtime polling otherwise"""
+        if self.use_inotify:
+            inotify = None
+            try:
+                inotify = Inotify()
+                root_wd = inotify.add_watch(root_dir, ROOT_MASK)
+            except (OSError, AttributeError) as e:
+                print(f"[WARNING] inotify unavailable ({e}), polling {root_dir} every {self.poll_interval}s")
+                if inotify:
+                    inotify.close()
+            else:
+                self.mode = "inotify"
+                try:
+                    self._run_inotify(inotify, root_wd, root_dir, stop_event)
+                finally:
+                    inotify.close()
+                return
+        self.mode = "poll"
+        self._run_poll(root_dir, stop_event)
+
+    def _run_inotify(self, inotify, root_wd, root_dir, stop_event):
+        child_wds = {} # wd -> wallpaper id
+        watch_limit_hit = False
+
+        def watch_child(name):
+            nonlocal watch_limit_hit
+            if watch_limit_hit:
+                return
+            try:
+                child_wds[inotify.add_watch(path.join(root_dir, name), CHILD_MASK)] = name
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    # fs.inotify.max_user_watches exhausted: the root watch still reports added/removed folders
+                    watch_limit_hit = True
+                    print("[WARNING] inotify watch limit reached, changes inside existing wallpapers won't be seen")
+
+        try:
+            with os.scandir(root_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        watch_child(entry.name)
+        except OSError:
+            pass
+
+        batch = _Batch()
+        while not stop_event.is_set():
+            ready, _, _ = select.select([inotify.fd], [], [], 0.2)
+            if ready:
+                for wd, mask, name in inotify.read_events():
+                    if mask & IN_Q_OVERFLOW:
+                        batch.add(full_rescan=True)
+                    elif wd == root_wd:
+                        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                            batch.add(full_rescan=True)
+                        elif name:
+                            if mask & (IN_CREATE | IN_MOVED_TO) and mask & IN_ISDIR:
+                                watch_child(name)
+                            batch.add(name)
+                    elif mask & IN_IGNORED:
+                        child_wds.pop(wd, None)
+                    elif wd in child_wds:
+                        batch.add(child_wds[wd])
+            self._flush_if_quiet(root_dir, batch, stop_event)
+
+    def _run_poll(self, root_dir, stop_event):
+        snapshot = self._poll_snapshot(root_dir)
+        batch = _Batch()
+        next_poll = time.monotonic() + self.poll_interval
+        while not stop_event.wait(0.2):
+            if time.monotonic() >= next_poll:
+                current = self._poll_snapshot(root_dir)
+                for name in snapshot.keys() | current.keys():
+                    if snapshot.get(name) != current.get(name):
+                        batch.add(name)
+                snapshot = current
+                next_poll = time.monotonic() + self.poll_interval
+            self._flush_if_quiet(root_dir, batch, stop_event)
+
+    @classmethod
+    def _poll_snapshot(cls, root_dir):
+        """{folder name: (folder mtime, (mtime_ns, size) or None of each of POLLED_FILES)} of root_dir"""
+        try:
+            mtimes = folder_mtimes(root_dir)
+        except OSError:
+            return {}
+        snapshot = {}
+        for name, folder_mtime in mtimes.items():
+            files = []
+            for file_name in cls.POLLED_FILES:
+                try:
+                    file_stat = os.stat(path.join(root_dir, name, file_name))
+                except OSError:
+                    files.append(None)
+                    continue
+                files.append((file_stat.st_mtime_ns, file_stat.st_size))
+            snapshot[name] = (folder_mtime, tuple(files))
+        return snapshot
+
+    def _flush_if_quiet(self, root_dir, batch, stop_event):
+        """Hand the batch over once events stopped for DEBOUNCE_S, or when it's been waiting for too long"""
+        if not batch.pending():
+            return
+        now = time.monotonic()
+        if now - batch.last_event >= self.DEBOUNCE_S or now - batch.first_event >= self.MAX_BATCH_DELAY_S:
+            self.dispatcher.call_soon(self._deliver, stop_event, root_dir, batch.changed, batch.full_rescan)
+            batch.reset()
+
+    def _deliver(self, stop_event, root_dir, changed, full_rescan):
+        """Main thread: hand a batch of the watcher thread over to on_change"""
+        if stop_event.is_set() or root_dir != self.root_dir:
+            return # stopped or directory changed since
+        try:
+            self.on_change(root_dir, changed, full_rescan)
+        except Exception as e:
+            print(f"[WARNING] Error applying wallpaper directory changes: {e}")
+
+
+class _Batch:
+    """Changes accumulated between two deliveries"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.changed = set()
+        self.full_rescan = False
+        self.first_event = None
+        self.last_event = None
+
+    def add(self, wallpaper_id=None, full_rescan=False):
+        now = time.monotonic()
+        if self.first_event is None:
+            self.first_event = now
+        self.last_event = now
+        if wallpaper_id:
+            self.changed.add(wallpaper_id)
+        self.full_rescan = self.full_rescan or full_rescan
+
+    def pending(self):
+        return self.first_event is not None
@@ -0,0 +1,149 @@
+"""project.json metadata index"""
+"""Every Workshop folder ships a project.json describing the wallpaper: title, type (scene/video/web/application), tags,
+content rating and the main file. MetadataIndexer parses them in a thread pool and stores the results in the
+WallpaperCatalog, with the mtime and size of each file: the next update only stats the files and parses the ones that
+changed. Filters (WallpaperFinder, search...) then query the catalog, no JSON is opened at view time.
+
+Updates run one at a time on a background thread, on_done is delivered on the Tk main thread through the UiDispatcher."""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+from common.constants import PROJECT_FILENAME
+
+
+def parse_project_json(project_path):
+    """
+    Extract the indexed fields of a project.json
+
+    Broken or unreadable files give empty metadata instead of an error, they are indexed anyway (with their mtime)
+    so they aren't parsed again until they change.
+
+    Args:
+        project_path: Path to project.json
+
+    Returns:
+        dict: title, type, tags (list), content_rating and file, missing values are None
+    """
+    metadata = {"title": None, "type": None, "tags": [], "content_rating": None, "file": None}
+    try:
+        # Some editors save it with a BOM
+        with open(project_path, encoding="utf-8-sig") as f:
+            project = json.load(f)
+    except (OSError, ValueError):
+        return metadata
+    if not isinstance(project, dict):
+        return metadata
+
+    def text(key):
+        value = project.get(key)
+        return value.strip() if isinstance(value, str) and value.strip() else None
+
+    metadata["title"] = text("title")
+    wallpaper_type = text("type")
+    metadata["type"] = wallpaper_type.lower() if wallpaper_type else None # "Scene", "Video"... depending on the editor
+    metadata["content_rating"] = text("contentrating")
+    metadata["file"] = text("file")
+    tags = project.get("tags")
+    if isinstance(tags, list):
+        metadata["tags"] = [tag.strip() for tag in tags if isinstance(tag, str) and tag.strip()]
+    return metadata
+
+
+class MetadataIndexer:
+    """Keeps the project.json metadata of a wallpaper directory indexed in the catalog"""
+
+    def __init__(self, catalog, dispatcher=None, max_workers=0):
+        """
+        Args:
+            catalog: WallpaperCatalog where the metadata is stored
+            dispatcher: UiDispatcher, needed by update_async() to call on_done on the main thread
+            max_workers: Parser threads, 0 picks a default from the core count
+        """
+        self.catalog = catalog
+        self.dispatcher = dispatcher
+        self.workers = max_workers if max_workers and max_workers > 0 else min(8, (os.cpu_count() or 1) * 2)
+        # Updates are serialized on their own thread, each of them fans out to the parser pool
+        self._updater = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata-update")
+        self._parsers = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="metadata-parse")
+        self._pending = 0
+
+    @staticmethod
+    def _stat_project(root_dir, wallpaper_id):
+        """(wallpaper_id, project path, (mtime_ns, size)) or the same with None when there is no project.json"""
+        project_path = path.join(root_dir, wallpaper_id, PROJECT_FILENAME)
+        try:
+            project_stat = os.stat(project_path)
+        except OSError:
+            return wallpaper_id, project_path, None
+        return wallpaper_id, project_path, (project_stat.st_mtime_ns, project_stat.st_size)
+
+    @staticmethod
+    def _parse(wallpaper_id, project_path, state):
+        return wallpaper_id, state[0], state[1], parse_project_json(project_path)
+
+    def update(self, root_dir, wallpaper_ids=None):
+        """
+        Bring the metadata of a directory up to date, blocking
+
+        Args:
+            root_dir: Wallpaper directory (--dir), the catalog must have scanned it
+            wallpaper_ids: Only look at these wallpapers (e.g. a LibraryWatcher batch), None for all of them
+
+        Returns:
+            tuple: (parsed, unchanged, removed) counts
+        """
+        cataloged = set(self.catalog.wallpaper_ids(root_dir, with_preview=False))
+        known = self.catalog.metadata_state(root_dir)
+        candidates = cataloged if wallpaper_ids is None else cataloged & set(wallpaper_ids)
+
+        stale = [] # (wallpaper_id, project_path, state) to parse
+        removed = set()
+        unchanged = 0
+        for wallpaper_id, project_path, state in self._parsers.map(
+                lambda wallpaper_id: self._stat_project(root_dir, wallpaper_id), candidates, chunksize=64):
+            if state is None:
+                if wallpaper_id in known:
+                    removed.add(wallpaper_id)
+            elif known.get(wallpaper_id) != state:
+                stale.append((wallpaper_id, project_path, state))
+            else:
+                unchanged += 1
+
+        # Folders that left the catalog take their metadata with them
+        if wallpaper_ids is None:
+            removed.update(wallpaper_id for wallpaper_id in known if wallpaper_id not in cataloged)
+        else:
+            removed.update(wallpaper_id for wallpaper_id in wallpaper_ids
+                           if wallpaper_id in known and wallpaper_id not in cataloged)
+
+        records = list(self._parsers.map(lambda item: self._parse(*item), stale, chunksize=16))
+        if records or removed:
+            self.catalog.store_metadata(root_dir, records, removed)
+        return len(records), unchanged, len(removed)
+
+    def update_async(self, root_dir, wallpaper_ids=None, on_done=None):
+        """Run update() in the background, on_done gets (parsed, unchanged, removed) on the main thread"""
+        self._pending += 1
+        future = self._updater.submit(self.update, root_dir, wallpaper_ids)
+        future.add_done_callback(lambda done: self.dispatcher.call_soon(self._report, done, on_done))
+
+    def shutdown(self):
+        """Stop the background threads, an update in progress is finished first"""
+        self._updater.shutdown(wait=True, cancel_futures=True)
+        self._parsers.shutdown(wait=True, cancel_futures=True)
+
+    def _report(self, future, on_done):
+        """Main thread: report a finished update"""
+        self._pending -= 1
+        if future.cancelled():
+            return # shut down
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"[WARNING] Metadata indexing failed: {e}")
+            return
+        if on_done:
+            on_done(*result)
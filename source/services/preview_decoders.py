@@ -0,0 +1,89 @@
+"""Format-aware preview decoding"""
+"""Workshop previews are mostly 1920px JPEGs, decoding them at full resolution just to throw away 99% of the pixels is
+most of the cost of a cold gallery. Every strategy receives the opened (not yet loaded) image and returns an image
+that is cheap to thumbnail, anything without a strategy goes through the plain Image.open() + thumbnail() path.
+
+Only register a strategy that benchmarks/bench_preview_formats.py shows to be faster than that plain path. PNG and GIF
+have none: thumbnail() already reduces PNGs internally (their cost is zlib) and only ever decodes the first GIF frame,
+reduce() or convert() on top of it measured 1.0x and 0.7x.
+
+If you add a format, keep it lazy: Image.open() only reads headers, the moment you call load() (or anything that
+touches pixels) you pay for the full decode.
+
+iter_preview_frames() is the animated counterpart used by the hover preview: frames are decoded one at a time, only
+when the caller asks for the next one."""
+
+from PIL import Image
+
+
+# GIF delays below MIN_FRAME_MS (0 is common in Workshop previews) are played at 100 ms, like browsers do
+DEFAULT_FRAME_MS = 100
+MIN_FRAME_MS = 20
+
+
+def _decode_jpeg(img, size):
+    """JPEG: DCT-domain scaling, libjpeg decodes straight at 1/2, 1/4 or 1/8 scale (never below size)"""
+    img.draft(img.mode, size)
+    return img
+
+
+DECODERS = {
+    "JPEG": _decode_jpeg,
+}
+
+
+def open_preview(preview_path, size):
+    """
+    Open a preview file and downscale it to fit in size, using the fastest decode path for its format
+
+    Args:
+        preview_path: Path to the preview file
+        size: (width, height) bounding box of the thumbnail
+
+    Returns:
+        Image: The thumbnail
+    """
+    img = Image.open(preview_path)
+    decoder = DECODERS.get(img.format)
+    if decoder:
+        img = decoder(img, size)
+    img.thumbnail(size)
+    return img
+
+
+def iter_preview_frames(preview_path, size):
+    """
+    Decode the frames of a preview lazily, each one downscaled to fit in size
+
+    Static previews yield a single frame. Stop iterating (or close the generator) and the rest of the file is never
+    decoded. Safe to use from a worker thread, the image never leaves the generator.
+
+    Args:
+        preview_path: Path to the preview file
+        size: (width, height) bounding box of the frames
+
+    Yields:
+        tuple: (Image, duration in ms), the duration is 0 for static previews
+    """
+    with Image.open(preview_path) as img:
+        if not getattr(img, "is_animated", False):
+            decoder = DECODERS.get(img.format)
+            frame = decoder(img, size) if decoder else img
+            frame.thumbnail(size)
+            yield frame, 0
+            return
+
+        index = 0
+        while True:
+            try:
+                img.seek(index)
+            except EOFError:
+                return
+            frame = img.convert("RGBA")
+            factor = min(frame.width // size[0], frame.height // size[1])
+            if factor >= 2:
+                frame = frame.reduce(factor)
+            frame.thumbnail(size)
+            duration = img.info.get("duration") or 0
+            yield frame, duration if duration >= MIN_FRAME_MS else DEFAULT_FRAME_MS
+            index += 1
@@ -0,0 +1,131 @@
+"""In-memory preview cache with a byte budget"""
+"""Only the PhotoImage is kept (the PIL image is garbage as soon as Tk has copied the pixels), and the least recently
+used ones are dropped once the budget is exceeded. Tk stores photo images as 32-bit RGBA blocks, so an entry costs
+width * height * 4 bytes no matter what format the preview came from.
+
+Pinned entries (the tiles currently on screen) are never evicted, even if that means going over budget for a while,
+evicting them would only make Tk delete an image that is still being displayed. All methods must be called from the
+Tk main thread, PhotoImages can't be touched anywhere else anyway."""
+
+from collections import OrderedDict
+
+from common.constants import PREVIEW_MEMORY_CACHE_MB
+
+
+class PreviewMemoryCache:
+    """LRU cache of preview PhotoImages bounded by an approximate byte budget"""
+
+    BYTES_PER_PIXEL = 4
+
+    def __init__(self, max_bytes=PREVIEW_MEMORY_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # folder -> (PhotoImage, bytes), oldest first
+        self._pinned = set()
+        self._total_bytes = 0
+        self._pinned_bytes = 0 # lets a fully pinned cache skip the eviction scan
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, wallpaper_folder):
+        """
+        Return the cached PhotoImage of a wallpaper and mark it as recently used
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+
+        Returns:
+            PhotoImage or None: The cached preview or None on a miss
+        """
+        entry = self._entries.get(wallpaper_folder)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(wallpaper_folder)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, wallpaper_folder, tk_img):
+        """
+        Cache a PhotoImage, evicting least recently used unpinned entries if over budget
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+            tk_img: PhotoImage of the preview
+        """
+        self._remove(wallpaper_folder)
+        size = self.image_bytes(tk_img)
+        self._entries[wallpaper_folder] = (tk_img, size)
+        self._total_bytes += size
+        if wallpaper_folder in self._pinned:
+            self._pinned_bytes += size
+        self._enforce_budget()
+
+    def discard(self, wallpaper_folder):
+        """Drop the entry of a wallpaper, if cached (not counted as an eviction)"""
+        self._remove(wallpaper_folder)
+
+    def pin(self, wallpaper_folders):
+        """Replace the set of pinned (visible) wallpapers, previously pinned ones become evictable again"""
+        self._pinned = set(wallpaper_folders)
+        self._pinned_bytes = sum(self._entries[folder][1] for folder in self._pinned if folder in self._entries)
+        self._enforce_budget()
+
+    def clear(self):
+        """Drop every entry (pins are kept, they describe what's on screen, not what's cached)"""
+        self._entries.clear()
+        self._total_bytes = 0
+        self._pinned_bytes = 0
+
+    def total_bytes(self):
+        """Approximate memory used by the cached images"""
+        return self._total_bytes
+
+    def stats(self):
+        """Counters of the cache as a dict, for logging"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "pinned": len(self._pinned),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def describe(self):
+        """One line summary of the cache stats for the log area"""
+        stats = self.stats()
+        return (f"{stats['entries']} previews ({stats['pinned']} pinned), "
+                f"{stats['bytes'] / (1024 * 1024):.1f}/{stats['max_bytes'] / (1024 * 1024):.0f} MB, "
+                f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%}), "
+                f"{stats['evictions']} evictions")
+
+    @classmethod
+    def image_bytes(cls, tk_img):
+        """Approximate memory footprint of a PhotoImage"""
+        try:
+            return tk_img.width() * tk_img.height() * cls.BYTES_PER_PIXEL
+        except Exception:
+            return 0
+
+    def _enforce_budget(self):
+        """Evict least recently used unpinned entries until the cache fits in max_bytes"""
+        if self._total_bytes <= self.max_bytes or self._total_bytes == self._pinned_bytes:
+            return
+        for folder in list(self._entries.keys()):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if folder in self._pinned:
+                continue
+            self._remove(folder)
+            self.evictions += 1
+
+    def _remove(self, wallpaper_folder):
+        entry = self._entries.pop(wallpaper_folder, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+            if wallpaper_folder in self._pinned:
+                self._pinned_bytes -= entry[1]
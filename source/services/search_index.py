@@ -0,0 +1,97 @@
+"""In-memory wallpaper search index"""
+"""Search-as-you-type over wallpaper id, title and tags. Every field is split into lowercase words, each word maps to
+the set of wallpapers that contain it (inverted index). The words are also kept sorted, so the wallpapers matching
+a prefix are the union of the postings of a contiguous slice found with bisect, no scan of the library is needed.
+
+A query is split the same way and every word of it must match (as a prefix) one of the words of the wallpaper:
+"blue oce" finds a wallpaper titled "Blue Ocean Sunset". Prefix results are cached, while typing the words that
+are already complete are not looked up again."""
+
+import re
+from bisect import bisect_left
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Lowercase words of a text"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """Inverted index of wallpaper words, answers prefix queries"""
+
+    def __init__(self, entries=()):
+        """
+        Args:
+            entries: (wallpaper_id, title, tags) tuples, title may be None and tags empty
+        """
+        self._postings = {} # word -> set of wallpaper ids
+        self._words = [] # sorted keys of _postings
+        self._all_ids = frozenset()
+        self._prefix_cache = {} # prefix -> frozenset of wallpaper ids
+        self.build(entries)
+
+    def build(self, entries):
+        """Replace the indexed entries"""
+        postings = {}
+        all_ids = set()
+        for wallpaper_id, title, tags in entries:
+            wallpaper_id = str(wallpaper_id)
+            all_ids.add(wallpaper_id)
+            words = set(tokenize(wallpaper_id)) | set(tokenize(title))
+            for tag in tags or ():
+                words.update(tokenize(tag))
+            for word in words:
+                postings.setdefault(word, set()).add(wallpaper_id)
+
+        self._postings = postings
+        self._words = sorted(postings)
+        self._all_ids = frozenset(all_ids)
+        self._prefix_cache = {}
+
+    def __len__(self):
+        return len(self._all_ids)
+
+    def _match_prefix(self, prefix):
+        """frozenset of the wallpapers having a word that starts with prefix"""
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+
+        words = self._words
+        matches = set()
+        for position in range(bisect_left(words, prefix), len(words)):
+            word = words[position]
+            if not word.startswith(prefix):
+                break
+            matches |= self._postings[word]
+
+        result = frozenset(matches)
+        if len(self._prefix_cache) > 256:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = result
+        return result
+
+    def search(self, query):
+        """
+        Wallpapers matching every word of a query (each one as a prefix)
+
+        Args:
+            query: Free text typed by the user
+
+        Returns:
+            frozenset or None: Matching wallpaper ids, None for an empty query (no filtering)
+        """
+        words = tokenize(query)
+        if not words:
+            return None
+        result = None
+        # Most selective (longest) words first, the intersection shrinks faster
+        for word in sorted(set(words), key=len, reverse=True):
+            matches = self._match_prefix(word)
+            result = matches if result is None else result & matches
+            if not result:
+                return frozenset()
+        return result
@@ -0,0 +1,279 @@
+"""Persistent on-disk thumbnail cache"""
+"""Thumbnails are stored already resized to THUMB_SIZE under $XDG_CACHE_HOME, so a warm start never has to decode
+the original previews (some of them are 1920px JPEGs or multi-MB GIFs). Every entry is keyed by folder, preview path,
+mtime and size: if any of them changes the lookup is simply a miss and the entry gets overwritten on the next decode.
+
+The index is a plain JSON file next to the thumbnails, it is only written on flush() so that a gallery refresh of
+thousands of items doesn't rewrite it thousands of times. A cache hit only refreshes the "used" time of its entry in
+memory: those times only matter for the LRU eviction, they are saved by collect_garbage() and by the flush at exit,
+not every time the decode queue runs dry. flush() copies the index under the lock and serializes it outside of it,
+flush_async() does that on a writer thread so the Tk thread never waits on a multi-MB json.dump."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from os import path, makedirs
+
+from PIL import Image
+
+from common.constants import THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_MB
+
+
+class ThumbnailDiskCache:
+    """Stores pre-resized preview thumbnails on disk with a size cap"""
+
+    INDEX_NAME = "index.json"
+    THUMB_FORMAT = "PNG" # lossless, handles P/RGBA modes from gif/png previews without conversion
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = path.join(cache_dir, self.INDEX_NAME)
+        self._index = self._load_index()
+        self._total_bytes = sum(entry.get("bytes", 0) for entry in self._index.values())
+        self._dirty = False # entries added or removed since the last flush
+        self._touched = False # "used" times refreshed by hits since the last flush(include_usage=True)
+        # get/put are called from the preview decode workers, the index must not change under their feet
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock() # one index write at a time, the latest snapshot lands last
+        self._writer = None # created by the first flush_async()
+        self._flush_queued = False
+
+    @classmethod
+    def make_key(cls, preview_path, stat_result):
+        """Build the validity key of a preview from its path, mtime and size"""
+        return cls.key_of(preview_path, stat_result.st_mtime_ns, stat_result.st_size)
+
+    @staticmethod
+    def key_of(preview_path, mtime_ns, size):
+        """Same key as make_key() from values already known (the catalog stores them), without a stat()"""
+        return f"{preview_path}:{mtime_ns}:{size}"
+
+    def get(self, wallpaper_folder, preview_path, stat_result):
+        """
+        Load a cached thumbnail
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+            preview_path: Path to the original preview file
+            stat_result: os.stat() of the original preview
+
+        Returns:
+            Image or None: The cached thumbnail or None on a miss
+        """
+        return self.get_by_key(wallpaper_folder, self.make_key(preview_path, stat_result))
+
+    def has_key(self, wallpaper_folder, key):
+        """Whether a thumbnail for exactly this preview (see key_of) is cached, no disk access"""
+        with self._lock:
+            entry = self._index.get(wallpaper_folder)
+        return bool(entry) and entry.get("key") == key
+
+    def get_by_key(self, wallpaper_folder, key):
+        """get() with the validity key already computed, None if it doesn't match the cached entry"""
+        with self._lock:
+            entry = self._index.get(wallpaper_folder)
+        if not entry or entry.get("key") != key:
+            return None
+
+        thumb_path = path.join(self.cache_dir, entry["file"])
+        try:
+            img = Image.open(thumb_path)
+            img.load()
+        except Exception:
+            with self._lock:
+                self._drop(wallpaper_folder)
+            return None
+
+        with self._lock:
+            entry["used"] = time.time()
+            self._touched = True # not worth an index write by itself, see the module docstring
+        return img
+
+    def put(self, wallpaper_folder, preview_path, stat_result, img):
+        """
+        Store a thumbnail for a wallpaper, replacing any previous one
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+            preview_path: Path to the original preview file
+            stat_result: os.stat() of the original preview
+            img: PIL Image already resized to THUMB_SIZE
+        """
+        thumb_path = self.path_for(wallpaper_folder)
+        size = self.write_thumbnail(thumb_path, img)
+        if size is not None:
+            self.register(wallpaper_folder, preview_path, stat_result, size)
+
+    def path_for(self, wallpaper_folder):
+        """Path of the thumbnail file of a wallpaper (it may not exist yet)"""
+        file_name = sha1(wallpaper_folder.encode("utf-8", "surrogateescape")).hexdigest() + ".png"
+        return path.join(self.cache_dir, file_name)
+
+    @classmethod
+    def write_thumbnail(cls, thumb_path, img):
+        """
+        Atomically write a thumbnail file, without touching the index (safe to call from worker processes)
+
+        Returns:
+            int or None: Size of the written file, None on failure
+        """
+        tmp_path = thumb_path + ".tmp"
+        try:
+            makedirs(path.dirname(thumb_path), exist_ok=True)
+            img.save(tmp_path, cls.THUMB_FORMAT)
+            os.replace(tmp_path, thumb_path)
+            return path.getsize(thumb_path)
+        except Exception as e:
+            print(f"[WARNING] Could not write thumbnail cache entry {thumb_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+    def register(self, wallpaper_folder, preview_path, stat_result, size):
+        """Record a thumbnail file written by write_thumbnail() in the index"""
+        with self._lock:
+            self._drop(wallpaper_folder, keep_file=True)
+            self._index[wallpaper_folder] = {
+                "key": self.make_key(preview_path, stat_result),
+                "file": path.basename(self.path_for(wallpaper_folder)),
+                "bytes": size,
+                "used": time.time()
+            }
+            self._total_bytes += size
+            self._dirty = True
+            self._enforce_size_cap()
+
+    def collect_garbage(self):
+        """
+        Remove entries of wallpapers that no longer exist, orphan files, and enforce the size cap
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        started = time.time()
+        with self._lock:
+            for folder in list(self._index.keys()):
+                if not path.isdir(folder):
+                    self._drop(folder)
+                    removed += 1
+
+            removed += self._enforce_size_cap()
+
+            # Files that are on disk but not in the index (crashed before flush, old versions...)
+            referenced = {entry["file"] for entry in self._index.values()}
+        try:
+            for name in os.listdir(self.cache_dir):
+                if name == self.INDEX_NAME or name in referenced:
+                    continue
+                file_path = path.join(self.cache_dir, name)
+                try:
+                    # Decodes may run meanwhile (startup cleanup is in the background), their files aren't indexed yet
+                    if path.getmtime(file_path) >= started - 60:
+                        continue
+                    os.remove(file_path)
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+        self.flush(include_usage=True)
+        return removed
+
+    def total_bytes(self):
+        """Total size in bytes of the cached thumbnails"""
+        return self._total_bytes
+
+    def flush(self, include_usage=False):
+        """
+        Persist the index if it changed since the last flush
+
+        Args:
+            include_usage: Also write it if only the "used" times of hits changed (garbage collection, exit)
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty and not (include_usage and self._touched):
+                    return
+                # Entries are mutated in place by hits, the copy is what gets serialized without holding the lock
+                snapshot = {folder: dict(entry) for folder, entry in self._index.items()}
+                self._dirty = False
+                self._touched = False
+            tmp_path = self.index_path + ".tmp"
+            try:
+                makedirs(self.cache_dir, exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.index_path)
+            except Exception as e:
+                print(f"[WARNING] Could not write thumbnail cache index: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def flush_async(self):
+        """flush() on the writer thread, requests made while one is queued are served by that one (any thread)"""
+        with self._lock:
+            if not self._dirty or self._flush_queued:
+                return
+            self._flush_queued = True
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail-index")
+        self._writer.submit(self._run_queued_flush)
+
+    def _run_queued_flush(self):
+        with self._lock:
+            self._flush_queued = False
+        self.flush()
+
+    def clear(self):
+        """Remove every cached thumbnail"""
+        with self._lock:
+            for folder in list(self._index.keys()):
+                self._drop(folder)
+        self.flush()
+
+    def _enforce_size_cap(self):
+        """Evict least recently used entries until the cache fits in max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return 0
+
+        # Evict down to 90% so a full cache doesn't sort the whole index on every single put
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for folder, _ in sorted(self._index.items(), key=lambda item: item[1].get("used", 0)):
+            if self._total_bytes <= target:
+                break
+            self._drop(folder)
+            removed += 1
+        return removed
+
+    def _drop(self, wallpaper_folder, keep_file=False):
+        """Remove a single entry and (unless it's about to be overwritten) its file"""
+        entry = self._index.pop(wallpaper_folder, None)
+        if not entry:
+            return
+        self._total_bytes -= entry.get("bytes", 0)
+        self._dirty = True
+        if keep_file:
+            return
+        try:
+            os.remove(path.join(self.cache_dir, entry["file"]))
+        except OSError:
+            pass
+
+    def _load_index(self):
+        """Load the index from disk, an unreadable index just means a cold cache"""
+        if not path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except Exception:
+            return {}
@@ -0,0 +1,222 @@
+"""Memory-mapped thumbnail pack"""
+"""Even with the per-file disk cache, opening "All wallpapers" on a warm start means one open() + PNG decode per tile.
+The pack keeps the raw RGB pixels of every thumbnail of the library in a single file of fixed-size slots:
+
+    header (magic, version, slot width, slot height) | slot 0 | slot 1 | ...
+
+next to a JSON index {wallpaper folder: [key, slot, width, height]}. The file is mmap'ed read-only and get() wraps a
+slice of the map with Image.frombuffer(), so the only copy of the pixels is the one Tk makes when the PhotoImage is
+created: a warm start is bounded by Tk image creation, not by I/O.
+
+The pack doesn't decode anything itself, it mirrors the ThumbnailDiskCache. sync() runs on its own thread whenever
+the catalog changes (and when the decode pipeline idles, to pick up new thumbnails): entries whose key (preview path,
+mtime, size, same as the disk cache) changed or whose wallpaper is gone are dropped, new thumbnails are copied into
+free slots. A slot that the main thread may still read is never overwritten: slots freed by a sync are reused once
+neither the installed index nor the previous sync refer to them anymore."""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from os import path, makedirs
+
+from PIL import Image
+
+from common.constants import THUMB_SIZE, THUMBNAIL_PACK_PATH
+
+
+class ThumbnailPack:
+    """Raw thumbnails of the library in one mmap'ed file, see the module docstring"""
+
+    MAGIC = b"LWETPACK"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIII") # magic, version, slot width, slot height
+
+    def __init__(self, pack_path=THUMBNAIL_PACK_PATH, slot_size=THUMB_SIZE, dispatcher=None):
+        """
+        Args:
+            pack_path: Pack file, the index is pack_path + ".json"
+            slot_size: (width, height) of a slot, thumbnails never exceed it
+            dispatcher: UiDispatcher, needed by sync_async() to install the new index on the main thread
+        """
+        self.pack_path = pack_path
+        self.index_path = pack_path + ".json"
+        self.slot_size = tuple(slot_size)
+        self.slot_bytes = self.slot_size[0] * self.slot_size[1] * 3
+        self.dispatcher = dispatcher
+
+        self._lock = threading.Lock() # guards _index, discard() runs on the main thread while a sync reads it
+        self._index = {} # installed: folder -> (key, slot, width, height), what get() serves
+        self._packed = {} # written by the last sync, only touched by the runner thread
+        self._map = None
+
+        self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail-pack")
+        self._pending = 0
+
+        self._open()
+
+    def _open(self):
+        """Load the index and map the pack, anything unreadable or from another slot size starts an empty pack"""
+        index = {}
+        try:
+            with open(self.pack_path, "rb") as f:
+                header = self.HEADER.unpack(f.read(self.HEADER.size))
+            if header == (self.MAGIC, self.VERSION) + self.slot_size:
+                with open(self.index_path, "r") as f:
+                    index = {folder: tuple(entry) for folder, entry in json.load(f).items()}
+        except Exception:
+            index = {}
+
+        if not index:
+            self._create()
+        self._index = index
+        self._packed = dict(index)
+        self._remap()
+
+    def _create(self):
+        """Write an empty pack (just the header) and an empty index"""
+        try:
+            makedirs(path.dirname(self.pack_path) or ".", exist_ok=True)
+            with open(self.pack_path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, *self.slot_size))
+            self._save_index({})
+        except Exception as e:
+            print(f"[WARNING] Could not create thumbnail pack {self.pack_path}: {e}")
+
+    def _remap(self):
+        """Map the whole pack again (it grew), the previous map goes away once no image refers to it anymore"""
+        try:
+            with open(self.pack_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size > self.HEADER.size:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self._map = None
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not map thumbnail pack {self.pack_path}: {e}")
+            self._map = None
+
+    def __contains__(self, wallpaper_folder):
+        return wallpaper_folder in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, wallpaper_folder):
+        """
+        Thumbnail of a wallpaper straight from the map, no copy (main thread)
+
+        Returns:
+            Image or None: RGB image backed by the map, only valid until the next sync is installed, turn it into a
+            PhotoImage right away and drop it
+        """
+        entry = self._index.get(wallpaper_folder)
+        if entry is None or self._map is None:
+            return None
+        _, slot, width, height = entry
+        offset = self.HEADER.size + slot * self.slot_bytes
+        end = offset + width * height * 3
+        if end > len(self._map):
+            return None
+        return Image.frombuffer("RGB", (width, height), memoryview(self._map)[offset:end], "raw", "RGB", 0, 1)
+
+    def discard(self, wallpaper_folder):
+        """Stop serving a wallpaper whose preview changed, the next sync repacks it (main thread)"""
+        with self._lock:
+            self._index.pop(wallpaper_folder, None)
+
+    def sync(self, entries, disk_cache):
+        """
+        Bring the pack in line with the library, blocking (runner thread)
+
+        Args:
+            entries: {wallpaper folder: key} of every wallpaper that should be packed, see ThumbnailDiskCache.key_of
+            disk_cache: ThumbnailDiskCache the thumbnails are copied from
+
+        Returns:
+            tuple: (new index, packed, dropped) where packed and dropped count the entries written and removed
+        """
+        with self._lock:
+            installed = dict(self._index)
+        index = {folder: entry for folder, entry in self._packed.items() if entries.get(folder) == entry[0]}
+        dropped = len(self._packed) - len(index)
+
+        # Free slots: in neither the installed index (get() may read them right now) nor the one of the previous sync
+        # (it may be installed while this one runs), the entries kept by this sync are a subset of the latter
+        used = {entry[1] for entry in self._packed.values()} | {entry[1] for entry in installed.values()}
+        slot_count = max(used, default=-1) + 1
+        free = [slot for slot in range(slot_count) if slot not in used]
+        free.reverse()
+
+        packed = 0
+        try:
+            with open(self.pack_path, "r+b") as f:
+                for folder, key in entries.items():
+                    if folder in index or not disk_cache.has_key(folder, key):
+                        continue
+                    img = disk_cache.get_by_key(folder, key)
+                    if img is None:
+                        continue
+                    if img.mode != "RGB":
+                        img = img.convert("RGB")
+                    if img.width > self.slot_size[0] or img.height > self.slot_size[1]:
+                        img.thumbnail(self.slot_size)
+
+                    if free:
+                        slot = free.pop()
+                    else:
+                        slot = slot_count
+                        slot_count += 1
+                    f.seek(self.HEADER.size + slot * self.slot_bytes)
+                    f.write(img.tobytes())
+                    index[folder] = (key, slot, img.width, img.height)
+                    packed += 1
+        except OSError as e:
+            print(f"[WARNING] Could not write thumbnail pack {self.pack_path}: {e}")
+
+        if packed or dropped:
+            self._save_index(index)
+        self._packed = index
+        return index, packed, dropped
+
+    def sync_async(self, entries, disk_cache, on_done=None):
+        """Run sync() in the background, the new index is installed on the main thread, then on_done(packed, dropped)"""
+        self._pending += 1
+        future = self._runner.submit(self.sync, dict(entries), disk_cache)
+        future.add_done_callback(lambda done: self.dispatcher.call_soon(self._install, done, on_done))
+
+    @property
+    def busy(self):
+        """A sync_async() result is still to be installed"""
+        return self._pending > 0
+
+    def shutdown(self):
+        """Stop the runner thread without waiting for a sync in progress"""
+        self._runner.shutdown(wait=False, cancel_futures=True)
+
+    def _save_index(self, index):
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"[WARNING] Could not write thumbnail pack index: {e}")
+
+    def _install(self, future, on_done):
+        """Main thread: install the index of a finished sync"""
+        self._pending -= 1
+        if future.cancelled():
+            return # shut down
+        try:
+            index, packed, dropped = future.result()
+        except Exception as e:
+            print(f"[WARNING] Thumbnail pack sync failed: {e}")
+            return
+        with self._lock:
+            self._index = dict(index)
+        if packed:
+            self._remap()
+        if on_done:
+            on_done(packed, dropped)
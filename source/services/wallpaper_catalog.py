@@ -0,0 +1,414 @@
+"""Persistent wallpaper catalog"""
+"""Listing and counting wallpapers used to mean a listdir of --dir plus up to three path.exists() per folder, on every
+single gallery refresh. The catalog keeps what those probes found in a small SQLite file under $XDG_CACHE_HOME:
+wallpaper id, preview path, mtimes, sizes and whether there is a preview at all.
+
+rescan() still lists --dir (that's the only way to notice new folders) but only probes the folders whose directory
+mtime changed since the last scan, Steam replaces files by renaming them so an updated preview bumps it. Everything
+else is an indexed query.
+
+The metadata tables hold what services.metadata_index parsed out of every project.json (title, type, tags, content
+rating, main file) along with the mtime and size of the file, so only modified files are parsed again.
+
+The connection is shared between threads (counts and metadata indexing may run in workers), every access goes through
+self._lock. The GUI never rescans on the Tk thread: needs_rescan() is a single stat, rescan_async() does the walk on
+the catalog's scanner thread and delivers the result through the UiDispatcher."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import path, makedirs
+
+from common.constants import CATALOG_PATH, PREVIEW_FILENAMES
+from services.library_scanner import folder_mtimes
+
+
+class WallpaperCatalog:
+    """SQLite-backed index of the wallpapers found in one or more wallpaper directories"""
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path=CATALOG_PATH, dispatcher=None):
+        """
+        Args:
+            db_path: SQLite file, ":memory:" for a throwaway catalog
+            dispatcher: UiDispatcher, needed by rescan_async() to call on_done on the main thread
+        """
+        self.db_path = db_path
+        self.dispatcher = dispatcher
+        if db_path != ":memory:":
+            makedirs(path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._scanned_roots = {} # {root: its mtime_ns at the last rescan} of the roots this process rescanned
+        # Rescans run one at a time on their own thread, {root: [on_done...]} of the queued ones (main thread only)
+        self._scanner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-scan")
+        self._queued_rescans = {}
+        self._migrate()
+
+    def _migrate(self):
+        """Create or upgrade the schema, an unknown (newer/older) layout is simply rebuilt, it's only a cache"""
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                for table in ("wallpapers", "roots", "metadata", "metadata_tags"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            try:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS roots (
+                    root TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    scanned_at REAL NOT NULL
+                )""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS wallpapers (
+                    root TEXT NOT NULL,
+                    wallpaper_id TEXT NOT NULL,
+                    dir_mtime_ns INTEGER NOT NULL,
+                    preview_path TEXT,
+                    preview_mtime_ns INTEGER,
+                    preview_size INTEGER,
+                    has_preview INTEGER NOT NULL,
+                    PRIMARY KEY (root, wallpaper_id)
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS wallpapers_by_preview ON wallpapers (root, has_preview)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS metadata (
+                    root TEXT NOT NULL,
+                    wallpaper_id TEXT NOT NULL,
+                    project_mtime_ns INTEGER,
+                    project_size INTEGER,
+                    title TEXT,
+                    type TEXT,
+                    content_rating TEXT,
+                    file TEXT,
+                    tags TEXT NOT NULL,
+                    PRIMARY KEY (root, wallpaper_id)
+                )""")
+            # One row per (wallpaper, lowercased tag), lets tag filters be indexed lookups
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS metadata_tags (
+                    root TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    wallpaper_id TEXT NOT NULL,
+                    PRIMARY KEY (root, tag, wallpaper_id)
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_by_type ON metadata (root, type)")
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def needs_rescan(self, root_dir):
+        """
+        Whether root_dir was never rescanned by this process or its mtime moved since (a wallpaper folder was added,
+        removed or renamed), a single stat. Changes inside existing folders need rescan() or refresh_folders()
+        """
+        root_dir = path.abspath(root_dir)
+        try:
+            root_mtime = os.stat(root_dir).st_mtime_ns
+        except OSError:
+            return True
+        return self._scanned_roots.get(root_dir) != root_mtime
+
+    def ensure_scanned(self, root_dir):
+        """
+        rescan() root_dir if needs_rescan() says so, blocking
+
+        Returns:
+            tuple: (added, changed, removed) as rescan() does, None when nothing was rescanned
+        """
+        if not self.needs_rescan(root_dir):
+            return None
+        return self.rescan(root_dir)
+
+    def rescan_async(self, root_dir, on_done=None):
+        """
+        Run rescan() on the scanner thread, a rescan of root_dir that is already queued is shared (main thread)
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            on_done: Called on the main thread with (added, changed, removed), or None if the scan failed
+        """
+        root_dir = path.abspath(root_dir)
+        callbacks = self._queued_rescans.get(root_dir)
+        if callbacks is not None:
+            callbacks.append(on_done)
+            return
+        self._queued_rescans[root_dir] = [on_done]
+        future = self._scanner.submit(self.rescan, root_dir)
+        future.add_done_callback(lambda done: self.dispatcher.call_soon(self._report_rescan, root_dir, done))
+
+    def _report_rescan(self, root_dir, future):
+        """Main thread: hand a finished rescan to everyone who asked for it"""
+        callbacks = self._queued_rescans.pop(root_dir, [])
+        if future.cancelled():
+            return # shut down
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"[WARNING] Wallpaper catalog scan failed: {e}")
+            result = None
+        for on_done in callbacks:
+            if on_done:
+                on_done(result)
+
+    def rescan(self, root_dir):
+        """
+        Bring the catalog of a wallpaper directory up to date, probing only folders whose mtime changed
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+
+        Returns:
+            tuple: (added, changed, removed) lists of wallpaper ids
+        """
+        root_dir = path.abspath(root_dir)
+        try:
+            root_mtime = os.stat(root_dir).st_mtime_ns
+            folders = folder_mtimes(root_dir)
+        except OSError as e:
+            print(f"[WARNING] Could not scan wallpaper directory {root_dir}: {e}")
+            return [], [], []
+
+        with self._lock:
+            known = dict(self._conn.execute(
+                "SELECT wallpaper_id, dir_mtime_ns FROM wallpapers WHERE root = ?", (root_dir,)
+            ))
+
+        added, changed, rows = [], [], []
+        for wallpaper_id, dir_mtime in folders.items():
+            previous = known.get(wallpaper_id)
+            if previous == dir_mtime:
+                continue
+            (added if previous is None else changed).append(wallpaper_id)
+            rows.append((root_dir, wallpaper_id, dir_mtime) + self._probe_preview(path.join(root_dir, wallpaper_id)))
+        removed = [wallpaper_id for wallpaper_id in known if wallpaper_id not in folders]
+
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT OR REPLACE INTO wallpapers
+                    (root, wallpaper_id, dir_mtime_ns, preview_path, preview_mtime_ns, preview_size, has_preview)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""", rows)
+            self._conn.executemany(
+                "DELETE FROM wallpapers WHERE root = ? AND wallpaper_id = ?",
+                [(root_dir, wallpaper_id) for wallpaper_id in removed]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO roots (root, mtime_ns, scanned_at) VALUES (?, ?, ?)",
+                (root_dir, root_mtime, time.time())
+            )
+        self._scanned_roots[root_dir] = root_mtime
+        return added, changed, removed
+
+    def refresh_folders(self, root_dir, wallpaper_ids):
+        """
+        Update the entries of some wallpaper folders only (e.g. the ones a LibraryWatcher reported), without
+        listing root_dir. Folders that no longer exist are removed
+
+        Returns:
+            tuple: (added, changed, removed) lists of wallpaper ids
+        """
+        root_dir = path.abspath(root_dir)
+        with self._lock:
+            known = dict(self._conn.execute(
+                "SELECT wallpaper_id, dir_mtime_ns FROM wallpapers WHERE root = ?", (root_dir,)
+            ))
+
+        added, changed, removed, rows = [], [], [], []
+        for wallpaper_id in wallpaper_ids:
+            folder = path.join(root_dir, wallpaper_id)
+            try:
+                folder_stat = os.stat(folder)
+                is_dir = path.isdir(folder)
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                if wallpaper_id in known:
+                    removed.append(wallpaper_id)
+                continue
+            (added if wallpaper_id not in known else changed).append(wallpaper_id)
+            rows.append((root_dir, wallpaper_id, folder_stat.st_mtime_ns) + self._probe_preview(folder))
+
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT OR REPLACE INTO wallpapers
+                    (root, wallpaper_id, dir_mtime_ns, preview_path, preview_mtime_ns, preview_size, has_preview)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""", rows)
+            self._conn.executemany(
+                "DELETE FROM wallpapers WHERE root = ? AND wallpaper_id = ?",
+                [(root_dir, wallpaper_id) for wallpaper_id in removed]
+            )
+        return added, changed, removed
+
+    @staticmethod
+    def _probe_preview(wallpaper_folder):
+        """(preview_path, mtime_ns, size, has_preview) of the first existing preview file of a folder"""
+        for name in PREVIEW_FILENAMES:
+            preview_path = path.join(wallpaper_folder, name)
+            try:
+                preview_stat = os.stat(preview_path)
+            except OSError:
+                continue
+            return preview_path, preview_stat.st_mtime_ns, preview_stat.st_size, 1
+        return None, None, None, 0
+
+    def wallpaper_ids(self, root_dir, with_preview=True):
+        """
+        Wallpaper ids of a directory, sorted
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            with_preview: Only wallpapers that have a preview file (the ones the gallery can show)
+
+        Returns:
+            list: Wallpaper ids
+        """
+        query = "SELECT wallpaper_id FROM wallpapers WHERE root = ?"
+        if with_preview:
+            query += " AND has_preview = 1"
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query + " ORDER BY wallpaper_id", (path.abspath(root_dir),))]
+
+    def previews(self, root_dir):
+        """{wallpaper id: preview path} of the wallpapers with a preview, same shape as LibraryScan.previews"""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT wallpaper_id, preview_path FROM wallpapers WHERE root = ? AND has_preview = 1",
+                (path.abspath(root_dir),)
+            ))
+
+    def preview_stats(self, root_dir):
+        """{wallpaper id: (preview path, mtime_ns, size)} of the wallpapers with a preview, as of the last scan"""
+        with self._lock:
+            return {row[0]: row[1:] for row in self._conn.execute(
+                "SELECT wallpaper_id, preview_path, preview_mtime_ns, preview_size FROM wallpapers "
+                "WHERE root = ? AND has_preview = 1",
+                (path.abspath(root_dir),)
+            )}
+
+    def count(self, root_dir, wallpaper_ids=None):
+        """
+        Number of wallpapers with a preview, optionally restricted to a collection of ids (favorites, a group...)
+        """
+        root_dir = path.abspath(root_dir)
+        if wallpaper_ids is None:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT COUNT(*) FROM wallpapers WHERE root = ? AND has_preview = 1", (root_dir,)
+                ).fetchone()[0]
+        wanted = set(str(wallpaper_id) for wallpaper_id in wallpaper_ids)
+        if not wanted:
+            return 0
+        return sum(1 for wallpaper_id in self.wallpaper_ids(root_dir) if wallpaper_id in wanted)
+
+    def preview_path(self, root_dir, wallpaper_id):
+        """Cataloged preview path of a wallpaper, or None (no preview or not cataloged yet)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT preview_path FROM wallpapers WHERE root = ? AND wallpaper_id = ?",
+                (path.abspath(root_dir), wallpaper_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def metadata_state(self, root_dir):
+        """{wallpaper id: (project.json mtime_ns, size)} of the indexed wallpapers, to tell which files changed"""
+        with self._lock:
+            return {
+                wallpaper_id: (mtime_ns, size) for wallpaper_id, mtime_ns, size in self._conn.execute(
+                    "SELECT wallpaper_id, project_mtime_ns, project_size FROM metadata WHERE root = ?",
+                    (path.abspath(root_dir),)
+                )
+            }
+
+    def store_metadata(self, root_dir, records, removed=()):
+        """
+        Save parsed project.json metadata
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            records: (wallpaper_id, mtime_ns, size, metadata dict) tuples, see metadata_index.parse_project_json()
+            removed: Wallpaper ids whose metadata must be dropped
+        """
+        root_dir = path.abspath(root_dir)
+        dropped = [(root_dir, wallpaper_id) for wallpaper_id in removed] + \
+                  [(root_dir, record[0]) for record in records]
+        tag_rows = [
+            (root_dir, tag, wallpaper_id)
+            for wallpaper_id, _, _, metadata in records
+            for tag in {tag.lower() for tag in metadata["tags"]}
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM metadata WHERE root = ? AND wallpaper_id = ?", dropped)
+            self._conn.executemany("DELETE FROM metadata_tags WHERE root = ? AND wallpaper_id = ?", dropped)
+            self._conn.executemany("""
+                INSERT INTO metadata
+                    (root, wallpaper_id, project_mtime_ns, project_size, title, type, content_rating, file, tags)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""", [
+                    (root_dir, wallpaper_id, mtime_ns, size, metadata["title"], metadata["type"],
+                     metadata["content_rating"], metadata["file"], json.dumps(metadata["tags"]))
+                    for wallpaper_id, mtime_ns, size, metadata in records
+                ])
+            self._conn.executemany("INSERT OR IGNORE INTO metadata_tags (root, tag, wallpaper_id) VALUES (?, ?, ?)",
+                                   tag_rows)
+
+    def metadata(self, root_dir, wallpaper_id):
+        """Indexed metadata of a wallpaper as a dict (title, type, tags, content_rating, file), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, type, content_rating, file, tags FROM metadata WHERE root = ? AND wallpaper_id = ?",
+                (path.abspath(root_dir), str(wallpaper_id))
+            ).fetchone()
+        if row is None:
+            return None
+        title, wallpaper_type, content_rating, main_file, tags = row
+        return {
+            "title": title, "type": wallpaper_type, "content_rating": content_rating, "file": main_file,
+            "tags": json.loads(tags)
+        }
+
+    def search_entries(self, root_dir):
+        """(wallpaper_id, title, tags) of every wallpaper with a preview, title and tags are empty when not indexed"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT w.wallpaper_id, m.title, m.tags FROM wallpapers w
+                LEFT JOIN metadata m ON m.root = w.root AND m.wallpaper_id = w.wallpaper_id
+                WHERE w.root = ? AND w.has_preview = 1""", (path.abspath(root_dir),)).fetchall()
+        return [(wallpaper_id, title, json.loads(tags) if tags else []) for wallpaper_id, title, tags in rows]
+
+    def filter_wallpaper_ids(self, root_dir, wallpaper_type=None, tags=None, content_rating=None):
+        """
+        Ids of the wallpapers whose indexed metadata matches every given criterion
+
+        Args:
+            root_dir: Wallpaper directory (--dir)
+            wallpaper_type: "scene", "video", "web"... (case insensitive)
+            tags: Collection of tags the wallpaper must all have (case insensitive)
+            content_rating: "Everyone", "Questionable", "Mature"... (case insensitive)
+
+        Returns:
+            set: Matching wallpaper ids
+        """
+        query = "SELECT wallpaper_id FROM metadata WHERE root = ?"
+        params = [path.abspath(root_dir)]
+        if wallpaper_type:
+            query += " AND type = ?"
+            params.append(wallpaper_type.lower())
+        if content_rating:
+            query += " AND content_rating = ? COLLATE NOCASE"
+            params.append(content_rating)
+        for tag in tags or ():
+            query += " AND wallpaper_id IN (SELECT wallpaper_id FROM metadata_tags WHERE root = ? AND tag = ?)"
+            params.extend((params[0], tag.lower()))
+        with self._lock:
+            return {row[0] for row in self._conn.execute(query, params)}
+
+    def close(self):
+        """Stop the scanner thread (a rescan in progress is finished first) and close the database connection"""
+        self._scanner.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,20 @@
 """Wallpaper loading and management service"""
 
 from PIL import Image, ImageTk
-from os import path, listdir
+from os import path, listdir, stat
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from threading import Lock
+import os
 
-from common.constants import THUMB_SIZE, THUMB_DESIRED_COLUMNS, THUMB_MIN_WIDTH, THUMB_ASPECT_RATIO
+from common.constants import THUMB_SIZE, THUMB_DESIRED_COLUMNS, THUMB_MIN_WIDTH, THUMB_ASPECT_RATIO, PREVIEW_FILENAMES
+from services.thumbnail_cache import ThumbnailDiskCache
+from services.preview_decoders import open_preview
+from services.preview_memory_cache import PreviewMemoryCache
+from services.library_scanner import find_preview_file
+
+
+DECODE_MODES = ("thread", "process")
 
 
 def calculate_dynamic_thumb_size(screen_width, desired_columns=THUMB_DESIRED_COLUMNS):
@@ -24,11 +35,213 @@ def calculate_dynamic_thumb_size(screen_width, desired_columns=THUMB_DESIRED_COL
     return (thumb_width, thumb_height)
 
 
+def iter_preview_files(wallpaper_folder):
+    """Yield (path, stat) for every existing preview file of a wallpaper, in lookup order"""
+    for name in PREVIEW_FILENAMES:
+        full_path = path.join(wallpaper_folder, name)
+        try:
+            yield full_path, stat(full_path)
+        except OSError:
+            continue
+
+
+def open_thumbnail(preview_path):
+    """Open a preview file and downscale it to THUMB_SIZE (format-aware, see services/preview_decoders.py)"""
+    return open_preview(preview_path, THUMB_SIZE)
+
+
+def decode_preview_to_shared_memory(wallpaper_folder, thumb_cache_path=None):
+    """
+    Process pool worker: decode a preview and hand its raw RGB pixels back through shared memory.
+
+    Pickling a PIL image back to the GUI would copy it through a pipe, here only the segment name travels.
+    The caller owns the segment and must unlink it (see WallpaperLoader.store_shared_preview).
+
+    Args:
+        wallpaper_folder: Path to wallpaper directory
+        thumb_cache_path: Optional thumbnail cache file to write the resized preview to
+
+    Returns:
+        tuple or None: (shm_name, (width, height), preview_path, preview_stat, cache_bytes)
+    """
+    for full_path, preview_stat in iter_preview_files(wallpaper_folder):
+        try:
+            img = open_thumbnail(full_path).convert("RGB")
+        except Exception as e:
+            print(f"[WARNING] Error loading preview {full_path}: {e}")
+            continue
+
+        cache_bytes = None
+        if thumb_cache_path:
+            cache_bytes = ThumbnailDiskCache.write_thumbnail(thumb_cache_path, img)
+
+        data = img.tobytes()
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        _untrack_shared_memory(shm)
+        shm.close()
+        return (shm.name, img.size, full_path, preview_stat, cache_bytes)
+
+    return None
+
+
+def _untrack_shared_memory(shm):
+    """Ownership moves to the GUI process, stop this worker's resource tracker from unlinking the segment"""
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def release_shared_preview(shm_name):
+    """Unlink a shared memory segment produced by decode_preview_to_shared_memory without reading it"""
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
 class WallpaperLoader:
     """Manages wallpaper preview caching and loading"""
 
-    def __init__(self):
-        self.preview_cache = {}
+    def __init__(self, disk_cache=None, memory_cache=None, pack=None):
+        # Bounded LRU of PhotoImages, the PIL images are not kept once Tk has its copy
+        self.preview_cache = memory_cache if memory_cache is not None else PreviewMemoryCache()
+        # Optional services.thumbnail_cache.ThumbnailDiskCache, survives between launches
+        self.disk_cache = disk_cache
+        # Optional services.thumbnail_pack.ThumbnailPack, mmap'ed raw thumbnails served without any file I/O
+        self.pack = pack
+
+    @staticmethod
+    def find_preview(wallpaper_folder):
+        """
+        Locate the preview file of a wallpaper without opening it
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+
+        Returns:
+            str or None: Path to the first existing preview file
+        """
+        return find_preview_file(wallpaper_folder)
+
+    def decode_preview(self, wallpaper_folder, cached_only=False):
+        """
+        Decode and resize a wallpaper preview (safe to call from worker threads, never touches Tk)
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+            cached_only: Only look in the disk cache, never decode the original preview
+
+        Returns:
+            Image or None: The resized PIL image or None if no preview could be decoded
+        """
+        for full_path, preview_stat in iter_preview_files(wallpaper_folder):
+            try:
+                img = None
+                if self.disk_cache:
+                    img = self.disk_cache.get(wallpaper_folder, full_path, preview_stat)
+
+                if img is None:
+                    if cached_only:
+                        return None
+                    img = open_thumbnail(full_path)
+                    if self.disk_cache:
+                        self.disk_cache.put(wallpaper_folder, full_path, preview_stat, img)
+
+                return img
+            except Exception as e:
+                print(f"[WARNING] Error loading preview {full_path}: {e}")
+                continue
+
+        return None
+
+    def get_cached_preview(self, wallpaper_folder):
+        """Return the in-memory PhotoImage of a wallpaper, or None if it is not (or no longer) cached"""
+        return self.preview_cache.get(wallpaper_folder)
+
+    def invalidate_preview(self, wallpaper_folder):
+        """Forget the in-memory preview of a wallpaper whose files changed (the disk cache is keyed by mtime already)"""
+        self.preview_cache.discard(wallpaper_folder)
+        if self.pack is not None:
+            self.pack.discard(wallpaper_folder)
+
+    def has_packed_preview(self, wallpaper_folder):
+        """Whether the thumbnail pack can serve this wallpaper without decoding"""
+        return self.pack is not None and wallpaper_folder in self.pack
+
+    def load_packed_preview(self, wallpaper_folder):
+        """
+        Create (and cache) the PhotoImage of a wallpaper straight from the thumbnail pack (Tk main thread only)
+
+        Returns:
+            PhotoImage or None: The preview, None if the pack doesn't have it
+        """
+        if self.pack is None:
+            return None
+        img = self.pack.get(wallpaper_folder)
+        if img is None:
+            return None
+        # The image is a view of the map, PhotoImage copies the pixels into Tk and that's the only copy
+        tk_img = ImageTk.PhotoImage(image=img)
+        del img
+        self.preview_cache.put(wallpaper_folder, tk_img)
+        return tk_img
+
+    def pin_previews(self, wallpaper_folders):
+        """Keep the previews of these wallpapers (the ones on screen) in memory regardless of the budget"""
+        self.preview_cache.pin(wallpaper_folders)
+
+    def cache_stats(self):
+        """One line summary of the in-memory preview cache for the log area"""
+        return self.preview_cache.describe()
+
+    def store_preview(self, wallpaper_folder, img):
+        """
+        Wrap a decoded image into a PhotoImage and cache it (Tk main thread only)
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+            img: PIL image returned by decode_preview
+
+        Returns:
+            PhotoImage: The cached preview image
+        """
+        tk_img = ImageTk.PhotoImage(image=img)
+        self.preview_cache.put(wallpaper_folder, tk_img)
+        return tk_img
+
+    def store_shared_preview(self, wallpaper_folder, result):
+        """
+        Wrap a decode_preview_to_shared_memory result into a PhotoImage, cache it and free the segment
+        (Tk main thread only)
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+            result: Tuple returned by decode_preview_to_shared_memory
+
+        Returns:
+            PhotoImage: The cached preview image
+        """
+        shm_name, size, preview_path, preview_stat, cache_bytes = result
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            # frombuffer maps the segment directly, PhotoImage copies the pixels into Tk and that's the only copy
+            img = Image.frombuffer("RGB", size, shm.buf, "raw", "RGB", 0, 1)
+            tk_img = ImageTk.PhotoImage(image=img)
+            del img
+        finally:
+            shm.close()
+            shm.unlink()
+
+        if self.disk_cache and cache_bytes is not None:
+            self.disk_cache.register(wallpaper_folder, preview_path, preview_stat, cache_bytes)
+
+        self.preview_cache.put(wallpaper_folder, tk_img)
+        return tk_img
 
     def load_preview(self, wallpaper_folder):
         """
@@ -40,55 +253,324 @@ class WallpaperLoader:
         Returns:
             PhotoImage or None: The preview image or None if not found
         """
-        if wallpaper_folder in self.preview_cache:
-            return self.preview_cache[wallpaper_folder][1]
+        cached = self.get_cached_preview(wallpaper_folder) or self.load_packed_preview(wallpaper_folder)
+        if cached:
+            return cached
 
-        for name in ("preview.jpg", "preview.png", "preview.gif"):
-            full_path = path.join(wallpaper_folder, name)
-            if path.exists(full_path):
-                try:
-                    img = Image.open(full_path)
-                    img.thumbnail(THUMB_SIZE)
-                    tk_img = ImageTk.PhotoImage(image=img)
+        img = self.decode_preview(wallpaper_folder)
+        if img is None:
+            return None
+        return self.store_preview(wallpaper_folder, img)
 
-                    self.preview_cache[wallpaper_folder] = (img, tk_img)
-                    return tk_img
-                except Exception as e:
-                    print(f"[WARNING] Error loading preview {full_path}: {e}")
-                    continue
+    def flush_disk_cache(self, in_background=False):
+        """
+        Persist the on-disk thumbnail cache index, if any
 
-        return None
+        Args:
+            in_background: Write it on the cache's writer thread (Tk thread callers). Otherwise it is written now,
+                           usage times of cache hits included (exit)
+        """
+        if not self.disk_cache:
+            return
+        if in_background:
+            self.disk_cache.flush_async()
+        else:
+            self.disk_cache.flush(include_usage=True)
 
     def clear_cache(self):
         """Clear the preview cache"""
         self.preview_cache.clear()
 
 
+class PreviewDecodePipeline:
+    """
+    Decodes previews in the background and hands them back to the Tk main loop.
+
+    Two modes are available:
+    - "thread": worker threads open and resize PIL images.
+    - "process": a process pool (one worker per core by default) decodes and downscales previews and returns raw RGB
+      buffers through shared memory, so cold-cache decoding isn't serialized by the GIL. A couple of threads still
+      serve disk cache hits, which are cheaper than a process round-trip.
+
+    In both modes the PhotoImage creation and the on_ready callbacks always happen on the main thread, every outcome
+    of a request (decoded, failed or dropped) is delivered through the UiDispatcher, whose time budget keeps scrolling
+    responsive. Tk is not thread safe and will throw random Tcl errors otherwise. Previews in the loader's thumbnail
+    pack skip the workers entirely, their PhotoImage is created straight from the map by the delivery.
+    """
+
+    PROCESS_MODE_THREADS = 2
+
+    def __init__(self, loader, dispatcher, max_workers=0, mode="thread", on_idle=None):
+        """
+        Args:
+            loader: WallpaperLoader used to decode and cache previews
+            dispatcher: UiDispatcher the results are delivered through
+            max_workers: Worker threads/processes, 0 picks a default from the core count
+            mode: "thread" or "process"
+            on_idle: Optional callback run on the main thread every time the queue of decodes runs dry
+        """
+        self.loader = loader
+        self.dispatcher = dispatcher
+        self.on_idle = on_idle
+        self.mode = mode if mode in DECODE_MODES else "thread"
+
+        cpu_count = os.cpu_count() or 1
+        self.process_pool = None
+        if self.mode == "process":
+            workers = max_workers if max_workers and max_workers > 0 else cpu_count
+            # spawn: forking a process that runs Tk and other threads is asking for trouble
+            self.process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+            thread_workers = self.PROCESS_MODE_THREADS
+        else:
+            workers = max_workers if max_workers and max_workers > 0 else min(4, cpu_count)
+            thread_workers = workers
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="preview-decode")
+
+        self._futures = set() # thread futures not delivered yet
+        self._process_futures = []
+        self._waiting = {} # wallpaper_folder -> (future, [on_ready...]) until the result is delivered
+        self.decoded = 0 # previews decoded (not served by a cache) so far, lets callers notice new thumbnails
+        # Requests whose delivery hasn't run yet and that weren't cancelled before a worker took them, main thread only
+        self._in_flight = 0
+        self._lock = Lock() # guards _process_futures, appended to by the worker threads
+        self._generation = 0
+
+    def request(self, wallpaper_folder, on_ready):
+        """
+        Queue a preview decode, a wallpaper that is already queued is not decoded twice (the tile and the prefetcher
+        often ask for the same one): on_ready joins the callbacks of the pending decode
+
+        Args:
+            wallpaper_folder: Path to wallpaper directory
+            on_ready: Called on the main thread with the PhotoImage, or None if the preview could not be decoded
+
+        Returns:
+            tuple or None: Handle for cancel_request(), None when the preview was cached (on_ready already ran)
+        """
+        cached = self.loader.get_cached_preview(wallpaper_folder)
+        if cached:
+            on_ready(cached)
+            return None
+
+        handle = (wallpaper_folder, on_ready)
+        waiting = self._waiting.get(wallpaper_folder)
+        if waiting is not None:
+            waiting[1].append(on_ready)
+            return handle
+
+        if self.loader.has_packed_preview(wallpaper_folder):
+            # Nothing to decode, but the PhotoImage is still created by a delivery, within the dispatcher's budget
+            self._in_flight += 1
+            self.dispatcher.call_soon(self._deliver, self._generation, wallpaper_folder, "packed", None)
+            self._waiting[wallpaper_folder] = (None, [on_ready])
+        else:
+            self._waiting[wallpaper_folder] = (self._submit(wallpaper_folder), [on_ready])
+        return handle
+
+    def _submit(self, wallpaper_folder):
+        """Hand a decode over to the workers"""
+        generation = self._generation
+        self._in_flight += 1
+        if self.process_pool:
+            future = self.executor.submit(self._decode_in_process, generation, wallpaper_folder)
+        else:
+            future = self.executor.submit(self._decode, generation, wallpaper_folder)
+        self._futures.add(future)
+        return future
+
+    def cancel_request(self, handle):
+        """
+        Withdraw a single request (e.g. a tile or a prefetch that scrolled out of interest). The decode itself is
+        dropped once nobody waits for it anymore and no worker took it yet, otherwise it still lands in the cache.
+
+        Returns:
+            bool: True if on_ready won't be called, False if the request was already delivered
+        """
+        if handle is None:
+            return False
+        wallpaper_folder, on_ready = handle
+        waiting = self._waiting.get(wallpaper_folder)
+        if waiting is None or on_ready not in waiting[1]:
+            return False
+
+        future, callbacks = waiting
+        callbacks.remove(on_ready)
+        if not callbacks and future is not None and future.cancel():
+            del self._waiting[wallpaper_folder]
+            # Accounted for here, cancel_pending() must not count it a second time
+            self._futures.discard(future)
+            self._finish_request()
+        return True
+
+    def cancel_pending(self):
+        """Drop every decode that has not been delivered yet (e.g. when switching groups)"""
+        self._generation += 1
+        for future in self._futures:
+            # cancel() is True for a future that is already cancelled too, that one was accounted for already
+            if not future.done() and future.cancel():
+                self._finish_request()
+        self._futures = set()
+        self._waiting = {}
+
+        with self._lock:
+            process_futures, self._process_futures = self._process_futures, []
+        for future in process_futures:
+            future.cancel() # its done callback still delivers, as a stale result
+        # Deliveries already posted carry the old generation, they only free their payload and account for it
+
+    def pending_count(self):
+        """Number of decodes queued, running or waiting for their delivery"""
+        return self._in_flight
+
+    def shutdown(self):
+        """Cancel pending work and stop the workers"""
+        self.cancel_pending()
+        self.executor.shutdown(wait=False)
+        if self.process_pool:
+            self.process_pool.shutdown(wait=False)
+
+    def _decode(self, generation, wallpaper_folder):
+        """Worker thread: decode and deliver the result, skipping requests cancelled while queued"""
+        kind, img = "dropped", None
+        try:
+            if generation == self._generation:
+                kind = "image"
+                img = self.loader.decode_preview(wallpaper_folder)
+        finally:
+            self.dispatcher.call_soon(self._deliver, generation, wallpaper_folder, kind, img)
+
+    def _decode_in_process(self, generation, wallpaper_folder):
+        """Worker thread (process mode): serve disk cache hits, hand misses over to the process pool"""
+        kind, img = "dropped", None
+        try:
+            if generation != self._generation:
+                return
+
+            kind = "image"
+            img = self.loader.decode_preview(wallpaper_folder, cached_only=True)
+            if img is not None:
+                return
+
+            thumb_cache_path = None
+            if self.loader.disk_cache:
+                thumb_cache_path = self.loader.disk_cache.path_for(wallpaper_folder)
+
+            try:
+                process_future = self.process_pool.submit(
+                    decode_preview_to_shared_memory, wallpaper_folder, thumb_cache_path
+                )
+            except RuntimeError:
+                kind = "dropped"
+                return # pool shut down while closing the app
+
+            def on_done(done_future):
+                try:
+                    result = None if done_future.cancelled() else done_future.result()
+                except Exception as e:
+                    print(f"[WARNING] Error decoding preview in worker process for {wallpaper_folder}: {e}")
+                    result = None
+                self.dispatcher.call_soon(self._deliver, generation, wallpaper_folder, "shared", result)
+
+            with self._lock:
+                self._process_futures.append(process_future)
+            kind = None # delivered by on_done
+            process_future.add_done_callback(on_done)
+        finally:
+            if kind is not None:
+                self.dispatcher.call_soon(self._deliver, generation, wallpaper_folder, kind, img)
+
+    def _finish_request(self):
+        """Account for a request that was delivered or dropped, the queue running dry means idle (main thread)"""
+        self._in_flight -= 1
+        if self._in_flight <= 0:
+            with self._lock:
+                self._process_futures = [future for future in self._process_futures if not future.done()]
+            self.loader.flush_disk_cache(in_background=True)
+            if self.on_idle:
+                self.on_idle()
+
+    def _discard(self, kind, payload):
+        """Free a result that won't be displayed (shared memory segments would leak otherwise)"""
+        if kind == "shared" and payload:
+            try:
+                release_shared_preview(payload[0])
+            except Exception:
+                pass
+
+    def _deliver(self, generation, wallpaper_folder, kind, payload):
+        """Main thread: turn a decoded image into a PhotoImage and notify the tiles waiting for it"""
+        try:
+            if generation != self._generation or kind == "dropped":
+                self._discard(kind, payload)
+                return
+
+            tk_img = None
+            if kind == "packed":
+                tk_img = self.loader.load_packed_preview(wallpaper_folder)
+                if tk_img is None and wallpaper_folder in self._waiting:
+                    # Dropped from the pack since the request (the preview changed), decode it after all
+                    callbacks = self._waiting[wallpaper_folder][1]
+                    self._waiting[wallpaper_folder] = (self._submit(wallpaper_folder), callbacks)
+                    return
+            elif payload is not None:
+                self.decoded += 1
+                try:
+                    if kind == "shared":
+                        tk_img = self.loader.store_shared_preview(wallpaper_folder, payload)
+                    else:
+                        tk_img = self.loader.store_preview(wallpaper_folder, payload)
+                except Exception as e:
+                    print(f"[WARNING] Error creating preview image for {wallpaper_folder}: {e}")
+
+            future, callbacks = self._waiting.pop(wallpaper_folder, (None, ()))
+            self._futures.discard(future)
+            for on_ready in callbacks:
+                try:
+                    on_ready(tk_img)
+                except Exception as e:
+                    print(f"[WARNING] Error displaying preview for {wallpaper_folder}: {e}")
+        finally:
+            self._finish_request()
+
+
 class WallpaperFinder:
     """Finds and counts wallpapers"""
 
     @staticmethod
-    def count_all(root_dir, loader):
-        """Count all wallpapers with previews"""
+    def count_all(root_dir, loader, catalog=None, scan=None):
+        """
+        Count all wallpapers with previews (an indexed query when a WallpaperCatalog is given, a lookup in the
+        snapshot when a LibraryScan is given)
+        """
+        if scan is not None:
+            return scan.count()
         if not root_dir or not path.exists(root_dir) or not path.isdir(root_dir):
             return 0
+        if catalog is not None:
+            return catalog.count(root_dir)
         try:
             count = 0
             for w in listdir(root_dir):
                 folder = path.join(root_dir, w)
                 if not path.isdir(folder):
                     continue
-                if loader.load_preview(folder):
+                # Existence only, a count doesn't need the image
+                if loader.find_preview(folder):
                     count += 1
             return count
         except (OSError, PermissionError):
             return 0
 
     @staticmethod
-    def count_favorites(root_dir, favorites, loader):
-        """Count favorite wallpapers with previews"""
+    def count_favorites(root_dir, favorites, loader, catalog=None, scan=None):
+        """Count favorite wallpapers with previews (from the catalog or the LibraryScan when given)"""
+        if scan is not None:
+            return scan.count(favorites)
         if not root_dir or not path.exists(root_dir) or not path.isdir(root_dir):
             return 0
+        if catalog is not None:
+            return catalog.count(root_dir, favorites)
         try:
             favs = set(favorites)
             count = 0
@@ -96,14 +578,28 @@ class WallpaperFinder:
                 folder = path.join(root_dir, w)
                 if not path.isdir(folder):
                     continue
-                if w in favs and loader.load_preview(folder):
+                if w in favs and loader.find_preview(folder):
                     count += 1
             return count
         except (OSError, PermissionError):
             return 0
 
     @staticmethod
-    def get_wallpapers_list(root_dir, loader, group=None, favorites=None, groups_dict=None):
+    def count_group(root_dir, group_contents, catalog=None, scan=None):
+        """
+        Count the wallpapers of a custom group that are actually in root_dir (with a preview)
+
+        Without a catalog or a scan there is nothing to check against, every member is counted
+        """
+        if scan is not None:
+            return scan.count(group_contents)
+        if catalog is not None and root_dir and path.isdir(root_dir):
+            return catalog.count(root_dir, group_contents)
+        return len(group_contents)
+
+    @staticmethod
+    def get_wallpapers_list(root_dir, loader, group=None, favorites=None, groups_dict=None, catalog=None,
+                            scan=None, metadata_filter=None):
         """
         Get list of wallpapers matching criteria
         
@@ -113,13 +609,35 @@ class WallpaperFinder:
             group: Optional group name filter (__ALL__, __FAVORITES__, or custom group name)
             favorites: Optional favorites list
             groups_dict: Optional groups dictionary
+            catalog: Optional WallpaperCatalog, the list then comes from the catalog instead of walking root_dir
+            scan: Optional LibraryScan of root_dir, same as catalog but from an in-memory snapshot
+            metadata_filter: Optional dict of WallpaperCatalog.filter_wallpaper_ids() criteria (wallpaper_type, tags,
+                             content_rating), project.json metadata only lives in the catalog so it needs one
         
         Returns:
             list: Filtered wallpaper list
         """
+        if metadata_filter and catalog is not None:
+            allowed = catalog.filter_wallpaper_ids(root_dir, **metadata_filter)
+            return [
+                w for w in WallpaperFinder.get_wallpapers_list(
+                    root_dir, loader, group, favorites, groups_dict, catalog=catalog, scan=scan
+                )
+                if w in allowed
+            ]
+
+        if scan is not None:
+            return [w for w in scan.wallpaper_ids if WallpaperFinder._matches_group(w, group, favorites, groups_dict)]
+
         if not root_dir or not path.exists(root_dir) or not path.isdir(root_dir):
             return []
 
+        if catalog is not None:
+            return [
+                w for w in catalog.wallpaper_ids(root_dir)
+                if WallpaperFinder._matches_group(w, group, favorites, groups_dict)
+            ]
+
         try:
             wallpapers = []
 
@@ -128,21 +646,12 @@ class WallpaperFinder:
                 if not path.isdir(folder):
                     continue
 
-                if not loader.load_preview(folder):
+                # Existence only, decoding is left to whoever displays the thumbnail
+                if not loader.find_preview(folder):
                     continue
 
-                # Handle special groups and favorites
-                if group == "__FAVORITES__":
-                    # Show only favorites
-                    if favorites is None or w not in favorites:
-                        continue
-                elif group == "__ALL__":
-                    # Show all wallpapers (no filtering)
-                    pass
-                elif group and groups_dict:
-                    # Show only wallpapers in the specified custom group
-                    if not WallpaperFinder._is_in_group(w, group, groups_dict):
-                        continue
+                if not WallpaperFinder._matches_group(w, group, favorites, groups_dict):
+                    continue
 
                 wallpapers.append(w)
 
@@ -151,6 +660,21 @@ class WallpaperFinder:
         except (OSError, PermissionError):
             return []
 
+    @staticmethod
+    def _matches_group(wallpaper_id, group, favorites, groups_dict):
+        """Check if a wallpaper belongs in the list of a group (or of the special groups)"""
+        # Handle special groups and favorites
+        if group == "__FAVORITES__":
+            # Show only favorites
+            return favorites is not None and wallpaper_id in favorites
+        if group == "__ALL__":
+            # Show all wallpapers (no filtering)
+            return True
+        if group and groups_dict:
+            # Show only wallpapers in the specified custom group
+            return WallpaperFinder._is_in_group(wallpaper_id, group, groups_dict)
+        return True
+
     @staticmethod
     def _is_in_group(wallpaper_id, group, groups_dict):
         """Check if wallpaper is in group"""